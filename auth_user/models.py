@@ -9,8 +9,9 @@ from django.db import models
 from django.db.models import Q
 from django.contrib.auth.models import AbstractBaseUser
 
-from utils.functions import get_uuid
+from utils.functions import get_uuid, get_full_name, to_title
 from base.db_models.model import BaseModel
+from base.serialization import Field, Serialization
 
 
 class User(BaseModel, AbstractBaseUser):
@@ -48,23 +49,19 @@ class User(BaseModel, AbstractBaseUser):
             )
         ]
 
+    serialization = Serialization(
+        "email",
+        "user_id",
+        "phone_number",
+        "profile_photo",
+        Field("last_name", transform=to_title),
+        Field("first_name", transform=to_title),
+        Field("full_name", "first_name", "last_name", transform=get_full_name),
+    )
+
     @property
     def get_full_name(self):
         """
         Returns the full name of the user
         """
-        return f"{self.first_name} {self.last_name}".title()
-
-    def to_dict(self):
-        """
-        Returns the dict with specific fields
-        """
-        return {
-            "email": self.email,
-            "user_id": self.user_id,
-            "phone_number": self.phone_number,
-            "profile_photo": self.profile_photo,
-            "last_name": f"{self.last_name or ''}".title(),
-            "first_name": f"{self.first_name or ''}".title(),
-            "full_name": f"{self.get_full_name or ''}".title(),
-        }
+        return get_full_name(self.first_name, self.last_name)
@@ -7,12 +7,13 @@ It includes endpoints for user login and logout operations.
 URLs:
     - /login: POST request to authenticate and login a user
     - /logout: DELETE request to logout a currently authenticated user
+    - /refresh: POST request to issue a new signed access token from a refresh token
 
 """
 
 from django.urls import path
 
-from auth_user.views import LoginViewSet, LogoutViewSet
+from auth_user.views import LoginViewSet, LogoutViewSet, RefreshViewSet
 
 
 urlpatterns = [
@@ -26,4 +27,9 @@ urlpatterns = [
         LogoutViewSet.as_view(LogoutViewSet.get_method_view_mapping()),
         name="logout",
     ),
+    path(
+        "refresh",
+        RefreshViewSet.as_view(RefreshViewSet.get_method_view_mapping()),
+        name="refresh",
+    ),
 ]
@@ -3,7 +3,7 @@ Serializers for the auth_user app.
 """
 
 from .user import UserSerializer
-from .auth import LoginSerializer
+from .auth import LoginSerializer, RefreshSerializer
 from .swagger import (
     LoginResponseSerializer,
     LogoutResponseSerializer,
@@ -14,6 +14,7 @@ from .swagger import (
 
 __all__ = [
     "LoginSerializer",
+    "RefreshSerializer",
     "UserSerializer",
     "LoginResponseSerializer",
     "LogoutResponseSerializer",
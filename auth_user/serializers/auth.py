@@ -12,3 +12,11 @@ class LoginSerializer(serializers.Serializer):
 
     username = serializers.EmailField(required=True)
     password = serializers.CharField(required=True)
+
+
+class RefreshSerializer(serializers.Serializer):
+    """
+    Serializer for refreshing the signed access token.
+    """
+
+    refresh_token = serializers.CharField(required=True)
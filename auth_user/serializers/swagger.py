@@ -26,12 +26,16 @@ class LoginTokenDataSerializer(serializers.Serializer):
     A serializer for handling login token response data.
     Serializes an authentication token and its creation timestamp.
     Attributes:
-        token (str): The authentication token string.
+        token (str): The authentication token string, also the refresh token.
         created_dtm (datetime): The timestamp when the token was created.
+        access_token (str): The signed short-lived access token.
+        expires_in (int): The lifetime of the access token in seconds.
     """
 
     token = serializers.CharField(help_text="Authentication token.")
     created_dtm = serializers.DateTimeField(help_text="Token creation timestamp.")
+    access_token = serializers.CharField(help_text="Signed short-lived access token.")
+    expires_in = serializers.IntegerField(help_text="Access token lifetime in seconds.")
 
 
 class LoginResponseSerializer(CommonFields, serializers.Serializer):
@@ -63,6 +67,8 @@ login_success_example = OpenApiExample(
         "data": {
             "token": "BABD5D130CB04C05717D5D22635BBE4D",
             "created_dtm": "2025-04-18T07:25:20.135018Z",
+            "access_token": ".eJyrVirNzEmNz0wtUrJSMjA0MDI0MjI0Ng:1uJdKQ:6Zr8iF2bEwZ9N7mQ4YtB1Xh0cD3aLpVsWkq5TfOyUeg",
+            "expires_in": 300,
         },
         "errors": None,
         "messages": {"message": "Logged in successful."},
@@ -74,6 +80,47 @@ login_success_example = OpenApiExample(
 )
 
 
+class RefreshTokenDataSerializer(serializers.Serializer):
+    """
+    A serializer for handling refreshed access token data.
+    Attributes:
+        access_token (str): The signed short-lived access token.
+        expires_in (int): The lifetime of the access token in seconds.
+    """
+
+    access_token = serializers.CharField(help_text="Signed short-lived access token.")
+    expires_in = serializers.IntegerField(help_text="Access token lifetime in seconds.")
+
+
+class RefreshResponseSerializer(CommonFields, serializers.Serializer):
+    """
+    A serializer for handling the refresh response data.
+    """
+
+    data = RefreshTokenDataSerializer(help_text="The new access token.")
+    errors = serializers.JSONField(allow_null=True, help_text="Any errors.")
+    messages = serializers.JSONField(
+        allow_null=True, help_text="Informational messages."
+    )
+
+
+refresh_success_example = OpenApiExample(
+    name="Refresh Successful",
+    value={
+        "data": {
+            "access_token": ".eJyrVirNzEmNz0wtUrJSMjA0MDI0MjI0Ng:1uJdKQ:6Zr8iF2bEwZ9N7mQ4YtB1Xh0cD3aLpVsWkq5TfOyUeg",
+            "expires_in": 300,
+        },
+        "errors": None,
+        "messages": {"message": "Access token refreshed successfully."},
+        "status_code": status.HTTP_201_CREATED,
+        "is_success": True,
+    },
+    response_only=True,
+    status_codes=[str(status.HTTP_201_CREATED)],
+)
+
+
 # === 401 Wrong Credentials ===
 class WrongCredentialsSerialize(CommonFields, serializers.Serializer):
     """
@@ -2,11 +2,12 @@
 This module contains the views for the auth_user app.
 """
 
-from .auth import LoginViewSet, LogoutViewSet
+from .auth import LoginViewSet, LogoutViewSet, RefreshViewSet
 from .user import UserViewSet
 
 __all__ = [
     "UserViewSet",
     "LoginViewSet",
     "LogoutViewSet",
+    "RefreshViewSet",
 ]
@@ -10,9 +10,11 @@ from drf_spectacular.utils import extend_schema
 from base.views import CreateView, DeleteView
 
 from authentication import get_authentication_classes
-from authentication.exception import WrongCredentialsException
+from authentication.revocation import revoke_user_tokens
+from authentication.signed_token import create_access_token
+from authentication.exception import WrongCredentialsException, UnauthorizedException
 
-from utils.cache import cache
+from utils.exceptions import ValidationError
 from utils.response.response import generate_response
 from utils.swagger import (
     responses_400,
@@ -21,13 +23,15 @@ from utils.swagger import (
 )
 
 
-from ..serializers import LoginSerializer
+from ..serializers import LoginSerializer, RefreshSerializer
 from ..db_access import token_manager, user_manager
 from ..serializers.swagger import (
     LoginResponseSerializer,
     LogoutResponseSerializer,
+    RefreshResponseSerializer,
     login_success_example,
     logout_success_example,
+    refresh_success_example,
     responses_401_example,
 )
 
@@ -53,12 +57,7 @@ class LoginViewSet(CreateView, viewsets.ViewSet):
         if not user_obj:
             raise WrongCredentialsException()
 
-        self.manager.delete({"user": user_obj}, soft_delete=False)
-
-        token = secrets.token_hex(16).upper()
-
-        cache.set(f"user_token:{user_obj.user_id}", token)
-        print("Token set in cache:", cache.get(f"user_token:{user_obj.user_id}"))
+        revoke_user_tokens(user_obj.user_id)
 
         return {"user": user_obj, "token": secrets.token_hex(16).upper()}
 
@@ -74,6 +73,7 @@ class LoginViewSet(CreateView, viewsets.ViewSet):
         data.update(
             {
                 "full_name": full_name,
+                **create_access_token(obj),
             }
         )
 
@@ -95,6 +95,40 @@ class LoginViewSet(CreateView, viewsets.ViewSet):
         return super().create(request, *args, **kwargs)
 
 
+class RefreshViewSet(CreateView, viewsets.ViewSet):
+    """
+    ViewSet for issuing a new signed access token from a refresh token.
+    """
+
+    manager = token_manager
+    authentication_classes = []
+    serializer_class = RefreshSerializer
+
+    @extend_schema(
+        request=RefreshSerializer,
+        responses={201: RefreshResponseSerializer, **responses_401, **responses_400},
+        examples=[refresh_success_example, responses_401_example, responses_400_example],
+        tags=["Authentication"],
+    )
+    def create(self, request, *args, **kwargs):
+        """
+        Issue a new access token if the refresh token was not revoked.
+        """
+        serializer = self.serializer_class(data=request.data)
+        if not serializer.is_valid():
+            raise ValidationError(serializer.errors)
+
+        token = self.manager.get({"token": serializer.validated_data["refresh_token"]})
+        if not token:
+            raise UnauthorizedException()
+
+        return generate_response(
+            data=create_access_token(token),
+            status_code=status.HTTP_201_CREATED,
+            messages={"message": "Access token refreshed successfully."},
+        )
+
+
 class LogoutViewSet(DeleteView, viewsets.ViewSet):
     """
     ViewSet for handling logout related endpoints.
@@ -115,9 +149,7 @@ class LogoutViewSet(DeleteView, viewsets.ViewSet):
         Handle user logout by deleting the token associated with the user.
         """
 
-        self.manager.delete({"user": request.user}, soft_delete=False)
-
-        cache.delete(f"user_token:{request.user.id}")
+        revoke_user_tokens(request.user.user_id)
 
         return generate_response(
             data=None,
@@ -7,6 +7,8 @@ from drf_spectacular.utils import extend_schema
 
 from base.views import BaseView
 from authentication import get_authentication_classes
+from authentication.cache import token_cache
+from authentication.revocation import revoke_user_tokens
 
 from utils.swagger import (
     responses_400,
@@ -40,6 +42,19 @@ class UserViewSet(BaseView, viewsets.ViewSet):
     serializer_class = UserSerializer
     lookup_field = "user_id"
 
+    def post_update(self, obj, **kwargs):
+        """
+        Invalidate the cached tokens of the user, which hold a snapshot of it.
+        """
+        token_cache.delete_user(obj.user_id)
+        return super().post_update(obj, **kwargs)
+
+    def post_delete(self, *_, **kwargs):
+        """
+        Revoke the tokens of the deleted user.
+        """
+        revoke_user_tokens(kwargs[self.lookup_field])
+
     @extend_schema(
         responses={201: UserResponseSerializer, **responses_400, **responses_401},
         examples=[
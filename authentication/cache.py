@@ -0,0 +1,137 @@
+"""
+Cache of the authentication tokens.
+A token is resolved to a compact snapshot of its user from the two tier cache, its in-process
+LRU tier first then the shared tier, so authenticated requests on a warm cache run no query.
+Every token has a generation in the shared cache, bumped when it is invalidated. A snapshot is
+cached with the generation read before the token was read from the database, and is only
+served while the generation is unchanged: a snapshot read before a logout and cached after it
+is never served.
+"""
+
+from utils import settings
+from utils.cache import CacheInterface
+
+
+class TokenCache:
+    __doc__ = """
+    This class caches the token and user snapshot of the authentication tokens.
+    The cached tokens of a user are invalidated on logout, login and when the user is
+    updated or deleted, by bumping their generation.
+    Example:
+        token = token_cache.get(key)
+        if token is None:
+            generation = token_cache.get_generation(key)
+            token = token_manager.get({"token": key}, select_related=["user"])
+            token_cache.set(token, generation)
+    """
+
+    token_prefix = "auth_token:"
+    generation_prefix = "auth_token_generation:"
+    excluded_user_fields = ("password",)
+
+    def __init__(self):
+        self.cache = CacheInterface(
+            local_size=settings.read("AUTH_TOKEN_LOCAL_CACHE_SIZE"),
+            local_timeout=settings.read("AUTH_TOKEN_LOCAL_CACHE_TIMEOUT"),
+        )
+
+    @property
+    def timeout(self) -> int:
+        return settings.read("AUTH_TOKEN_CACHE_TIMEOUT")
+
+    @property
+    def generation_timeout(self) -> int:
+        # The generation outlives the snapshots cached with the previous ones.
+        return self.timeout * 2
+
+    def get(self, key: str):
+        """
+        Return the token of the given key with its user, None if it is not cached or has
+        been invalidated since it was cached.
+        """
+        generation_key = self.generation_prefix + key
+        values = self.cache.get_many([self.token_prefix + key, generation_key])
+
+        snapshot = values.get(self.token_prefix + key)
+        if snapshot is None or snapshot["generation"] != values.get(generation_key, 0):
+            return None
+
+        return self.load(snapshot)
+
+    def get_generation(self, key: str) -> int:
+        """
+        Return the generation of the token, read before the token is read from the database.
+        """
+        return self.cache.get(self.generation_prefix + key, 0, local=False)
+
+    def set(self, token, generation: int):
+        """
+        Cache the token with a snapshot of its user.
+        Args:
+            generation (int): The generation of the token read with `get_generation` before the
+                token was read from the database.
+        """
+        snapshot = self.dump(token)
+        snapshot["generation"] = generation
+
+        self.cache.set(self.token_prefix + token.token, snapshot, self.timeout)
+
+    def delete_tokens(self, tokens: list):
+        """
+        Invalidate the cached tokens by bumping their generation, once they are deleted or
+        their user is updated in the database.
+        """
+        for token in tokens:
+            key = self.generation_prefix + token
+            full_key = self.cache.make_key(key)
+
+            # The generation is created if missing, then incremented atomically.
+            self.cache.add(key, 0, self.generation_timeout)
+            try:
+                generation = self.cache.cache.incr(full_key)
+            except ValueError:
+                generation = 1
+                self.cache.cache.set(full_key, generation, self.generation_timeout)
+
+            self.cache.local.set(full_key, generation)
+            self.cache.local.delete(self.cache.make_key(self.token_prefix + token))
+
+    def delete_user(self, user_id: str):
+        """
+        Invalidate every cached token of the user.
+        """
+        from auth_user.db_access import token_manager
+
+        self.delete_tokens(
+            list(token_manager.list({"user_id": user_id}).values_list("token", flat=True))
+        )
+
+    def dump(self, token) -> dict:
+        from auth_user.models import User
+
+        user = token.user
+        return {
+            "token": (token.token, token.user_id, token.created_dtm),
+            "user": {
+                field.attname: getattr(user, field.attname)
+                for field in User._meta.concrete_fields
+                if field.name not in self.excluded_user_fields
+            },
+        }
+
+    def load(self, snapshot: dict):
+        """
+        Build the token and its user from a snapshot. The fields left out of the
+        snapshot are deferred and loaded from the database on access.
+        """
+        from auth_user.models import User
+        from auth_user.db_models import Token
+
+        token = Token.from_db(None, ["token", "user_id", "created_dtm"], snapshot["token"])
+        token.user = User.from_db(
+            None, list(snapshot["user"]), list(snapshot["user"].values())
+        )
+        return token
+
+
+token_cache = TokenCache()
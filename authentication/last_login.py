@@ -0,0 +1,141 @@
+"""
+Write-behind tracking of the users last login.
+Instead of saving the user on every authenticated request, the last login of a user is
+buffered in memory at most once per `LAST_LOGIN_UPDATE_INTERVAL` seconds, and the buffer is
+written every `LAST_LOGIN_FLUSH_INTERVAL` seconds with a single batched UPDATE.
+"""
+
+import atexit
+import logging
+import threading
+from time import monotonic
+
+from django.db import connection
+from django.utils import timezone
+
+from utils import settings
+from utils.logger import log_msg
+from utils.functions import get_current_datetime, is_management_command
+
+
+class LastLoginTracker:
+    __doc__ = """
+    This class buffers the last login of the users and flushes it in batches.
+    The last login written for a user never goes backwards, so processes flushing
+    their buffers in any order keep the latest value.
+    """
+
+    batch_size = 500
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._touched = {}
+        self._last_flush = monotonic()
+
+    @property
+    def update_interval(self) -> timezone.timedelta:
+        return timezone.timedelta(seconds=settings.read("LAST_LOGIN_UPDATE_INTERVAL"))
+
+    @property
+    def flush_interval(self) -> float:
+        return settings.read("LAST_LOGIN_FLUSH_INTERVAL")
+
+    def touch(self, user):
+        """
+        Record a request of the user. The last login is buffered only if the previous one
+        is older than the update interval, and the buffer is flushed when it is due.
+        """
+        now = get_current_datetime()
+
+        with self._lock:
+            last_login = self._touched.get(user.pk)
+            if last_login is None and "last_login" not in user.get_deferred_fields():
+                last_login = user.last_login
+
+            if last_login is None or now - last_login >= self.update_interval:
+                self._touched[user.pk] = now
+                self._pending[user.pk] = now
+                user.last_login = now
+
+            is_flush_due = monotonic() - self._last_flush >= self.flush_interval
+
+        if is_flush_due:
+            self.flush()
+
+    def flush(self):
+        """
+        Write the buffered last logins, one statement per batch of users.
+        On failure the values are put back in the buffer for the next flush.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._last_flush = monotonic()
+
+            # The users not touched since an update interval are in the database by now.
+            expired = get_current_datetime() - self.update_interval
+            self._touched = {
+                user_id: last_login
+                for user_id, last_login in self._touched.items()
+                if last_login > expired
+            }
+
+        if not pending:
+            return
+
+        rows = list(pending.items())
+
+        try:
+            for index in range(0, len(rows), self.batch_size):
+                self.write(rows[index : index + self.batch_size])
+        except Exception:
+            log_msg(logging.ERROR, "Failed to write the last login of the users.")
+            with self._lock:
+                for user_id, last_login in pending.items():
+                    self._pending[user_id] = max(
+                        last_login, self._pending.get(user_id, last_login)
+                    )
+
+    def write(self, rows: list):
+        """
+        Update the last login of the given `(user_id, last_login)` rows with
+        `WITH v AS (VALUES ...) UPDATE ... FROM v`, or `bulk_update` on databases
+        without `UPDATE ... FROM` (anything but PostgreSQL and SQLite).
+        """
+        from auth_user.models import User
+
+        if connection.vendor not in ("postgresql", "sqlite"):
+            users = User.objects.in_bulk([user_id for user_id, _ in rows])
+            for user_id, last_login in rows:
+                if user_id in users:
+                    users[user_id].last_login = last_login
+            User.objects.bulk_update(users.values(), ["last_login"])
+            return
+
+        qn = connection.ops.quote_name
+        table = qn(User._meta.db_table)
+        pk = qn(User._meta.pk.column)
+        column = qn(User._meta.get_field("last_login").column)
+
+        placeholder = "(%s, %s::timestamptz)" if connection.vendor == "postgresql" else "(%s, %s)"
+
+        params = []
+        for user_id, last_login in rows:
+            params.extend([user_id, connection.ops.adapt_datetimefield_value(last_login)])
+
+        sql = (
+            f"WITH v(user_id, last_login) AS (VALUES {', '.join([placeholder] * len(rows))}) "
+            f"UPDATE {table} SET {column} = v.last_login FROM v "
+            f"WHERE {table}.{pk} = v.user_id "
+            f"AND ({table}.{column} IS NULL OR {table}.{column} < v.last_login)"
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+
+
+last_login_tracker = LastLoginTracker()
+
+# Migrations and test runs must not write into the database once they are done with it.
+if not is_management_command():
+    atexit.register(last_login_tracker.flush)
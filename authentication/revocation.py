@@ -0,0 +1,177 @@
+"""
+Revocation of the authentication tokens.
+The `token` table is the list of the valid refresh tokens: revoking the tokens of a user
+deletes its rows, invalidates the token cache and adds them to a bloom filter kept in the
+shared cache, which the signed access tokens are checked against without a query.
+"""
+
+import time
+import uuid
+import hashlib
+
+from utils import settings
+from utils.logger import log_msg, logging
+from utils.cache import CacheInterface
+
+from auth_user.db_access import token_manager
+
+from .cache import token_cache
+
+
+# The filter is read-modified-written under a lock, it is only kept in the shared tier.
+cache = CacheInterface(local_size=0)
+
+
+class RevocationFilter:
+    __doc__ = """
+    This class is a bloom filter of the revoked refresh tokens, stored in the shared cache.
+    A signed access token lives `ACCESS_TOKEN_LIFETIME` seconds, so the filter is split in
+    windows of that length: a revocation is added to the current window, and the windows since
+    the token was issued are checked, older windows expire on their own.
+    Each window filter holds the time since which it has every revocation: it is created empty
+    when an access token is issued, or with its first revocation, and a filter missing or more
+    recent than the token, e.g. evicted or unreachable, can not tell the token is not revoked.
+    A hit may be a false positive and must be confirmed against the database.
+    """
+
+    key_prefix = "auth_revocation_filter:"
+    lock_key = "auth_revoked_filter_lock"
+    bypass_key = "auth_revoked_filter_bypass"
+    lock_attempts = 5
+    lock_timeout = 5
+
+    @property
+    def size(self) -> int:
+        return settings.read("TOKEN_REVOCATION_FILTER_BITS")
+
+    @property
+    def hash_count(self) -> int:
+        return settings.read("TOKEN_REVOCATION_FILTER_HASHES")
+
+    @property
+    def window(self) -> int:
+        return settings.read("ACCESS_TOKEN_LIFETIME")
+
+    @property
+    def timeout(self) -> int:
+        # A filter may be created a window ahead and is checked until the end of the next one.
+        return self.window * 3
+
+    def get_positions(self, value: str) -> list:
+        digest = hashlib.blake2b(value.encode(), digest_size=4 * self.hash_count).digest()
+        return [
+            int.from_bytes(digest[index * 4 : index * 4 + 4], "big") % self.size
+            for index in range(self.hash_count)
+        ]
+
+    def get_window(self, timestamp: float) -> int:
+        return int(timestamp // self.window)
+
+    def get_key(self, window: int) -> str:
+        return f"{self.key_prefix}{window}"
+
+    def get_empty_filter(self, since: float) -> tuple:
+        return since, bytes(self.size // 8 + 1)
+
+    def open(self, issued_at: float):
+        """
+        Create the empty filters of the windows an access token issued at `issued_at` is
+        checked in, unless they exist. No token issued before has been revoked in them yet.
+        """
+        current = self.get_window(issued_at)
+
+        try:
+            for window in (current, current + 1):
+                cache.add(
+                    self.get_key(window), self.get_empty_filter(issued_at), timeout=self.timeout
+                )
+        except Exception:
+            log_msg(logging.ERROR, "The revocation filter can not be created.")
+
+    def add(self, values: list):
+        """
+        Add the values to the filter of the current window.
+        The read-modify-write of the filter is serialized with a lock taken with `cache.add`.
+        When the lock can not be taken, the filter is not written: it is marked as bypassed
+        for the next windows, and every token is checked against the database.
+        """
+        if not values:
+            return
+
+        now = time.time()
+        key = self.get_key(self.get_window(now))
+        owner = uuid.uuid4().hex
+
+        try:
+            for _ in range(self.lock_attempts):
+                if cache.add(self.lock_key, owner, timeout=self.lock_timeout):
+                    break
+                time.sleep(0.01)
+            else:
+                log_msg(logging.WARNING, "The revocation filter is locked, it is bypassed.")
+                cache.set(self.bypass_key, 1, timeout=self.timeout)
+                return
+
+            try:
+                # A missing filter may have been evicted, it only has the revocations from now.
+                since, bits = cache.get(key) or self.get_empty_filter(now)
+                bits = bytearray(bits)
+                for value in values:
+                    for position in self.get_positions(value):
+                        bits[position // 8] |= 1 << (position % 8)
+
+                cache.set(key, (since, bytes(bits)), timeout=self.timeout)
+            finally:
+                # The lock may have expired and been taken by another writer meanwhile.
+                if cache.get(self.lock_key) == owner:
+                    cache.delete(self.lock_key)
+        except Exception:
+            log_msg(logging.ERROR, "The revocation filter can not be written.")
+
+    def might_contain(self, value: str, issued_at: float) -> bool:
+        """
+        Return False if the value was surely not revoked since `issued_at`.
+        Without the filters of the windows since then the value may have been revoked.
+        """
+        current = self.get_window(time.time())
+        windows = range(min(self.get_window(issued_at), current), current + 1)
+        keys = [self.get_key(window) for window in windows]
+
+        try:
+            filters = cache.get_many([*keys, self.bypass_key])
+        except Exception:
+            log_msg(logging.ERROR, "The revocation filter can not be read.")
+            return True
+
+        if filters.pop(self.bypass_key, None):
+            return True
+
+        positions = self.get_positions(value)
+
+        for window, key in zip(windows, keys):
+            if key not in filters:
+                return True
+
+            since, bits = filters[key]
+            if since > max(issued_at, window * self.window):
+                return True
+
+            if all(bits[position // 8] & (1 << (position % 8)) for position in positions):
+                return True
+
+        return False
+
+
+def revoke_user_tokens(user_id: str):
+    """
+    Revoke every token of the user: delete them, invalidate the token cache and add
+    them to the revocation filter so the access tokens issued from them are refused.
+    """
+    tokens = list(token_manager.list({"user_id": user_id}).values_list("token", flat=True))
+
+    token_manager.delete({"user_id": user_id}, soft_delete=False)
+    token_cache.delete_tokens(tokens)
+    revocation_filter.add(tokens)
+
+
+revocation_filter = RevocationFilter()
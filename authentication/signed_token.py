@@ -0,0 +1,92 @@
+"""
+Signed access token authentication for the API.
+The access tokens are short-lived and HMAC-signed with the secret key: they carry the user id,
+the refresh token they were issued from, their issue date and their expiry, so they are verified
+without any query.
+The refresh tokens are the rows of the `token` table, checked only through the revocation filter.
+To enable it, set `AUTHENTICATION_CLASSES` to `["authentication.signed_token.SignedTokenAuthentication"]`.
+"""
+
+import time
+
+from django.core import signing
+
+from utils import settings
+from auth_user.db_access import token_manager
+
+from .token import TokenAuthentication
+from .exception import UnauthorizedException
+from .last_login import last_login_tracker
+from .revocation import revocation_filter
+
+
+def create_access_token(token) -> dict:
+    """
+    Issue a signed access token from a refresh token.
+    Args:
+        token (Token): The refresh token of the user.
+    Returns:
+        dict: The `access_token` and its lifetime in seconds, `expires_in`.
+    """
+    expires_in = settings.read("ACCESS_TOKEN_LIFETIME")
+    issued_at = time.time()
+
+    revocation_filter.open(issued_at)
+
+    access_token = signing.dumps(
+        {
+            "uid": token.user_id,
+            "rid": token.token,
+            "iat": issued_at,
+            "exp": int(issued_at) + expires_in,
+        },
+        salt=settings.read("ACCESS_TOKEN_SALT"),
+        compress=True,
+    )
+
+    return {"access_token": access_token, "expires_in": expires_in}
+
+
+class SignedTokenAuthentication(TokenAuthentication):
+    """
+    Signed access token authentication class for API views.
+    Tokens which are not signed are authenticated as refresh tokens by `TokenAuthentication`.
+    """
+
+    def authenticate(self, request):
+        """
+        Authenticate the user from the signed access token of the request headers.
+        The user is returned with only its id loaded, the other fields are loaded on access.
+        """
+        auth_token_arr = (request.headers.get("Authorization") or "").split(" ")
+
+        if len(auth_token_arr) != 2 or ":" not in auth_token_arr[1]:
+            return super().authenticate(request)
+
+        if not auth_token_arr[0] == self.keyword:
+            raise UnauthorizedException()
+
+        try:
+            payload = signing.loads(
+                auth_token_arr[1], salt=settings.read("ACCESS_TOKEN_SALT")
+            )
+        except signing.BadSignature as exc:
+            raise UnauthorizedException() from exc
+
+        if payload["exp"] <= time.time():
+            raise UnauthorizedException()
+
+        # A token without its issue date is checked over its whole lifetime.
+        issued_at = payload.get("iat", payload["exp"] - settings.read("ACCESS_TOKEN_LIFETIME"))
+
+        if revocation_filter.might_contain(
+            payload["rid"], issued_at
+        ) and not token_manager.exists({"token": payload["rid"]}):
+            raise UnauthorizedException()
+
+        from auth_user.models import User
+
+        user = User.from_db(None, ["user_id"], [payload["uid"]])
+        last_login_tracker.touch(user)
+
+        return user, None
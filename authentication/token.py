@@ -5,10 +5,10 @@ This module provides a class that implements token-based authentication for API
 
 from rest_framework.authentication import BaseAuthentication
 
-from utils.functions import get_current_datetime
-
 from auth_user.db_access import token_manager
+from .cache import token_cache
 from .exception import UnauthorizedException
+from .last_login import last_login_tracker
 
 
 class TokenAuthentication(BaseAuthentication):
@@ -24,6 +24,8 @@ class TokenAuthentication(BaseAuthentication):
         Authenticate the user based on the token provided in the request headers.
         If the token is valid, return the user and token objects.
         If the token is invalid or missing, raise an UnauthorizedException.
+        The token and its user are read from the token cache, and from the database
+        in a single query on a cache miss.
         """
 
         auth_token = request.headers.get("Authorization") or ""
@@ -39,13 +41,22 @@ class TokenAuthentication(BaseAuthentication):
         if not auth_token_arr[0] == self.keyword:
             raise UnauthorizedException()
 
-        token = token_manager.get({"token": auth_token_arr[1]})
+        token = token_cache.get(auth_token_arr[1])
+
         if not token:
-            raise UnauthorizedException()
+            # Read before the token, a logout in between invalidates the cached snapshot.
+            generation = token_cache.get_generation(auth_token_arr[1])
+
+            token = token_manager.get(
+                {"token": auth_token_arr[1]}, select_related=["user"]
+            )
+            if not token:
+                raise UnauthorizedException()
+
+            token_cache.set(token, generation)
 
         user = token.user
-        user.last_login = get_current_datetime()
-        user.save()
+        last_login_tracker.touch(user)
 
         return user, token
 
@@ -1,3 +1,4 @@
+from .cache import CachePolicy
 from .manager import Manager
 
-__all__ = ["Manager"]
\ No newline at end of file
+__all__ = ["CachePolicy", "Manager"]
\ No newline at end of file
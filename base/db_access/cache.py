@@ -0,0 +1,188 @@
+"""
+Query result cache of the managers.
+A manager with a `cache_policy` caches the results of its read methods in the shared cache, keyed
+by the normalized query and the generation of the model. The generation is bumped whenever a row
+of the model is written, by the `post_save` and `post_delete` signals and by the bulk writes of the
+manager, so that the results cached for the previous generation are no longer read.
+- A write in a transaction bumps the generation again on commit, as another process may have
+  cached the previous rows in between.
+- The reads of a model written in the current transaction bypass the cache, its uncommitted rows
+  must not be cached for the other processes.
+- The writes bypassing the manager and the signals, e.g. `QuerySet.update` or `bulk_create`,
+  must call `invalidate`.
+"""
+
+import json
+import uuid
+import hashlib
+import datetime
+import threading
+from decimal import Decimal
+
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import Model
+from django.db.models.signals import post_save, post_delete
+
+from utils import settings
+from utils.cache import CacheInterface
+
+CACHED_METHODS = ("get", "exists", "count", "get_objects_mapping")
+
+# The labels of the models written in the current transaction, by database alias.
+_dirty = threading.local()
+
+
+class CachePolicy:
+    __doc__ = """
+    This class sets which read methods of a manager are cached, and for how long.
+    Args:
+        methods (tuple): The cached methods, among `CACHED_METHODS`.
+        timeout (int, optional): The timeout of the results in seconds.
+            Defaults to `QUERY_CACHE_TIMEOUT`.
+    Example:
+        class VehicleManager(manager.Manager[Vehicle]):
+            model = Vehicle
+            cache_policy = CachePolicy(methods=("get", "exists"))
+    """
+
+    def __init__(self, methods: tuple = CACHED_METHODS, timeout: int = None):
+        unknown = set(methods) - set(CACHED_METHODS)
+        if unknown:
+            raise ValueError(f"The methods {sorted(unknown)} can not be cached.")
+
+        self.methods = tuple(methods)
+        self.timeout = timeout
+
+    def get_timeout(self) -> int:
+        return self.timeout or settings.read("QUERY_CACHE_TIMEOUT")
+
+
+def get_namespace_cache(model) -> CacheInterface:
+    """
+    Return the cache of the results of the model, its namespace version is the generation of
+    the model. The local tier is disabled so that the generation is always read from the
+    shared tier, a write in another process invalidates the results at once.
+    """
+    return CacheInterface(namespace=f"query:{model._meta.label_lower}", local_size=0)
+
+
+def in_transaction(using: str = DEFAULT_DB_ALIAS) -> bool:
+    # The atomic blocks wrapping the test cases are not transactions of the application.
+    return any(
+        not getattr(block, "_from_testcase", False)
+        for block in connections[using].atomic_blocks
+    )
+
+
+def get_dirty(using: str = DEFAULT_DB_ALIAS) -> set:
+    """
+    Return the labels of the models written in the current transaction.
+    """
+    dirty = _dirty.__dict__.setdefault(using, set())
+
+    # The labels of a committed or rolled back transaction.
+    if not in_transaction(using):
+        dirty.clear()
+
+    return dirty
+
+
+def invalidate(model, using: str = DEFAULT_DB_ALIAS):
+    """
+    Bump the generation of the model, in a transaction once more on commit.
+    """
+    cache = get_namespace_cache(model)
+    cache.invalidate_namespace()
+
+    if in_transaction(using):
+        get_dirty(using).add(model._meta.label_lower)
+        transaction.on_commit(cache.invalidate_namespace, using=using)
+
+
+def encode(value):
+    """
+    Encode the values of a query which are not JSON types. The other values, e.g. querysets
+    or expressions, make the query uncacheable.
+    """
+    if isinstance(value, Model):
+        return encode(value.pk)
+    if isinstance(value, (uuid.UUID, datetime.date, datetime.time, Decimal)):
+        return str(value)
+    if isinstance(value, (set, frozenset, tuple)):
+        return sorted(value, key=str) if isinstance(value, (set, frozenset)) else list(value)
+
+    raise TypeError(f"{type(value).__name__} is not cacheable.")
+
+
+def make_key(method: str, query: dict, options: dict) -> str | None:
+    """
+    Return the key of the results of a read, None if the query is not cacheable.
+    """
+    try:
+        payload = json.dumps(
+            [method, query or {}, options], sort_keys=True, default=encode
+        )
+    except TypeError:
+        return None
+
+    return f"{method}:{hashlib.md5(payload.encode()).hexdigest()}"
+
+
+class QueryCache:
+    __doc__ = """
+    This class caches the results of the read methods of a manager for the model.
+    The generation of the model is bumped on the `post_save` and `post_delete` signals.
+    Args:
+        model (Model): The model of the manager.
+        policy (CachePolicy): The cached methods and the timeout.
+    """
+
+    def __init__(self, model, policy: CachePolicy):
+        self.model = model
+        self.policy = policy
+        self.label = model._meta.label_lower
+        self.cache = get_namespace_cache(model)
+
+        for signal in (post_save, post_delete):
+            signal.connect(
+                self.on_write,
+                sender=model,
+                weak=False,
+                dispatch_uid=f"query_cache:{self.label}",
+            )
+
+    def on_write(self, sender, using=DEFAULT_DB_ALIAS, **__):
+        invalidate(sender, using=using)
+
+    def invalidate(self):
+        invalidate(self.model)
+
+    def fetch(self, method: str, query: dict, compute, **options):
+        """
+        Return the cached result of the read, or compute it with `compute` and cache it.
+        Args:
+            method (str): The read method, the result is only cached if the policy caches it.
+            query (dict): The query of the read.
+            compute (callable): Reads the result from the database.
+            **options: The other arguments of the read changing its result.
+        """
+        if method not in self.policy.methods or self.label in get_dirty():
+            return compute()
+
+        key = make_key(method, query, options)
+        if key is None:
+            return compute()
+
+        # The key is built with the generation before the read, a result read before a
+        # concurrent write is cached for the previous generation only.
+        full_key = self.cache.make_key(key)
+
+        entry = self.cache.cache.get(full_key)
+        if entry is not None:
+            return entry[0]
+
+        # Wrapped so that a cached None is told apart from a missing key.
+        value = compute()
+        self.cache.cache.set(full_key, (value,), self.policy.get_timeout())
+
+        return value
@@ -0,0 +1,99 @@
+"""
+Request-scoped identity map of the managers.
+While an `IdentityMap` is active, set by `middleware.identity.IdentityMapMiddleware` for the
+duration of a request, `Manager.get`, `exists` and `get_objects_mapping` read the rows already
+loaded in the request by `(model, pk)` instead of querying them again, and the results of
+`exists` are memoized by query.
+- The entries of a model are discarded on its `post_save` signal and on the writes of the
+  manager, the next read loads the row again. No `post_delete` receiver is connected for every
+  model as it would disable the fast deletes, the rows deleted outside of a manager must be
+  discarded with `IdentityMap.discard`.
+- Only the objects loaded with all their fields and without relations are kept.
+- The objects are shared by the readers of the request, they must not be modified in place.
+"""
+
+from contextvars import ContextVar
+from contextlib import contextmanager
+
+from django.dispatch import receiver
+from django.db.models.signals import post_save
+
+from .cache import make_key
+
+identity_map: ContextVar = ContextVar("identity_map", default=None)
+
+
+class IdentityMap:
+    __doc__ = """
+    This class keeps the objects loaded in a request by `(model, pk)`, a known missing row
+    is kept as None, and the results of `exists` by model and query.
+    Example:
+        with IdentityMap().activate():
+            vehicle_manager.get({"vehicle_id": vehicle_id})
+            vehicle_manager.exists({"vehicle_id": vehicle_id})  # no query
+    """
+
+    def __init__(self):
+        self.objects = {}
+        self.exists_results = {}
+
+    @contextmanager
+    def activate(self):
+        token = identity_map.set(self)
+        try:
+            yield self
+        finally:
+            identity_map.reset(token)
+
+    def get(self, model, pk) -> tuple[bool, object]:
+        """
+        Returns:
+            tuple: Whether the row is known, and its object, None if it does not exist.
+        """
+        key = (model._meta.label_lower, pk)
+        if key not in self.objects:
+            return False, None
+
+        return True, self.objects[key]
+
+    def add(self, model, obj, pk=None):
+        """
+        Keep the object, or the missing row of the primary key when the object is None.
+        """
+        if obj is not None:
+            pk = obj.pk
+
+        if pk is not None:
+            self.objects[(model._meta.label_lower, pk)] = obj
+
+    def get_or_set_exists(self, model, query: dict, compute) -> bool:
+        key = make_key("exists", query, {})
+        if key is None:
+            return compute()
+
+        key = (model._meta.label_lower, key)
+        if key not in self.exists_results:
+            self.exists_results[key] = compute()
+
+        return self.exists_results[key]
+
+    def discard(self, model):
+        """
+        Discard the objects and the `exists` results of the model.
+        """
+        label = model._meta.label_lower
+
+        self.objects = {key: obj for key, obj in self.objects.items() if key[0] != label}
+        self.exists_results = {
+            key: result for key, result in self.exists_results.items() if key[0] != label
+        }
+
+
+@receiver(post_save)
+def discard_written_model(sender, **__):
+    """
+    Signal receiver that discards the entries of a written model from the active identity map.
+    """
+    current = identity_map.get()
+    if current is not None:
+        current.discard(sender)
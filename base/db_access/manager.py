@@ -2,16 +2,27 @@
 This is the model BaseManager class which is used to perform CRUD operations on the models.
 """
 
-from typing import Union, TypeVar, Generic, overload, List, Dict
+from typing import Union, TypeVar, Generic, overload, List, Dict, Iterator
 
 from rest_framework import status
+from django.utils import timezone
+from django.db import connections, transaction
 from django.db.models import Q, F, Model
+from django.db.models.sql import UpdateQuery
 from django.db.models.query import QuerySet
+from django.core.exceptions import (
+    EmptyResultSet,
+    FieldDoesNotExist,
+    ValidationError as DjangoValidationError,
+)
 
 from utils.messages import error
-from utils.pagination import Pagination
+from utils.pagination import Pagination, CursorPagination
 from utils.exceptions import CommonError
 
+from .cache import CachePolicy, QueryCache
+from .identity_map import identity_map
+
 
 T = TypeVar("T", bound=Model)
 
@@ -121,12 +132,16 @@ class Manager(Generic[T]):
     model instances with support for both single and bulk operations.
     Attributes:
         model (Model): The Django model class that this manager operates on. Must be set by subclasses.
+        cache_policy (CachePolicy, optional): Caches the results of `get`, `exists`, `count` and
+            `get_objects_mapping` until a row of the model is written, see `base.db_access.cache`.
     Methods:
         get: Retrieve a single object based on query parameters.
         list: Retrieve multiple objects based on query parameters.
+        iterate: Stream objects based on query parameters with a server-side cursor.
         create: Create one or multiple new model instances.
         update: Update existing model instances.
         upsert: Update existing instance or create new if not found.
+        bulk_upsert: Insert or update many instances with `INSERT ... ON CONFLICT DO UPDATE`.
         delete: Delete (soft or hard) model instances.
         class UserManager(Manager):
             model = User
@@ -144,6 +159,79 @@ class Manager(Generic[T]):
     model: Model = None
     check_is_deleted: bool = True
     query_builder = QueryBuilder()
+    cursor_ordering: tuple = ("created_dtm", "pk")
+    bulk_batch_size: int = 1000
+    iterate_chunk_size: int = 2000
+    upsert_excluded_fields: tuple = ("created_by", "created_dtm")
+    cache_policy: CachePolicy = None
+
+    def __init__(self):
+        self.query_cache = (
+            QueryCache(self.model, self.cache_policy) if self.cache_policy else None
+        )
+
+    def __cached(self, method: str, query: dict, compute, **options):
+        """
+        Return the result of the read from the query cache when the manager has a `cache_policy`.
+        """
+        if self.query_cache is None:
+            return compute()
+
+        return self.query_cache.fetch(method, query, compute, **options)
+
+    def __invalidate(self):
+        """
+        Invalidate the query cache and the identity map after a write which sends no signal.
+        """
+        if self.query_cache is not None:
+            self.query_cache.invalidate()
+
+        self.__discard()
+
+    def __discard(self):
+        """
+        Discard the objects of the model from the identity map of the request.
+        """
+        current_identity_map = identity_map.get()
+        if current_identity_map is not None:
+            current_identity_map.discard(self.model)
+
+    def __get_pk_lookup(self, query: dict) -> tuple[str, object] | None:
+        """
+        Return the lookup and the value of a query on the primary key only, e.g.
+        `{"customer_id": value}` or `{"pk__in": values}`, None for the other queries.
+        """
+        if not query or len(query) != 1:
+            return None
+
+        ((key, value),) = query.items()
+        name, _, lookup = key.partition("__")
+
+        pk = self.model._meta.pk
+        if name not in ("pk", pk.name, pk.attname) or lookup not in ("", "exact", "in"):
+            return None
+
+        try:
+            if lookup == "in":
+                if not isinstance(value, (list, tuple, set)):
+                    return None
+                return "in", [pk.to_python(item) for item in value]
+
+            if value is None or isinstance(value, (dict, list, tuple, set, Model)):
+                return None
+            return "exact", pk.to_python(value)
+        except DjangoValidationError:
+            return None
+
+    def __get_pk(self, query: dict):
+        """
+        Return the primary key of a query on the primary key only, None for the other queries.
+        """
+        pk_lookup = self.__get_pk_lookup(query)
+        if pk_lookup is None or pk_lookup[0] != "exact":
+            return None
+
+        return pk_lookup[1]
 
     def __parse_query(self, query, is_deleted=False) -> QuerySet[T]:
         """
@@ -160,7 +248,7 @@ class Manager(Generic[T]):
             result = model_manager.__parse_query(query)
         """
 
-        query = query or dict()
+        query = dict(query or dict())
 
         if self.check_is_deleted:
             query["is_deleted"] = is_deleted
@@ -169,16 +257,85 @@ class Manager(Generic[T]):
 
         return objects
 
-    def get(self, query) -> T | None:
+    def __load_relations(
+        self,
+        objects: QuerySet[T],
+        only: list = None,
+        select_related: list = None,
+        prefetch_related: list = None,
+    ) -> QuerySet[T]:
+        """
+        Apply the declarative loading specs on the queryset.
+        Args:
+            objects (QuerySet): The queryset to apply the specs on.
+            only (list, optional): Fields to load, related fields can be given as `customer__first_name`.
+            select_related (list, optional): Forward relations to load with a JOIN in the same query.
+            prefetch_related (list, optional): Relations to load with one extra query per relation.
+        Returns:
+            QuerySet: The queryset with the loading specs applied.
+        """
+
+        if select_related:
+            objects = objects.select_related(*select_related)
+
+        if prefetch_related:
+            objects = objects.prefetch_related(*prefetch_related)
+
+        if only:
+            objects = objects.only(*only)
+
+        return objects
+
+    def get(
+        self,
+        query,
+        only: list = None,
+        select_related: list = None,
+        prefetch_related: list = None,
+    ) -> T | None:
         """
         Get the object based on the query.
         Args:
             query (dict): The main query dictionary for filtering objects. If None, an empty dict is used.
+            only (list, optional): List of fields to include in the result. Defaults to None.
+            select_related (list, optional): Forward relations to JOIN in the same query. Defaults to None.
+            prefetch_related (list, optional): Relations to prefetch. Defaults to None.
         Returns:
             object: The first object that matches the query criteria. Returns None if no match is found.
-
+        Note:
+            The objects loaded with related objects are not cached, the writes of the related
+            models do not invalidate them. A query on the primary key is read from the identity
+            map of the request first, and runs without the ORDER BY of `first()`.
         """
-        return self.__parse_query(query=query).first()
+        pk = self.__get_pk(query)
+
+        def compute():
+            objects = self.__load_relations(
+                self.__parse_query(query=query),
+                only=only,
+                select_related=select_related,
+                prefetch_related=prefetch_related,
+            )
+            if pk is not None:
+                return next(iter(objects[:1]), None)
+            return objects.first()
+
+        if select_related or prefetch_related:
+            return compute()
+
+        current_identity_map = identity_map.get()
+        if only or current_identity_map is None:
+            return self.__cached("get", query, compute, only=only)
+
+        if pk is not None:
+            found, obj = current_identity_map.get(self.model, pk)
+            if found:
+                return obj
+
+        obj = self.__cached("get", query, compute)
+        current_identity_map.add(self.model, obj, pk=pk)
+
+        return obj
 
     def get_objects_mapping(
         self,
@@ -186,17 +343,66 @@ class Manager(Generic[T]):
         only: list = None,
         order_by: list = None,
         mapping_by: str = "pk",
+        select_related: list = None,
+        prefetch_related: list = None,
     ) -> Dict[str, T]:
+        """
+        Return the objects matching the query by the value of their `mapping_by` field.
+        A `{"pk__in": values}` query mapped by primary key is served from the identity map of
+        the request when all its rows are already loaded.
+        """
 
-        objects = self.list(query=query, only=only, order_by=order_by)
+        def compute():
+            objects = self.list(
+                query=query,
+                only=only,
+                order_by=order_by,
+                select_related=select_related,
+                prefetch_related=prefetch_related,
+            )
+            return {getattr(obj, mapping_by): obj for obj in objects}
+
+        if select_related or prefetch_related:
+            return compute()
+
+        current_identity_map = identity_map.get()
+        if only or current_identity_map is None:
+            return self.__cached(
+                "get_objects_mapping",
+                query,
+                compute,
+                only=only,
+                order_by=order_by,
+                mapping_by=mapping_by,
+            )
+
+        pk_lookup = self.__get_pk_lookup(query)
+        is_pk_mapping = mapping_by in ("pk", self.model._meta.pk.name)
+        if pk_lookup is not None and pk_lookup[0] == "in" and is_pk_mapping and not order_by:
+            loaded = [current_identity_map.get(self.model, pk) for pk in pk_lookup[1]]
+            if all(found for found, _ in loaded):
+                return {obj.pk: obj for _, obj in loaded if obj is not None}
+
+        objects = self.__cached(
+            "get_objects_mapping",
+            query,
+            compute,
+            order_by=order_by,
+            mapping_by=mapping_by,
+        )
+        for obj in objects.values():
+            current_identity_map.add(self.model, obj)
 
-        return {getattr(obj, mapping_by): obj for obj in objects}
+        return objects
 
     def list(
         self,
         query,
         only: list = None,
         order_by: list = None,
+        select_related: list = None,
+        prefetch_related: list = None,
+        values: list = None,
     ) -> QuerySet[T]:
         """
         Returns a list of objects based on the provided query parameters.
@@ -204,22 +410,74 @@ class Manager(Generic[T]):
             query (dict, optional): Primary query dictionary for filtering objects. Defaults to None.
             only (list, optional): List of fields to include in the result. Defaults to None.
             order_by (list, optional): List of fields to order the result by. Defaults to None.
+            select_related (list, optional): Forward relations to JOIN in the same query. Defaults to None.
+            prefetch_related (list, optional): Relations to prefetch. Defaults to None.
+            values (list, optional): Columns to return as `values_list` tuples instead of objects,
+                e.g. the `columns` of a serialization. The relations are then not loaded.
         Returns:
             list: A list of objects that match the query criteria after parsing.
         Example:
-            model_mgr.list({'status': 'active'})
+            model_mgr.list({'status': 'active'}, select_related=['customer'])
+            model_mgr.list({'status': 'active'}, values=Invoice.serialization.columns)
         """
 
-        objects = self.__parse_query(query=query)
-
-        if only:
-            objects = objects.only(*only)
+        if values is not None:
+            objects = self.__parse_query(query=query)
+        else:
+            objects = self.__load_relations(
+                self.__parse_query(query=query),
+                only=only,
+                select_related=select_related,
+                prefetch_related=prefetch_related,
+            )
 
         if order_by:
             objects = objects.order_by(*order_by)
 
+        if values is not None:
+            objects = objects.values_list(*values)
+
         return objects
 
+    def iterate(
+        self,
+        query,
+        chunk_size: int = None,
+        only: list = None,
+        order_by: list = None,
+        select_related: list = None,
+        prefetch_related: list = None,
+        values: list = None,
+    ) -> Iterator[T]:
+        """
+        Stream the objects matching the query without loading the whole result in memory.
+        The rows are fetched `chunk_size` at a time from a server-side cursor on PostgreSQL,
+        and from the open cursor on the other databases. The relations given in
+        `prefetch_related` are prefetched once per chunk.
+        Args:
+            query (dict): Primary query dictionary for filtering objects.
+            chunk_size (int, optional): Number of rows fetched at a time. Defaults to `iterate_chunk_size`.
+            only (list, optional): List of fields to include in the result. Defaults to None.
+            order_by (list, optional): List of fields to order the result by. Defaults to `cursor_ordering`.
+            select_related (list, optional): Forward relations to JOIN in the same query. Defaults to None.
+            prefetch_related (list, optional): Relations to prefetch per chunk. Defaults to None.
+            values (list, optional): Columns to return as `values_list` tuples instead of objects.
+        Returns:
+            Iterator: The objects matching the query.
+        Example:
+            for invoice in invoice_manager.iterate({'status': 'PAID'}, chunk_size=5000): ...
+        """
+        objects = self.list(
+            query=query,
+            only=only,
+            order_by=order_by or self.cursor_ordering,
+            select_related=select_related,
+            prefetch_related=prefetch_related,
+            values=values,
+        )
+
+        return objects.iterator(chunk_size=chunk_size or self.iterate_chunk_size)
+
     def count(self, query: dict) -> int:
         """
         Count the number of objects based on the provided query.
@@ -230,7 +488,7 @@ class Manager(Generic[T]):
         Example:
             model_mgr.count({'status': 'active'})
         """
-        return self.__parse_query(query=query).count()
+        return self.__cached("count", query, lambda: self.__parse_query(query=query).count())
 
     def exists(self, query: dict) -> bool:
         """
@@ -242,7 +500,41 @@ class Manager(Generic[T]):
         Example:
             model_mgr.exists({'status': 'active'})
         """
-        return self.__parse_query(query=query).exists()
+
+        def compute():
+            return self.__cached(
+                "exists", query, lambda: self.__parse_query(query=query).exists()
+            )
+
+        current_identity_map = identity_map.get()
+        if current_identity_map is None:
+            return compute()
+
+        pk = self.__get_pk(query)
+        if pk is not None:
+            found, obj = current_identity_map.get(self.model, pk)
+            if found:
+                return obj is not None
+
+        return current_identity_map.get_or_set_exists(self.model, query, compute)
+
+    def get_pagination_ordering(self, order_by: list = None) -> list:
+        """
+        Return a stable ordering for paginated lists.
+        Falls back to `cursor_ordering` and always ends with the primary key so that
+        rows with equal sort values keep a deterministic order between pages.
+        Args:
+            order_by (list, optional): Requested ordering. Defaults to `cursor_ordering`.
+        Returns:
+            list: The ordering to apply on the queryset.
+        """
+        ordering = list(order_by or self.cursor_ordering)
+
+        pk_names = ("pk", self.model._meta.pk.name)
+        if not any(str(order).lstrip("-") in pk_names for order in ordering):
+            ordering.append("pk")
+
+        return ordering
 
     def list_with_pagination(
         self,
@@ -250,15 +542,109 @@ class Manager(Generic[T]):
         only: list = None,
         order_by: list = None,
         pagination: dict = None,
-    ) -> tuple[QuerySet[T], dict[str, int]]:
-        objects = self.list(query=query, only=only, order_by=order_by)
+        select_related: list = None,
+        prefetch_related: list = None,
+        values: list = None,
+    ) -> tuple[QuerySet[T] | List[T], dict[str, int]]:
+        """
+        Returns a page of objects based on the provided query parameters.
+        Two modes are supported:
+        - Page mode (default): `{"page": 1, "page_size": 10}` uses OFFSET and returns the total count.
+        - Cursor mode: `{"cursor": "", "page_size": 10}` seeks on the ordering values of the last
+          row of the previous page, so deep pages cost the same as the first one and no COUNT is run.
+          An empty cursor returns the first page.
+        Args:
+            query (dict): Primary query dictionary for filtering objects.
+            only (list, optional): List of fields to include in the result. Defaults to None.
+            order_by (list, optional): List of fields to order the result by. Defaults to `cursor_ordering`.
+            pagination (dict): Pagination parameters.
+            select_related (list, optional): Forward relations to JOIN in the same query. Defaults to None.
+            prefetch_related (list, optional): Relations to prefetch for the current page. Defaults to None.
+            values (list, optional): Columns to return as `values_list` tuples instead of objects,
+                see `paginate`.
+        Returns:
+            tuple: The objects of the current page and the pagination details.
+        Example:
+            model_mgr.list_with_pagination({'status': 'active'}, pagination={'cursor': '', 'page_size': 20})
+        """
+        ordering = self.get_pagination_ordering(order_by)
+
+        objects = self.list(
+            query=query,
+            only=only,
+            order_by=ordering,
+            select_related=select_related,
+            prefetch_related=prefetch_related,
+        )
 
-        page_number: int = pagination["page"]
+        return self.paginate(objects, ordering=ordering, pagination=pagination, values=values)
+
+    def get_projection(self, values: list, ordering: list) -> list:
+        """
+        Return the columns of the paginated rows: the requested columns followed by the
+        ordering columns they miss, read by the cursor of the next page.
+        """
+        projection = list(values)
+
+        for order in ordering:
+            name = order.lstrip("-")
+            try:
+                field = self.model._meta.pk if name == "pk" else self.model._meta.get_field(name)
+                name = field.attname
+            except FieldDoesNotExist:
+                pass
+
+            if name not in projection:
+                projection.append(name)
+
+        return projection
+
+    def paginate(
+        self,
+        objects: QuerySet,
+        ordering: list,
+        pagination: dict,
+        count: int = None,
+        values: list = None,
+    ) -> tuple[QuerySet | List, dict[str, int]]:
+        """
+        Paginate an already built and ordered queryset, in page or cursor mode.
+        Args:
+            objects (QuerySet): The queryset ordered by `ordering`.
+            ordering (list): The ordering applied on the queryset, used to build the cursor.
+            pagination (dict): Pagination parameters, see `list_with_pagination`.
+            count (int, optional): Precomputed total count for page mode, avoids counting
+                expensive (e.g. aggregated) querysets. Defaults to `objects.count()`.
+            values (list, optional): Columns to return as `values_list` tuples instead of objects.
+                The rows start with these columns, followed by the ordering columns they miss.
+        Returns:
+            tuple: The objects of the current page and the pagination details.
+        """
         page_size = pagination.get("page_size", None)
 
+        columns = None
+        if values is not None:
+            columns = self.get_projection(values, ordering)
+            objects = objects.values_list(*columns)
+
+        if "cursor" in pagination:
+            pagination_obj = CursorPagination(
+                model=self.model,
+                ordering=ordering,
+                page_size=page_size,
+                cursor=pagination["cursor"],
+                columns=columns,
+            )
+            return pagination_obj.get_current_page_objs(objects), {
+                "page_size": pagination_obj.page_size,
+                "next_cursor": pagination_obj.next_cursor,
+            }
+
+        page_number: int = pagination["page"]
+
         pagination_obj = Pagination(
             page_size=page_size,
-            count=objects.count(),
+            count=objects.count() if count is None else count,
             current_page=page_number,
         )
         return pagination_obj.get_current_page_objs(objects), {
@@ -301,21 +687,26 @@ class Manager(Generic[T]):
 
         objects = self.__parse_query(query=query)
 
-        if self.check_is_deleted:
-            if soft_delete:
-                data = data or dict()
-                data["is_deleted"] = True
-                return objects.update(**data)
+        if self.check_is_deleted and soft_delete:
+            data = data or dict()
+            data["is_deleted"] = True
+            deleted = objects.update(**data)
+        else:
+            deleted = objects.delete()
 
-        return objects.delete()
+        self.__invalidate()
+
+        return deleted
 
     @overload
-    def create(self, data: dict, many: False = False) -> T: ...
+    def create(self, data: dict, many: False = False, batch_size: int = None) -> T: ...
 
     @overload
-    def create(self, data: List[dict], many: True = True) -> QuerySet[T]: ...
+    def create(
+        self, data: List[dict], many: True = True, batch_size: int = None
+    ) -> QuerySet[T]: ...
 
-    def create(self, data, many=False) -> Union[T, QuerySet[T]]:
+    def create(self, data, many=False, batch_size=None) -> Union[T, QuerySet[T]]:
         """
         Create one or multiple instances of the model.
         Args:
@@ -323,6 +714,8 @@ class Manager(Generic[T]):
                 If many=True, should be a list of dictionaries.
                 If many=False, should be a single dictionary.
             many (bool, optional): Whether to create multiple instances. Defaults to False.
+            batch_size (int, optional): Rows per INSERT statement when many=True.
+                Defaults to `bulk_batch_size`.
         Returns:
             Model instance or list: The created model instance(s).
                 If many=True, returns a list of created model instances.
@@ -338,47 +731,253 @@ class Manager(Generic[T]):
         """
 
         if many:
-            return self.model.objects.bulk_create([self.model(**obj) for obj in data])
+            objs = self.model.objects.bulk_create(
+                [self.model(**obj) for obj in data],
+                batch_size=batch_size or self.bulk_batch_size,
+            )
+            self.__invalidate()
+            return objs
 
         return self.model.objects.create(**data)
 
-    def update(self, data, query) -> T | None:
+    def get_upsert_update_fields(self, rows: List[dict], unique_fields: list) -> list:
+        """
+        Return the fields overwritten on conflict by `bulk_upsert`: every field provided in the rows
+        except the primary key, the unique fields and `upsert_excluded_fields`, plus the
+        `auto_now` fields such as `updated_dtm`.
+        """
+        excluded = {self.model._meta.pk.name, *self.upsert_excluded_fields}
+        excluded.update(self.model._meta.get_field(name).name for name in unique_fields)
+
+        update_fields = {
+            field.name
+            for field in self.model._meta.concrete_fields
+            if getattr(field, "auto_now", False)
+        }
+        update_fields.update(
+            self.model._meta.get_field(key).name for row in rows for key in row
+        )
+
+        return sorted(update_fields - excluded)
+
+    def bulk_upsert(
+        self,
+        rows: List[dict],
+        unique_fields: list,
+        update_fields: list = None,
+        batch_size: int = None,
+    ) -> List[T]:
+        """
+        Insert or update many instances with `INSERT ... ON CONFLICT (unique_fields) DO UPDATE`,
+        one statement per batch, instead of a get and a save per row.
+        Args:
+            rows (list): The data of the instances, one dictionary per row.
+            unique_fields (list): Fields of the unique constraint the conflicts are detected on.
+            update_fields (list, optional): Fields overwritten when the row already exists.
+                Defaults to `get_upsert_update_fields`.
+            batch_size (int, optional): Rows per statement. Defaults to `bulk_batch_size`.
+        Returns:
+            list: The upserted instances, carrying the primary key of the stored rows.
+        Example:
+            >>> vehicle_manager.bulk_upsert(rows, unique_fields=["vehicle_number"])
+        """
+        if not rows:
+            return []
+
+        if update_fields is None:
+            update_fields = self.get_upsert_update_fields(rows, unique_fields)
+
+        batch_size = batch_size or self.bulk_batch_size
+
+        objs = self.model.objects.bulk_create(
+            [self.model(**row) for row in rows],
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=unique_fields,
+            update_fields=update_fields,
+        )
+
+        self.__set_upserted_pks(objs, unique_fields, batch_size)
+        self.__invalidate()
+
+        return objs
+
+    def __set_upserted_pks(self, objs: List[T], unique_fields: list, batch_size: int):
+        """
+        Set the primary key of the stored rows on the upserted instances.
+        `bulk_create` does not return the primary key of rows updated on conflict when the
+        key has a Python side default, so it is read back by unique fields, one query per batch.
         """
-        Update an existing object in the database based on the provided data and query.
+        attnames = [self.model._meta.get_field(name).attname for name in unique_fields]
+        if self.model._meta.pk.attname in attnames:
+            return
+
+        for index in range(0, len(objs), batch_size):
+            batch = objs[index : index + batch_size]
+
+            if len(attnames) == 1:
+                query = {f"{attnames[0]}__in": [getattr(obj, attnames[0]) for obj in batch]}
+            else:
+                query = {
+                    "OR": [{name: getattr(obj, name) for name in attnames} for obj in batch]
+                }
+
+            pks = {
+                tuple(row[:-1]): row[-1]
+                for row in self.model.objects.filter(
+                    self.query_builder.build_query(query)
+                ).values_list(*attnames, "pk")
+            }
+
+            for obj in batch:
+                obj.pk = pks.get(tuple(getattr(obj, name) for name in attnames), obj.pk)
+
+    def update(
+        self,
+        data: dict,
+        query: dict,
+        instance: T = None,
+        expected_updated_dtm=None,
+    ) -> T | None:
+        """
+        Update the object matching the query with a single `UPDATE ... SET ... WHERE ... RETURNING`
+        statement, setting only the given fields and the `auto_now` ones (e.g. `updated_dtm`).
         Args:
             data (dict): Dictionary containing the fields and values to update.
-            query (dict): Query parameters to find the object to update.
+            query (dict): Query parameters to find the object to update, should match a single row.
+            instance (Model, optional): The object as already read by the caller. Only the fields
+                differing from it are written, and it is returned as is when nothing changed.
+            expected_updated_dtm (datetime, optional): Optimistic concurrency check, the row is
+                only updated if its `updated_dtm` still has this value.
         Returns:
-            object: Updated object if successful, None if object not found.
+            object: Updated object if successful, None if object not found
+                (or modified since `expected_updated_dtm`).
         Example:
             >>> manager.update({'name': 'new_name'}, {'id': 1})
             <Updated object with id=1>
         """
+        data = dict(data or dict())
+        if instance is not None:
+            data = self.__get_changed_data(instance, data)
+            if not data:
+                return instance
 
-        obj = self.get(query)
-        if not obj:
+        objects = self.__parse_query(query=query)
+        if expected_updated_dtm is not None:
+            objects = objects.filter(updated_dtm=expected_updated_dtm)
+
+        now = timezone.now()
+        values = {
+            **{
+                field.name: now
+                for field in self.model._meta.concrete_fields
+                if getattr(field, "auto_now", False)
+            },
+            **data,
+        }
+
+        if not self.__can_update_returning(objects.db):
+            obj = instance or objects.first()
+            if not obj or not objects.filter(pk=obj.pk).update(**values):
+                obj = None
+            else:
+                obj = self.__set_values(obj, values)
+        else:
+            obj = self.__update_returning(objects, values)
+
+        if obj is not None:
+            self.__invalidate()
+        elif expected_updated_dtm is not None:
+            # The row changed since it was read, the object kept in the identity map is stale
+            # and the caller re-reading it must get the current row.
+            self.__discard()
+
+        return obj
+
+    def __get_changed_data(self, instance: T, data: dict) -> dict:
+        """
+        Return the items of `data` differing from the values of the instance.
+        """
+        changed = dict()
+
+        for key, value in data.items():
+            field = self.model._meta.get_field(key)
+            if field.is_relation and isinstance(value, Model):
+                value = value.pk
+
+            try:
+                value = field.to_python(value)
+            except DjangoValidationError:
+                changed[key] = data[key]
+                continue
+
+            if value != getattr(instance, field.attname):
+                changed[key] = data[key]
+
+        return changed
+
+    @staticmethod
+    def __can_update_returning(using: str) -> bool:
+        """
+        Whether the database supports `UPDATE ... RETURNING` (PostgreSQL and SQLite 3.35+).
+        """
+        connection = connections[using]
+        return (
+            connection.vendor in ("postgresql", "sqlite")
+            and connection.features.can_return_columns_from_insert
+        )
+
+    def __update_returning(self, objects: QuerySet[T], values: dict) -> T | None:
+        """
+        Compile the update of the queryset like `QuerySet.update` does, append a `RETURNING` clause
+        with every concrete column and build the updated object from the returned row.
+        """
+        connection = connections[objects.db]
+        fields = self.model._meta.concrete_fields
+
+        query = objects.query.chain(UpdateQuery)
+        query.add_update_values(values)
+        query.annotations = {}
+
+        try:
+            sql, params = query.get_compiler(objects.db).as_sql()
+        except EmptyResultSet:
             return None
 
-        return self.__update(obj, data)
+        returning = ", ".join(connection.ops.quote_name(field.column) for field in fields)
+
+        with transaction.mark_for_rollback_on_error(using=objects.db):
+            with connection.cursor() as cursor:
+                cursor.execute(f"{sql} RETURNING {returning}", params)
+                rows = cursor.fetchall()
+
+        if not rows:
+            return None
 
-    def __update(self, obj, data: dict):
+        row = []
+        for field, value in zip(fields, rows[0]):
+            col = field.get_col(self.model._meta.db_table)
+            converters = connection.ops.get_db_converters(col) + col.get_db_converters(
+                connection
+            )
+            for converter in converters:
+                value = converter(value, col, connection)
+            row.append(value)
+
+        return self.model.from_db(objects.db, [field.attname for field in fields], row)
+
+    @staticmethod
+    def __set_values(obj, data: dict):
         """
-        Updates an object's attributes with the provided data dictionary and saves it.
+        Set the updated values on an object already saved with `QuerySet.update`.
         Args:
             obj: The object to be updated
             data (dict): Dictionary containing attribute names as keys and new values to set
         Returns:
-            obj: The updated and saved object
-        Example:
-            >>> user = User.objects.get(id=1)
-            >>> data = {'name': 'John', 'age': 25}
-            >>> updated_user = __update_obj(user, data)
+            obj: The updated object
         """
-
-        data = data or dict()
         for key, value in data.items():
             setattr(obj, key, value)
-        obj.save()
         return obj
 
     def upsert(self, data, query) -> T:
@@ -400,4 +999,4 @@ class Manager(Generic[T]):
         obj = self.get(query=query)
         if not obj:
             return self.create(data)
-        return self.__update(obj, data)
+        return self.update(data, {"pk": obj.pk}, instance=obj)
@@ -0,0 +1,19 @@
+"""
+Search backends of the `q` query param of the list endpoints.
+"""
+
+from .backends import (
+    SearchBackend,
+    ContainsSearchBackend,
+    TrigramSearchBackend,
+    FTS5SearchBackend,
+    get_search_backend,
+)
+
+__all__ = [
+    "SearchBackend",
+    "ContainsSearchBackend",
+    "TrigramSearchBackend",
+    "FTS5SearchBackend",
+    "get_search_backend",
+]
@@ -0,0 +1,232 @@
+"""
+This module contains the search backends of the list endpoints.
+A backend filters a queryset on the terms of the `q` query param over the `text_search_fields`
+of the view, which may span forward relations (`customer__first_name`), and annotates every
+row with its `search_rank`, higher being more relevant.
+- `ContainsSearchBackend`: portable `icontains` matching, ranked by the number of matches.
+- `TrigramSearchBackend`: PostgreSQL `pg_trgm`, substring and fuzzy word matching served by
+  trigram GIN indexes, ranked by word similarity.
+- `FTS5SearchBackend`: SQLite FTS5 tables, prefix word matching ranked with bm25.
+"""
+
+import operator
+from functools import reduce
+
+from django.db import connection
+from django.db.models import Q, F, Case, When, Value, FloatField, Expression, QuerySet
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Greatest, Upper
+from django.utils.module_loading import import_string
+
+from utils import settings
+
+
+class SearchBackend:
+    __doc__ = """
+    This class is the base of the search backends.
+    Every term of the search must match at least one of the fields.
+    """
+
+    rank_field = "search_rank"
+
+    def get_terms(self, text: str) -> list:
+        """
+        Split the search text into its terms, up to `SEARCH_MAX_TERMS`.
+        """
+        return str(text or "").split()[: settings.read("SEARCH_MAX_TERMS")]
+
+    def search(self, objects: QuerySet, text: str, fields: list) -> QuerySet:
+        """
+        Filter the objects on the search text and annotate them with their rank.
+        Args:
+            objects (QuerySet): The queryset to search.
+            text (str): The search text, e.g. the `q` query param.
+            fields (list): The fields searched, e.g. `["first_name", "customer__company_name"]`.
+        Returns:
+            QuerySet: The matching objects annotated with `rank_field`.
+        """
+        terms = self.get_terms(text)
+
+        if not terms or not fields:
+            return objects
+
+        return self.filter(objects, terms, fields)
+
+    def filter(self, objects: QuerySet, terms: list, fields: list) -> QuerySet:
+        """
+        Filter the objects on the terms and annotate them with their rank.
+        """
+        raise NotImplementedError
+
+
+class ContainsSearchBackend(SearchBackend):
+    __doc__ = """
+    This class searches the fields with `icontains`, it runs on every database but
+    scans the tables. The rank is the number of fields matching a term.
+    """
+
+    def filter(self, objects, terms, fields):
+        query = Q()
+        rank = []
+
+        for term in terms:
+            term_query = reduce(
+                operator.or_, [Q(**{f"{field}__icontains": term}) for field in fields]
+            )
+            query &= term_query
+            rank.extend(
+                Case(
+                    When(Q(**{f"{field}__icontains": term}), then=Value(1.0)),
+                    default=Value(0.0),
+                    output_field=FloatField(),
+                )
+                for field in fields
+            )
+
+        return objects.filter(query).annotate(**{self.rank_field: reduce(operator.add, rank)})
+
+
+class TrigramSearchBackend(SearchBackend):
+    __doc__ = """
+    This class searches the fields with the PostgreSQL `pg_trgm` extension.
+    A term matches a field containing it or a word similar to it, both are served by the
+    `gin (UPPER(field) gin_trgm_ops)` indexes of the search migrations.
+    The rank is the sum over the terms of the best word similarity among the fields.
+    """
+
+    def filter(self, objects, terms, fields):
+        from django.contrib.postgres.search import TrigramWordSimilarity
+
+        aliases = {f"_search_{index}": Upper(field) for index, field in enumerate(fields)}
+        objects = objects.alias(**aliases)
+
+        query = Q()
+        rank = []
+
+        for term in terms:
+            term = term.upper()
+            query &= reduce(
+                operator.or_,
+                [
+                    Q(**{f"{alias}__contains": term})
+                    | Q(**{f"{alias}__trigram_word_similar": term})
+                    for alias in aliases
+                ],
+            )
+
+            similarities = [TrigramWordSimilarity(term, alias) for alias in aliases]
+            rank.append(Greatest(*similarities) if len(similarities) > 1 else similarities[0])
+
+        return objects.filter(query).annotate(**{self.rank_field: reduce(operator.add, rank)})
+
+
+class FTS5Rank(Expression):
+    """
+    bm25 rank of the row of the given key in a FTS5 table, negated so that higher is better.
+    """
+
+    output_field = FloatField()
+
+    def __init__(self, search_table: str, match: str, key):
+        super().__init__()
+        self.search_table = search_table
+        self.match = match
+        self.key = key
+
+    def get_source_expressions(self):
+        return [self.key]
+
+    def set_source_expressions(self, exprs):
+        (self.key,) = exprs
+
+    def as_sql(self, compiler, connection, **_):
+        qn = connection.ops.quote_name
+        key_sql, key_params = compiler.compile(self.key)
+
+        sql = (
+            f"COALESCE((SELECT -bm25({qn(self.search_table)}) FROM {qn(self.search_table)} "
+            f"WHERE {qn(self.search_table)} MATCH %s AND {qn(self.search_table)}.rowid = "
+            f"(SELECT id FROM {qn(self.search_table + '_key')} WHERE pk = {key_sql})), 0)"
+        )
+        return sql, (self.match, *key_params)
+
+
+class FTS5SearchBackend(SearchBackend):
+    __doc__ = """
+    This class searches the fields with the SQLite FTS5 tables of the search migrations.
+    Every model searched has a `<db_table>_search` table indexing its searched columns, keyed
+    by the primary key through `<db_table>_search_key`, the fields of a relation are matched
+    in the table of the related model.
+    A term matches the words of the fields starting with it, the rank is the bm25 score.
+    """
+
+    @staticmethod
+    def get_tables(model, fields: list) -> dict:
+        """
+        Group the fields by the relation they are on.
+        Returns:
+            dict: `{relation_path: (related_model, [column, ...])}`, `""` for the model itself.
+        """
+        tables = {}
+
+        for field in fields:
+            *relations, name = field.split("__")
+
+            related_model = model
+            for relation in relations:
+                related_model = related_model._meta.get_field(relation).related_model
+
+            path = "__".join(relations)
+            tables.setdefault(path, (related_model, []))[1].append(
+                related_model._meta.get_field(name).column
+            )
+
+        return tables
+
+    @staticmethod
+    def get_match(term: str, columns: list) -> str:
+        """
+        Build the FTS5 query of a term: a quoted prefix query restricted to the columns.
+        """
+        return "{%s} : \"%s\"*" % (" ".join(columns), term.replace('"', '""'))
+
+    def filter(self, objects, terms, fields):
+        qn = connection.ops.quote_name
+        query = Q()
+        rank = []
+
+        for term in terms:
+            term_query = Q()
+
+            for path, (model, columns) in self.get_tables(objects.model, fields).items():
+                search_table = f"{model._meta.db_table}_search"
+                key_path = f"{path}__pk" if path else "pk"
+                match = self.get_match(term, columns)
+
+                term_query |= Q(
+                    **{
+                        f"{key_path}__in": RawSQL(
+                            f"SELECT pk FROM {qn(search_table + '_key')} WHERE id IN "
+                            f"(SELECT rowid FROM {qn(search_table)} "
+                            f"WHERE {qn(search_table)} MATCH %s)",
+                            (match,),
+                        )
+                    }
+                )
+                rank.append(FTS5Rank(search_table, match, F(key_path)))
+
+            query &= term_query
+
+        return objects.filter(query).annotate(**{self.rank_field: reduce(operator.add, rank)})
+
+
+def get_search_backend() -> SearchBackend:
+    """
+    Return the search backend of the database in use, set in `SEARCH_BACKENDS`.
+    """
+    backend_class = import_string(
+        settings.read("SEARCH_BACKENDS").get(
+            connection.vendor, "base.search.backends.ContainsSearchBackend"
+        )
+    )
+    return backend_class()
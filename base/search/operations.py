@@ -0,0 +1,205 @@
+"""
+Migration operations creating the indexes of the search backends.
+They only run on the database vendor of their backend, so the same migration
+creates the trigram indexes on PostgreSQL and the FTS5 tables on SQLite.
+The FTS5 rows are keyed by a `<table>_search_key` table mapping a stable integer id to the
+primary key of the row, the rowids of the searched table may change when it is remade by an
+`AlterField` or a VACUUM. The triggers keeping the FTS5 table in sync are dropped with the
+table when Django remakes it, the indexes missing a trigger are rebuilt after every migrate,
+and every index is rebuilt with the `rebuild_search_index` command.
+"""
+
+from django.db import migrations, connections, transaction
+from django.db.models.signals import post_migrate
+from django.dispatch import receiver
+
+from utils.logger import log_msg, logging
+
+
+class VendorRunSQL(migrations.RunSQL):
+    """
+    RunSQL operation which is a no-op on the databases of other vendors.
+    """
+
+    def __init__(self, vendor: str, sql, reverse_sql=None, **kwargs):
+        self.vendor = vendor
+        super().__init__(sql, reverse_sql, **kwargs)
+
+    def deconstruct(self):
+        name, args, kwargs = super().deconstruct()
+        return name, [self.vendor, *args], kwargs
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == self.vendor:
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == self.vendor:
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+def create_trigram_extension() -> VendorRunSQL:
+    """
+    Enable the `pg_trgm` extension, required by the trigram indexes.
+    """
+    return VendorRunSQL(
+        "postgresql", "CREATE EXTENSION IF NOT EXISTS pg_trgm", migrations.RunSQL.noop
+    )
+
+
+def get_search_index_sql(table: str, key: str, columns: list) -> list:
+    """
+    Return the SQLite statements creating the FTS5 table of the columns of a table, its key
+    table and its triggers, and indexing the existing rows.
+    Args:
+        table (str): The table searched.
+        key (str): The primary key column of the table.
+        columns (list): The columns searched.
+    """
+    search_table = f"{table}_search"
+    key_table = f"{table}_search_key"
+    fts_columns = ", ".join(columns)
+    new_values = ", ".join(f"new.{column}" for column in columns)
+
+    def get_id(row: str) -> str:
+        return f"(SELECT id FROM {key_table} WHERE pk = {row}.{key})"
+
+    insert_row = (
+        f"INSERT INTO {search_table}(rowid, {fts_columns}) "
+        f"VALUES ({get_id('new')}, {new_values});"
+    )
+
+    return [
+        f"CREATE TABLE {key_table} (id INTEGER PRIMARY KEY, pk NOT NULL UNIQUE)",
+        f"CREATE VIRTUAL TABLE {search_table} USING fts5({fts_columns})",
+        f"CREATE TRIGGER {search_table}_insert AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {key_table}(pk) VALUES (new.{key}); {insert_row} END",
+        f"CREATE TRIGGER {search_table}_delete AFTER DELETE ON {table} BEGIN "
+        f"DELETE FROM {search_table} WHERE rowid = {get_id('old')}; "
+        f"DELETE FROM {key_table} WHERE pk = old.{key}; END",
+        f"CREATE TRIGGER {search_table}_update AFTER UPDATE OF {key}, {fts_columns} ON {table} "
+        f"BEGIN UPDATE {key_table} SET pk = new.{key} WHERE pk = old.{key}; "
+        f"DELETE FROM {search_table} WHERE rowid = {get_id('new')}; {insert_row} END",
+        f"INSERT INTO {key_table}(pk) SELECT {key} FROM {table}",
+        f"INSERT INTO {search_table}(rowid, {fts_columns}) "
+        f"SELECT search_key.id, {', '.join(f'searched.{column}' for column in columns)} "
+        f"FROM {table} searched JOIN {key_table} search_key ON search_key.pk = searched.{key}",
+    ]
+
+
+def get_drop_search_index_sql(table: str) -> list:
+    """
+    Return the SQLite statements dropping the FTS5 table of a table, its key table and its
+    triggers.
+    """
+    search_table = f"{table}_search"
+
+    return [
+        f"DROP TRIGGER IF EXISTS {search_table}_insert",
+        f"DROP TRIGGER IF EXISTS {search_table}_delete",
+        f"DROP TRIGGER IF EXISTS {search_table}_update",
+        f"DROP TABLE IF EXISTS {search_table}",
+        f"DROP TABLE IF EXISTS {table}_search_key",
+    ]
+
+
+def create_search_index(table: str, key: str, columns: list) -> list:
+    """
+    Create the search indexes of the columns of a table:
+    - PostgreSQL: a `gin (UPPER(column) gin_trgm_ops)` index per column.
+    - SQLite: a `<table>_search` FTS5 table over the columns, keyed by the primary key and
+      kept in sync with triggers.
+    Args:
+        table (str): The table searched.
+        key (str): The primary key column of the table.
+        columns (list): The columns searched.
+    Returns:
+        list: The migration operations.
+    """
+    return [
+        VendorRunSQL(
+            "postgresql",
+            [
+                f"CREATE INDEX {table}_{column}_trgm_idx ON {table} "
+                f"USING gin (UPPER({column}) gin_trgm_ops)"
+                for column in columns
+            ],
+            [f"DROP INDEX IF EXISTS {table}_{column}_trgm_idx" for column in columns],
+        ),
+        VendorRunSQL(
+            "sqlite",
+            get_search_index_sql(table, key, columns),
+            get_drop_search_index_sql(table),
+        ),
+    ]
+
+
+def get_search_index_triggers(table: str) -> list:
+    """
+    Return the names of the triggers keeping the FTS5 table of a table in sync.
+    """
+    return [f"{table}_search_{action}" for action in ("insert", "delete", "update")]
+
+
+def rebuild_search_indexes(models, using: str = "default", stale_only: bool = False) -> list:
+    """
+    Recreate the SQLite FTS5 tables of the models, their key tables and their triggers, and
+    index every row again.
+    Args:
+        models (Iterable): The models whose search indexes are rebuilt, the others are skipped.
+        using (str, optional): The database alias. Defaults to "default".
+        stale_only (bool, optional): Only rebuild the indexes missing a trigger.
+    Returns:
+        list: The tables whose search index was rebuilt.
+    """
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        return []
+
+    tables = set(connection.introspection.table_names())
+    models = [model for model in models if f"{model._meta.db_table}_search" in tables]
+    rebuilt = []
+
+    if not models:
+        return rebuilt
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+        triggers = {row[0] for row in cursor.fetchall()}
+
+        for model in models:
+            table = model._meta.db_table
+
+            if stale_only and set(get_search_index_triggers(table)) <= triggers:
+                continue
+
+            columns = [
+                column.name
+                for column in connection.introspection.get_table_description(
+                    cursor, f"{table}_search"
+                )
+            ]
+
+            with transaction.atomic(using=using):
+                for sql in [
+                    *get_drop_search_index_sql(table),
+                    *get_search_index_sql(table, model._meta.pk.column, columns),
+                ]:
+                    cursor.execute(sql)
+
+            rebuilt.append(table)
+            log_msg(logging.INFO, f"Rebuilt the search index of {table} on {columns}.")
+
+    return rebuilt
+
+
+@receiver(post_migrate)
+def rebuild_stale_search_indexes(using="default", **__):
+    """
+    Rebuild the search indexes whose triggers were dropped, e.g. by a migration remaking the
+    table on SQLite. It is sent for every app with a `models` module, which the apps keeping
+    their models in `db_models` have not, so every model is checked.
+    """
+    from django.apps import apps
+
+    rebuild_search_indexes(apps.get_models(), using=using, stale_only=True)
@@ -0,0 +1,3 @@
+from .spec import Field, Nested, Serialization
+
+__all__ = ["Field", "Nested", "Serialization"]
@@ -0,0 +1,291 @@
+"""
+Declarative serialization of the models.
+A `Serialization` lists the keys of the dictionary representation of a model and the columns
+they are read from. It is compiled once, when it is declared, into two generated functions:
+- `to_dict(obj)` reads the attributes of an instance, it is the `to_dict` method of the model,
+- `from_row(row)` reads a `values_list(*columns)` tuple, so that the lists fetch only the
+  serialized columns and build no model instance.
+The sources are validated against the model once it is prepared (`class_prepared`).
+A subset of the keys is compiled with `select`, e.g. for the `fields` query param, so that only
+the columns of the selected keys are fetched. A third generated function, `to_columns(rows)`,
+transposes the rows into a list of values by key, without building a dictionary per row.
+"""
+
+from django.db.models.signals import class_prepared
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+
+
+class Field:
+    __doc__ = """
+    This class is a key of the dictionary and the columns it is read from.
+    Args:
+        key (str): The key in the dictionary.
+        *sources (str): The columns of the value, e.g. `customer_id` or `customer__first_name`
+            for a column of a forward relation. Defaults to the key.
+        transform (callable, optional): Called with the values of the sources, required with
+            several sources.
+    Example:
+        Field("total", transform=float)
+        Field("full_name", "first_name", "last_name", transform=get_full_name)
+    """
+
+    def __init__(self, key: str, *sources: str, transform=None):
+        self.key = key
+        self.sources = sources or (key,)
+        self.transform = transform
+
+        if len(self.sources) > 1 and transform is None:
+            raise ImproperlyConfigured(f"The field {key} has several sources and no transform.")
+
+        for source in self.sources:
+            if not all(name.isidentifier() for name in source.split("__")):
+                raise ImproperlyConfigured(f"The source {source!r} of {key} is not a column.")
+
+
+class Nested:
+    __doc__ = """
+    This class is the dictionary of a forward relation, serialized with the serialization of
+    the related model. The relation must not be nullable.
+    Args:
+        key (str): The key in the dictionary.
+        serialization (Serialization): The serialization of the related model.
+        relation (str, optional): The forward relation. Defaults to the key.
+    Example:
+        Nested("customer", Customer.serialization)
+    """
+
+    def __init__(self, key: str, serialization: "Serialization", relation: str = None):
+        self.key = key
+        self.serialization = serialization
+        self.relation = relation or key
+
+        if not self.relation.isidentifier():
+            raise ImproperlyConfigured(f"The relation {self.relation!r} of {key} is invalid.")
+
+
+class Serialization:
+    __doc__ = """
+    This class is the serialization of a model, declared on the model, or on a view listing
+    the rows with another shape. On a model its `to_dict` is the `to_dict` method of the model,
+    unless the model defines one.
+    Args:
+        *fields (str | Field | Nested): The keys of the dictionary, in order. A string is a key
+            read from the column of the same name.
+    Example:
+        class Vehicle(BaseModel, models.Model):
+            ...
+            serialization = Serialization("vehicle_id", "vehicle_name", ...)
+
+        Vehicle.serialization.columns  # the columns of `values_list`
+        Vehicle.serialization.from_row(row)
+    """
+
+    # The number of selections compiled and kept by `select`.
+    max_selections = 128
+
+    def __init__(self, *fields):
+        self.fields = tuple(Field(field) if isinstance(field, str) else field for field in fields)
+        self.model = None
+        self.selections = {}
+
+        keys = [field.key for field in self.fields]
+        duplicates = {key for key in keys if keys.count(key) > 1}
+        if duplicates:
+            raise ImproperlyConfigured(f"The keys {sorted(duplicates)} are serialized twice.")
+
+        self.columns = tuple(dict.fromkeys(self.get_sources()))
+        self.column_keys = tuple(key for key, _ in self.get_column_code(lambda _: "", {}))
+        self.to_dict, self.from_row, self.to_columns = self.compile()
+
+    def get_sources(self, prefix: str = ""):
+        """
+        Yield the columns of the fields, the columns of the nested relations prefixed.
+        """
+        for field in self.fields:
+            if isinstance(field, Nested):
+                yield from field.serialization.get_sources(f"{prefix}{field.relation}__")
+            else:
+                yield from (f"{prefix}{source}" for source in field.sources)
+
+    def get_code(self, read, namespace: dict, prefix: str = "") -> str:
+        """
+        Return the expression building the dictionary.
+        Args:
+            read (callable): Returns the expression reading a column.
+            namespace (dict): The globals of the generated functions, the transforms are added.
+        """
+        items = []
+
+        for field in self.fields:
+            if isinstance(field, Nested):
+                value = field.serialization.get_code(
+                    read, namespace, prefix=f"{prefix}{field.relation}__"
+                )
+            else:
+                value = ", ".join(read(f"{prefix}{source}") for source in field.sources)
+                if field.transform is not None:
+                    name = f"transform_{len(namespace)}"
+                    namespace[name] = field.transform
+                    value = f"{name}({value})"
+
+            items.append(f"{field.key!r}: {value}")
+
+        return "{" + ", ".join(items) + "}"
+
+    def get_column_code(self, read, namespace: dict, prefix: str = "", key_prefix: str = ""):
+        """
+        Return the keys, the keys of the nested serializations joined with a dot, and the
+        expressions building their list of values.
+        Args:
+            read (callable): Returns the expression reading the values of a column.
+            namespace (dict): The globals of the generated functions, the transforms are added.
+        """
+        items = []
+
+        for field in self.fields:
+            if isinstance(field, Nested):
+                items.extend(
+                    field.serialization.get_column_code(
+                        read,
+                        namespace,
+                        prefix=f"{prefix}{field.relation}__",
+                        key_prefix=f"{key_prefix}{field.key}.",
+                    )
+                )
+                continue
+
+            values = ", ".join(read(f"{prefix}{source}") for source in field.sources)
+            if field.transform is None:
+                value = f"list({values})"
+            else:
+                name = f"transform_{len(namespace)}"
+                namespace[name] = field.transform
+                value = f"list(map({name}, {values}))"
+
+            items.append((f"{key_prefix}{field.key}", value))
+
+        return items
+
+    def compile(self) -> tuple:
+        """
+        Generate the `to_dict(obj)`, `from_row(row)` and `to_columns(rows)` functions.
+        """
+        index = {column: position for position, column in enumerate(self.columns)}
+        namespace = {}
+
+        obj_code = self.get_code(lambda source: f"obj.{source.replace('__', '.')}", namespace)
+        row_code = self.get_code(lambda source: f"row[{index[source]}]", namespace)
+        columns_code = ", ".join(
+            f"{key!r}: {value}"
+            for key, value in self.get_column_code(
+                lambda source: f"columns[{index[source]}]", namespace
+            )
+        )
+
+        exec(
+            f"def to_dict(obj):\n    return {obj_code}\n\n"
+            f"def from_row(row):\n    return {row_code}\n\n"
+            f"def to_columns(rows):\n"
+            f"    columns = list(zip(*rows)) or [()] * {len(self.columns)}\n"
+            f"    return {{{columns_code}}}\n",
+            namespace,
+        )
+
+        return namespace["to_dict"], namespace["from_row"], namespace["to_columns"]
+
+    def replace(self, *fields) -> "Serialization":
+        """
+        Return a serialization with the given fields in place of the fields of the same key,
+        e.g. to nest a relation serialized as its id.
+        """
+        replaced = {field.key: field for field in fields}
+        missing = set(replaced) - {field.key for field in self.fields}
+        if missing:
+            raise ImproperlyConfigured(f"The keys {sorted(missing)} are not serialized.")
+
+        return Serialization(*(replaced.get(field.key, field) for field in self.fields))
+
+    def get_keys(self, prefix: str = ""):
+        """
+        Yield the keys which can be selected, the keys of the nested serializations joined
+        with a dot, e.g. `customer` and `customer.full_name`.
+        """
+        for field in self.fields:
+            yield f"{prefix}{field.key}"
+
+            if isinstance(field, Nested):
+                yield from field.serialization.get_keys(f"{prefix}{field.key}.")
+
+    def select(self, keys) -> "Serialization":
+        """
+        Return the serialization of the given keys only, in the order of the fields.
+        A key of a nested serialization is selected as `customer.full_name`, the nested key
+        alone selects all its keys. The compiled selections are kept.
+        Raises:
+            ImproperlyConfigured: If a key is not serialized.
+        """
+        keys = frozenset(keys)
+
+        selection = self.selections.get(keys)
+        if selection is not None:
+            return selection
+
+        unknown = keys - set(self.get_keys())
+        if unknown:
+            raise ImproperlyConfigured(f"The keys {sorted(unknown)} are not serialized.")
+
+        fields = []
+        for field in self.fields:
+            if field.key in keys:
+                fields.append(field)
+                continue
+
+            nested_keys = {
+                key.split(".", 1)[1] for key in keys if key.startswith(f"{field.key}.")
+            }
+            if nested_keys:
+                fields.append(
+                    Nested(field.key, field.serialization.select(nested_keys), field.relation)
+                )
+
+        selection = Serialization(*fields)
+
+        if len(self.selections) >= self.max_selections:
+            self.selections.clear()
+        self.selections[keys] = selection
+
+        return selection
+
+    def from_rows(self, rows) -> list:
+        from_row = self.from_row
+        return [from_row(row) for row in rows]
+
+    def to_columnar(self, rows) -> dict:
+        """
+        Return the rows in the columnar format, `{"columns": [...], "data": {key: [...]}}`.
+        """
+        return {"columns": list(self.column_keys), "data": self.to_columns(rows)}
+
+    def contribute_to_class(self, cls, name):
+        """
+        Called by Django for a serialization declared on a model.
+        """
+        self.model = cls
+        setattr(cls, name, self)
+
+        if "to_dict" not in cls.__dict__:
+            cls.to_dict = self.to_dict
+
+        class_prepared.connect(self.check, sender=cls, weak=False)
+
+    def check(self, sender, **__):
+        """
+        Check that the local columns of the sources are fields of the model.
+        """
+        for column in self.columns:
+            try:
+                sender._meta.get_field(column.split("__")[0])
+            except FieldDoesNotExist as exc:
+                raise ImproperlyConfigured(
+                    f"{sender.__name__}.serialization: {column} is not a field."
+                ) from exc
@@ -5,6 +5,31 @@ from ..constants import DEFAULT_PAGE_SIZE, DEFAULT_PAGE_NUMBER
 class QuerySerializer(serializers.Serializer):
     page = serializers.IntegerField(default=DEFAULT_PAGE_NUMBER, min_value=1)
     page_size = serializers.IntegerField(default=DEFAULT_PAGE_SIZE, min_value=1)
+    cursor = serializers.CharField(
+        required=False,
+        allow_blank=True,
+        help_text="Opt-in keyset pagination. Pass an empty value for the first page "
+        "and the `next_cursor` of the previous response for the following pages.",
+    )
+    q = serializers.CharField(
+        required=False,
+        allow_blank=True,
+        help_text="Search text, the results are ordered by relevance unless `ordering` is given.",
+    )
+    fields = serializers.CharField(
+        required=False,
+        help_text="Comma separated keys to return, e.g. `invoice_id,date,customer.full_name`. "
+        "Only their columns are fetched.",
+    )
+    include = serializers.CharField(
+        required=False,
+        help_text="Comma separated relations, e.g. `customer,vehicle`, listed as their id and "
+        "returned once each in the `included` section of the response.",
+    )
+    ordering = serializers.CharField(
+        required=False,
+        help_text="Comma separated fields to order by, prefix a field with `-` for descending order.",
+    )
 
     def to_internal_value(self, data):
         """
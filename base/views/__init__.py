@@ -3,6 +3,7 @@ from .delete import DeleteView
 from .list import ListView
 from .update import UpdateView
 from .retrieve import RetrieveView
+from .export import ExportView
 from .base import BaseView
 
 __all__ = [
@@ -11,5 +12,6 @@ __all__ = [
     "ListView",
     "UpdateView",
     "RetrieveView",
+    "ExportView",
     "BaseView"
 ]
\ No newline at end of file
@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from rest_framework import status, serializers
 
 from base import constants
@@ -126,6 +126,7 @@ class CreateView:
 
         data = self.pre_save(data=data, request=request)
 
-        obj = self.manager.create(data, many=self.many)
+        with transaction.atomic():
+            obj = self.manager.create(data, many=self.many)
 
         return self.post_save(obj=obj, data=data, request=request)
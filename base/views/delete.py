@@ -1,3 +1,4 @@
+from django.db import transaction
 from rest_framework import status
 
 from base import constants
@@ -57,11 +58,12 @@ class DeleteView:
         if not obj:
             raise NoDataFoundError()
 
-        self.pre_delete(request=request, **kwargs)
+        with transaction.atomic():
+            self.pre_delete(request=request, **kwargs)
 
-        self.manager.delete(query=query)
+            self.manager.delete(query=query)
 
-        self.post_delete(request=request, **kwargs)
+            self.post_delete(request=request, **kwargs)
 
         return generate_response(
             data=None,
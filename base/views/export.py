@@ -0,0 +1,192 @@
+"""
+This module contains the ExportView class, which streams every object matching the
+query params of the list endpoint, including the `q` search, as NDJSON or CSV.
+The objects are read from a server-side cursor and serialized one chunk at a time,
+so the memory used does not depend on the number of rows exported.
+"""
+
+import io
+import csv
+import json
+import zlib
+
+from django.http import StreamingHttpResponse
+from django.core.serializers.json import DjangoJSONEncoder
+
+from base import constants
+from base.views.list import ListView
+from utils.messages import error
+from utils.functions import flatten_dict
+from utils.logger import log_msg, logging
+from utils.exceptions import BadRequestError, codes
+from utils.exceptions.exceptions import ValidationError
+
+
+class ExportView(ListView):
+    """
+    A base view class for exporting the objects of the list endpoint.
+    It reuses the query serializer, the filters, the ordering and the `get_list` serialization of the list.
+    Attributes:
+        export_name (str): Name of the exported file, without extension.
+        export_chunk_size (int): Number of rows fetched and serialized at a time.
+        export_formats (dict): The supported `export_format` query param values and their content type.
+    """
+
+    export_name: str = "export"
+    export_chunk_size: int = 2000
+    export_formats: dict = {
+        "ndjson": "application/x-ndjson",
+        "csv": "text/csv",
+    }
+
+    @classmethod
+    def get_method_view_mapping(cls):
+        return {constants.GET: "export"}
+
+    def export(self, request, **_):
+        """
+        Stream the objects matching the query params of the request.
+        The body is gzip compressed when the client accepts it.
+        Args:
+            request (Request): The HTTP request object containing the query params.
+        Returns:
+            StreamingHttpResponse: The exported objects.
+        """
+        query = request.query_params.dict()
+
+        export_format = query.pop("export_format", "ndjson")
+        if export_format not in self.export_formats:
+            raise BadRequestError(error.INVALID_EXPORT_FORMAT, codes.INVALID)
+
+        serializer = self.list_serializer_class(data=query, partial=True)
+        if not serializer.is_valid():
+            raise ValidationError(serializer.errors)
+
+        query_params = serializer.validated_data
+
+        query_objects = self.get_search_and_filter_query(
+            query_params=query_params,
+            query_objects=self.get_list_query_object(request=request, query=query_params),
+        )
+
+        objects = self.get_export_objects(
+            query_objects=query_objects,
+            order_by=self.get_ordering(query_params=query_params),
+            query_params=query_params,
+            request=request,
+        )
+
+        render = self.render_csv if export_format == "csv" else self.render_ndjson
+        content = render(self.get_export_chunks(objects, request=request))
+
+        is_gzip = "gzip" in request.headers.get("Accept-Encoding", "")
+        if is_gzip:
+            content = self.compress(content)
+
+        response = StreamingHttpResponse(
+            content, content_type=self.export_formats[export_format]
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="{self.export_name}.{export_format}"'
+        )
+        response["Vary"] = "Accept-Encoding"
+        if is_gzip:
+            response["Content-Encoding"] = "gzip"
+
+        return response
+
+    def get_export_objects(self, query_objects, order_by, query_params, request=None):
+        """
+        Stream the objects to export, searched on the `q` query param like the list.
+        """
+        values = self.get_list_values(request=request)
+
+        if self.text_search_fields and query_params.get("q"):
+            objects = self.manager.list(
+                query=query_objects,
+                order_by=order_by or self.manager.cursor_ordering,
+                select_related=self.list_select_related,
+                prefetch_related=self.list_prefetch_related,
+            )
+            objects = self.search_objects(objects, query_params=query_params, order_by=order_by)
+            if values is not None:
+                objects = objects.values_list(*values)
+
+            return objects.iterator(chunk_size=self.export_chunk_size)
+
+        return self.manager.iterate(
+            query=query_objects,
+            chunk_size=self.export_chunk_size,
+            order_by=order_by,
+            select_related=self.list_select_related,
+            prefetch_related=self.list_prefetch_related,
+            values=values,
+        )
+
+    def get_export_chunks(self, objects, request=None):
+        """
+        Serialize the objects with `get_list`, one chunk at a time.
+        """
+        chunk = []
+
+        try:
+            for obj in objects:
+                chunk.append(obj)
+
+                if len(chunk) >= self.export_chunk_size:
+                    yield self.get_list(objects=chunk, request=request)
+                    chunk = []
+
+            if chunk:
+                yield self.get_list(objects=chunk, request=request)
+        except Exception:
+            # The status code is sent already, the client gets a truncated file.
+            log_msg(logging.ERROR, f"Failed to export the {self.export_name}.")
+            raise
+
+    @staticmethod
+    def flatten(data: dict, prefix: str = "") -> dict:
+        """
+        Flatten the nested dictionaries of a row, `{"customer": {"email": ...}}`
+        becomes `{"customer.email": ...}`.
+        """
+        return flatten_dict(data, prefix=prefix)
+
+    def render_ndjson(self, chunks):
+        for rows in chunks:
+            yield "".join(json.dumps(row, cls=DjangoJSONEncoder) + "\n" for row in rows)
+
+    def render_csv(self, chunks):
+        """
+        Render the rows as CSV, the header is taken from the first row.
+        """
+        header = None
+
+        for rows in chunks:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+
+            for row in rows:
+                row = self.flatten(row)
+
+                if header is None:
+                    header = list(row)
+                    writer.writerow(header)
+
+                writer.writerow([row.get(column) for column in header])
+
+            yield buffer.getvalue()
+
+    @staticmethod
+    def compress(content):
+        """
+        Gzip the streamed content chunk by chunk.
+        """
+        compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+
+        for part in content:
+            data = compressor.compress(part.encode())
+            if data:
+                yield data
+
+        yield compressor.flush()
@@ -0,0 +1,45 @@
+"""
+Sparse fieldsets of the list and retrieve views.
+The `fields` query param, e.g. `?fields=invoice_id,date,customer.full_name`, selects the keys of
+the serialization of the view. Only the columns of the selected keys are fetched.
+"""
+
+from base.serialization import Serialization
+from utils.messages import error
+from utils.exceptions import BadRequestError, codes
+
+FIELDS_PARAM = "fields"
+
+
+def select_fields(
+    serialization: Serialization | None, request, selectable_fields: list = None
+) -> Serialization | None:
+    """
+    Return the serialization of the keys of the `fields` query param of the request, or the
+    serialization itself without the query param.
+    Args:
+        serialization (Serialization): The serialization of the view.
+        request (Request): The HTTP request object containing the query params.
+        selectable_fields (list, optional): The keys allowed in the query param, among the keys
+            of the serialization. Defaults to every key of the serialization.
+    Raises:
+        BadRequestError: If a key is not allowed, or the view has no serialization.
+    """
+    value = str(request.query_params.get(FIELDS_PARAM, "") if request else "").strip()
+
+    if not value:
+        return serialization
+
+    keys = [key.strip() for key in value.split(",") if key.strip()]
+
+    if serialization is None or not keys:
+        raise BadRequestError(error.INVALID_FIELDS, codes.INVALID)
+
+    allowed = set(serialization.get_keys())
+    if selectable_fields is not None:
+        allowed.intersection_update(selectable_fields)
+
+    if not allowed.issuperset(keys):
+        raise BadRequestError(error.INVALID_FIELDS, codes.INVALID)
+
+    return serialization.select(keys)
@@ -4,11 +4,16 @@ for retrieving objects based on query parameters. It raises a 404 error if the o
 """
 
 from base import constants
+from base.search import get_search_backend
 from base.db_access import Manager
 from base.serializers import QuerySerializer
+from base.serialization import Nested, Serialization
+from base.views.fields import select_fields
 
-from utils.response import generate_response
-from utils.exceptions import NoDataFoundError
+from utils.timing import timed
+from utils.messages import error
+from utils.response import generate_response, ColumnarJSONRenderer
+from utils.exceptions import NoDataFoundError, BadRequestError, codes
 from utils.exceptions.exceptions import ValidationError
 
 
@@ -17,25 +22,144 @@ class ListView:
     A base view class for retrieving objects with query params.
     Attributes:
         manager (object): The manager instance responsible for handling database queries.
+        list_select_related (list): Forward relations loaded with a JOIN for the listed objects.
+        list_prefetch_related (list): Relations prefetched with one query each for the listed objects.
+        ordering_fields (list): Fields allowed in the `ordering` query param.
+        text_search_fields (list): Fields searched by the search backend with the `q` query param.
+        list_serialization (Serialization): Serialization of the listed rows, defaults to the
+            serialization of the model. The rows are fetched as `values_list` tuples of its columns.
+        selectable_fields (list): Keys allowed in the `fields` query param, a key of a nested
+            relation as `customer.full_name`. Defaults to every key of the list serialization.
+        list_includes (list): Relations which can be requested with the `include` query param, as
+            the `Nested` serialization of the relation. The rows are then serialized with the
+            serialization of the model, the relations as their id, and each related object is
+            serialized once in the `included` section of the response, by id.
     """
 
     filter_fields = []
     manager: Manager = None
     is_pagination: bool = True
     list_serializer_class = QuerySerializer
+    list_select_related: list = []
+    list_prefetch_related: list = []
+    ordering_fields: list = []
+    list_serialization: Serialization = None
+    selectable_fields: list = None
+    list_includes: list = []
 
     search_fields = []
     filter_fields = []
+    text_search_fields: list = []
 
     @classmethod
     def get_method_view_mapping(cls):
         return {constants.GET: "list_all"}
 
-    def get_list(self, objects, **_):
+    def get_includes(self, request=None, **_) -> list:
         """
-        Convert a list of objects to a dictionary format.
+        Return the relations of the `include` query param, e.g. `?include=customer,vehicle`.
+        Raises:
+            BadRequestError: If a relation is not in `list_includes`.
         """
-        return [obj.to_dict() for obj in objects]
+        value = str(request.query_params.get("include", "") if request else "").strip()
+
+        if not value:
+            return []
+
+        includes = {nested.key: nested for nested in self.list_includes}
+        keys = list(dict.fromkeys(key.strip() for key in value.split(",") if key.strip()))
+
+        if not keys or not includes.keys() >= set(keys):
+            raise BadRequestError(error.INVALID_INCLUDE, codes.INVALID)
+
+        return [includes[key] for key in keys]
+
+    def get_include_columns(self, nested: Nested) -> list:
+        """
+        Return the columns of an included relation, its id first.
+        """
+        attname = self.manager.model._meta.get_field(nested.relation).attname
+        return [
+            attname,
+            *(f"{nested.relation}__{column}" for column in nested.serialization.columns),
+        ]
+
+    def get_serialization(self, request=None, **_) -> Serialization | None:
+        """
+        Return the serialization of the listed rows, None to list the model instances.
+        Only the keys of the `fields` query param are serialized when it is given.
+        """
+        serialization = getattr(self.manager.model, "serialization", None)
+        if not self.get_includes(request=request):
+            serialization = self.list_serialization or serialization
+
+        return select_fields(serialization, request, self.selectable_fields)
+
+    def get_list_values(self, request=None, **kwargs) -> list | None:
+        """
+        Return the columns fetched for the listed rows, None to fetch the model instances.
+        The columns of the included relations follow the columns of the serialization.
+        """
+        serialization = self.get_serialization(request=request, **kwargs)
+        if not serialization:
+            return None
+
+        values = list(serialization.columns)
+        for nested in self.get_includes(request=request):
+            values.extend(self.get_include_columns(nested))
+
+        return values
+
+    @staticmethod
+    def is_columnar(request) -> bool:
+        """
+        Whether the response is rendered in the columnar format, see `ColumnarJSONRenderer`.
+        """
+        renderer = getattr(request, "accepted_renderer", None)
+        return isinstance(renderer, ColumnarJSONRenderer)
+
+    def get_list(self, objects, columnar: bool = False, **kwargs):
+        """
+        Convert a list of rows, or of objects without serialization, to a dictionary format.
+        With `columnar`, the rows are transposed to the columnar format without building a
+        dictionary per row.
+        """
+        serialization = self.get_serialization(**kwargs)
+        if serialization is None:
+            return [obj.to_dict() for obj in objects]
+
+        if columnar:
+            return serialization.to_columnar(objects)
+
+        return serialization.from_rows(objects)
+
+    def get_included(self, objects, request=None, **kwargs) -> dict | None:
+        """
+        Serialize the related objects of the included relations once each, by id, from the
+        columns following the columns of the serialization in the rows.
+        Returns:
+            dict: The related objects by relation and id, None without the `include` query param.
+        """
+        includes = self.get_includes(request=request)
+        if not includes:
+            return None
+
+        included = {}
+        start = len(self.get_serialization(request=request, **kwargs).columns)
+
+        for nested in includes:
+            end = start + len(self.get_include_columns(nested))
+            from_row = nested.serialization.from_row
+            related = included[nested.key] = {}
+
+            for row in objects:
+                pk = row[start]
+                if pk not in related:
+                    related[pk] = from_row(row[start + 1:end])
+
+            start = end
+
+        return included
 
     def search_query(self, query_params: dict, **kwargs):
         """
@@ -70,6 +194,47 @@ class ListView:
 
         return filter_query
 
+    def search_objects(self, objects, query_params: dict, order_by: list = None, **kwargs):
+        """
+        Search the objects on the `q` query param with the search backend of the database.
+        Without an `ordering` query param the results are ordered by relevance, except in
+        cursor mode which seeks on the ordering values.
+        """
+        text = str(query_params.get("q", "") or "").strip()
+
+        if not text or not self.text_search_fields:
+            return objects
+
+        backend = get_search_backend()
+        objects = backend.search(objects, text, self.text_search_fields)
+
+        if not order_by and "cursor" not in query_params:
+            objects = objects.order_by(
+                f"-{backend.rank_field}", *self.manager.get_pagination_ordering()
+            )
+
+        return objects
+
+    def get_ordering(self, query_params: dict, **kwargs) -> list | None:
+        """
+        Generate the ordering based on the `ordering` query param.
+        Only the fields listed in `ordering_fields` are allowed.
+        Raises:
+            BadRequestError: If a field is not allowed for ordering.
+        """
+        ordering = str(query_params.get("ordering", "")).strip()
+
+        if not ordering:
+            return None
+
+        order_by = [order.strip() for order in ordering.split(",") if order.strip()]
+
+        for order in order_by:
+            if order.lstrip("-") not in self.ordering_fields:
+                raise BadRequestError(error.INVALID_ORDERING, codes.INVALID)
+
+        return order_by
+
     def list_all(self, request):
         """
         Retrieve object list based query params provided in the request data.
@@ -113,11 +278,33 @@ class ListView:
             query_objects=query_objects,
         )
 
-        objects = self.manager.list(query=query_objects)
+        order_by = self.get_ordering(query_params=query)
+
+        objects = self.manager.list(
+            query=query_objects,
+            order_by=order_by,
+            select_related=self.list_select_related,
+            prefetch_related=self.list_prefetch_related,
+        )
+        objects = self.search_objects(objects, query_params=query, order_by=order_by)
+
+        values = self.get_list_values(request=request)
+        if values is not None:
+            objects = objects.values_list(*values)
+
         if not objects:
             raise NoDataFoundError()
 
-        return generate_response(data=self.get_list(objects=objects, request=request))
+        with timed("serialize"):
+            data = self.get_list(
+                objects=objects, request=request, columnar=self.is_columnar(request)
+            )
+            included = self.get_included(objects=objects, request=request)
+
+        if included is not None:
+            data = {"list": data, "included": included}
+
+        return generate_response(data=data)
 
     def get_with_pagination(self, request, query):
         """
@@ -143,18 +330,62 @@ class ListView:
             "page_size": query_params["page_size"],
         }
 
-        objects, pagination = self.manager.list_with_pagination(
-            query=query_objects,
+        if "cursor" in query_params:
+            pagination["cursor"] = query_params["cursor"]
+
+        objects, pagination = self.get_paginated_objects(
+            query_objects=query_objects,
+            order_by=self.get_ordering(query_params=query_params),
             pagination=pagination,
+            query_params=query_params,
+            request=request,
         )
         if not objects:
             raise NoDataFoundError()
 
-        return generate_response(
-            data={
-                "list": self.get_list(objects=objects, request=request),
-                "pagination": pagination,
+        with timed("serialize"):
+            data = {
+                "list": self.get_list(
+                    objects=objects, request=request, columnar=self.is_columnar(request)
+                )
             }
+            included = self.get_included(objects=objects, request=request)
+
+        if included is not None:
+            data["included"] = included
+
+        return generate_response(data={**data, "pagination": pagination})
+
+    def get_paginated_objects(
+        self, query_objects, order_by, pagination, query_params=None, request=None, **_
+    ):
+        """
+        Fetch the objects of the requested page along with the pagination details.
+        Override to paginate a custom queryset, e.g. an aggregated one.
+        """
+        values = self.get_list_values(request=request)
+
+        if self.text_search_fields and (query_params or {}).get("q"):
+            ordering = self.manager.get_pagination_ordering(order_by)
+            objects = self.manager.list(
+                query=query_objects,
+                order_by=ordering,
+                select_related=self.list_select_related,
+                prefetch_related=self.list_prefetch_related,
+            )
+            objects = self.search_objects(objects, query_params=query_params, order_by=order_by)
+
+            return self.manager.paginate(
+                objects, ordering=ordering, pagination=pagination, values=values
+            )
+
+        return self.manager.list_with_pagination(
+            query=query_objects,
+            order_by=order_by,
+            pagination=pagination,
+            select_related=self.list_select_related,
+            prefetch_related=self.list_prefetch_related,
+            values=values,
         )
 
     def get_search_and_filter_query(self, query_params, query_objects):
@@ -5,8 +5,11 @@ for retrieving an object based on its ID. It raises a 404 error if the object is
 
 from base import constants
 from base.db_access import Manager
+from base.serialization import Serialization
+from base.views.fields import FIELDS_PARAM, select_fields
 from utils.exceptions import NoDataFoundError
 from utils.response import generate_response
+from utils.functions import get_etag
 
 
 class RetrieveView:
@@ -14,10 +17,16 @@ class RetrieveView:
     A base view class for retrieving object by their ID.
     Attributes:
         manager (object): The manager instance responsible for handling database queries.
+        retrieve_serialization (Serialization): Serialization the `fields` query param selects
+            the keys of, defaults to the serialization of the model.
+        selectable_fields (list): Keys allowed in the `fields` query param. Defaults to every
+            key of the retrieve serialization.
     """
 
     manager: Manager = None
     lookup_field: str = None
+    retrieve_serialization: Serialization = None
+    selectable_fields: list = None
 
     @classmethod
     def get_method_view_mapping(cls):
@@ -31,9 +40,45 @@ class RetrieveView:
         Returns:
             object: The retrieved object if found.
         """
+        query = {self.lookup_field: kwargs[self.lookup_field]}
 
-        obj = self.manager.get(query={self.lookup_field: kwargs[self.lookup_field]})
+        if request.query_params.get(FIELDS_PARAM):
+            return self.retrieve_fields(request, query)
+
+        obj = self.manager.get(query=query)
         if not obj:
             raise NoDataFoundError()
 
-        return generate_response(data=obj.to_dict())
+        response = generate_response(data=obj.to_dict())
+
+        if hasattr(obj, "updated_dtm"):
+            response["ETag"] = get_etag(obj.updated_dtm)
+
+        return response
+
+    def retrieve_fields(self, request, query: dict):
+        """
+        Retrieve the keys of the `fields` query param only, the row is fetched with the
+        columns of the selected keys and the version of the object.
+        """
+        serialization = select_fields(
+            self.retrieve_serialization or getattr(self.manager.model, "serialization", None),
+            request,
+            self.selectable_fields,
+        )
+
+        columns = list(serialization.columns)
+        has_version = any(field.name == "updated_dtm" for field in self.manager.model._meta.fields)
+        if has_version and "updated_dtm" not in columns:
+            columns.append("updated_dtm")
+
+        row = next(iter(self.manager.list(query=query, values=columns)[:1]), None)
+        if row is None:
+            raise NoDataFoundError()
+
+        response = generate_response(data=serialization.from_row(row))
+
+        if has_version:
+            response["ETag"] = get_etag(row[columns.index("updated_dtm")])
+
+        return response
@@ -3,6 +3,7 @@ This module contains the BasePatchView class, which provides a base implementati
 for updating objects based on query parameters. It raises a 404 error if the object is not found.
 """
 
+from django.db import transaction
 from rest_framework import serializers, status
 
 from ..constants import PATCH, PUT
@@ -10,7 +11,13 @@ from ..constants import PATCH, PUT
 from base.db_access import Manager
 from utils.messages import error, success
 from utils.response import generate_response
-from utils.exceptions import NoDataFoundError, ValidationError, BadRequestError
+from utils.functions import get_etag, parse_etag
+from utils.exceptions import (
+    NoDataFoundError,
+    ValidationError,
+    BadRequestError,
+    PreconditionFailedError,
+)
 
 
 class UpdateView:
@@ -48,9 +55,53 @@ class UpdateView:
 
         return data
 
+    def get_expected_updated_dtm(self, request, obj):
+        """
+        Return the `updated_dtm` the client based its changes on, from the `If-Match` header.
+        Args:
+            request (Request): The HTTP request object.
+            obj (Model): The object as currently stored.
+        Returns:
+            datetime: The expected `updated_dtm`, None when no version is required.
+        Raises:
+            PreconditionFailedError: If the object was modified since that version.
+        """
+        if_match = request.headers.get("If-Match", "").strip()
+        if not if_match or if_match == "*" or not hasattr(obj, "updated_dtm"):
+            return None
+
+        expected_updated_dtm = parse_etag(if_match)
+        if expected_updated_dtm != obj.updated_dtm:
+            raise PreconditionFailedError()
+
+        return expected_updated_dtm
+
+    def post_update(self, obj, **kwargs):
+        """
+        A hook executed after the object is updated in the database.
+        Args:
+            obj (models.Model): The updated object instance.
+            **kwargs: Additional keyword arguments.
+        Returns:
+            Response: The response with the updated object and its `ETag`.
+        """
+        response = generate_response(
+            data=obj.to_dict(),
+            status_code=status.HTTP_200_OK,
+            messages={"message": success.UPDATED_SUCCESSFULLY},
+        )
+
+        if hasattr(obj, "updated_dtm"):
+            response["ETag"] = get_etag(obj.updated_dtm)
+
+        return response
+
     def update(self, request, **kwargs):
         """
         Update an object based on query params and data provided in the request.
+        The object read for the validation is handed to the manager, which writes only the
+        changed fields with a single `UPDATE ... RETURNING`. With an `If-Match` header the update
+        only applies if the object was not modified since that version, otherwise a 412 is returned.
         Args:
             request (Request): The HTTP request object containing the data.
         Returns:
@@ -64,6 +115,8 @@ class UpdateView:
         if not obj:
             raise NoDataFoundError()
 
+        expected_updated_dtm = self.get_expected_updated_dtm(request, obj)
+
         is_partial = request.method == PATCH.upper()
 
         serializer = self.serializer_class(obj, data=request.data, partial=is_partial)
@@ -79,10 +132,17 @@ class UpdateView:
 
         data = self.add_common_data(data=data, request=request)
 
-        obj = self.manager.update(data, query)
+        with transaction.atomic():
+            updated_obj = self.manager.update(
+                data,
+                query,
+                instance=obj,
+                expected_updated_dtm=expected_updated_dtm,
+            )
+
+        if not updated_obj:
+            if expected_updated_dtm:
+                raise PreconditionFailedError()
+            raise NoDataFoundError()
 
-        return generate_response(
-            data=obj.to_dict(),
-            status_code=status.HTTP_200_OK,
-            messages={"message": success.UPDATED_SUCCESSFULLY},
-        )
+        return self.post_update(obj=updated_obj, data=data, request=request)
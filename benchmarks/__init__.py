@@ -0,0 +1,15 @@
+"""
+Endpoint benchmarks, run with the `run_benchmarks` management command.
+"""
+
+from .cases import BenchmarkCase, CASES
+from .runner import BenchmarkRunner, compare, load_baseline, save_baseline
+
+__all__ = [
+    "BenchmarkCase",
+    "CASES",
+    "BenchmarkRunner",
+    "compare",
+    "load_baseline",
+    "save_baseline",
+]
@@ -0,0 +1,116 @@
+"""
+Benchmark cases.
+A case is a request of an endpoint, its path, query params and body may depend on the
+context of the run (the ids of the generated rows) and on the iteration.
+"""
+
+import json
+
+from utils.functions import get_uuid
+
+
+class BenchmarkCase:
+    __doc__ = """
+    This class describes the request of a benchmark case.
+    Args:
+        name (str): The name of the case, `<viewset>.<action>`.
+        method (str): The HTTP method.
+        path (str): The path under the API base path, formatted with the context.
+        query_params (dict, optional): The query params, formatted with the context.
+        data (callable, optional): Called with the context and the iteration, returns the body.
+        prepare (callable, optional): Called with the client and the context before every
+            request, untimed, returns the headers of the request.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        method: str,
+        path: str,
+        query_params: dict = None,
+        data=None,
+        prepare=None,
+    ):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.query_params = query_params or {}
+        self.data = data
+        self.prepare = prepare
+
+    def get_request(self, context: dict, iteration: int) -> dict:
+        return {
+            "path": self.path.format(**context),
+            "query_params": {
+                key: str(value).format(**context) for key, value in self.query_params.items()
+            },
+            "data": json.dumps(self.data(context, iteration)) if self.data else "",
+        }
+
+
+def get_customer_data(context, iteration):
+    return {
+        "customer_type": "BUSINESS",
+        "company_name": "Benchmark Logistics",
+        "first_name": "Bench",
+        "last_name": "Mark",
+        "mobile_number": "9876543210",
+        "email": f"bench-{get_uuid()}@example.com",
+        "address": "1 MG Road, Pune",
+    }
+
+
+def get_invoice_data(context, iteration):
+    return {
+        "customer_id": context["customer_id"],
+        "vehicle_id": context["vehicle_id"],
+        "date": "2024-05-15",
+        "loading_address": "Warehouse 1, Pune",
+        "delivery_address": "MG Road, Mumbai",
+        "weight": 1200.50,
+        "rate": 8.75,
+        "total": 10504.38,
+        "status": "PENDING",
+    }
+
+
+def get_login_data(context, iteration):
+    from utils.load_data.generate import PASSWORD
+
+    return {"username": "user1@example.com", "password": PASSWORD}
+
+
+def login_other_user(client, context):
+    """
+    Log `user1` in with a separate session, the logout case revokes its token.
+    """
+    from django.test import Client
+
+    from .runner import login
+
+    return {"authorization": f"Bearer {login(Client(), 'user1@example.com')}"}
+
+
+CASES = [
+    BenchmarkCase("auth.login", "POST", "/auth/login", data=get_login_data),
+    BenchmarkCase("auth.logout", "DELETE", "/auth/logout", prepare=login_other_user),
+    BenchmarkCase("customer.list", "GET", "/customer"),
+    BenchmarkCase("customer.list_cursor", "GET", "/customer", {"cursor": "", "page_size": 50}),
+    BenchmarkCase("customer.search", "GET", "/customer", {"q": "{customer_name}"}),
+    BenchmarkCase("customer.retrieve", "GET", "/customer/{customer_id}"),
+    BenchmarkCase("customer.create", "POST", "/customer", data=get_customer_data),
+    BenchmarkCase("vehicle.list", "GET", "/vehicle"),
+    BenchmarkCase("vehicle.retrieve", "GET", "/vehicle/{vehicle_id}"),
+    BenchmarkCase("invoice.list", "GET", "/invoice"),
+    BenchmarkCase("invoice.list_deep_page", "GET", "/invoice", {"page": 50}),
+    BenchmarkCase(
+        "invoice.list_filtered",
+        "GET",
+        "/invoice",
+        {"status": "PAID", "date_from": "2024-01-01", "date_to": "2024-03-31"},
+    ),
+    BenchmarkCase("invoice.retrieve", "GET", "/invoice/{invoice_id}"),
+    BenchmarkCase("invoice.create", "POST", "/invoice", data=get_invoice_data),
+    BenchmarkCase("payment.list", "GET", "/payment"),
+    BenchmarkCase("notification.list", "GET", "/notifications"),
+]
@@ -0,0 +1,110 @@
+"""
+Latency histogram.
+An HDR-style histogram: the values are recorded in integer microseconds into buckets of a
+fixed relative precision, so that the memory is bounded and the percentiles of the whole
+range, from microseconds to minutes, keep the same number of significant digits.
+"""
+
+import math
+from collections import Counter
+
+
+class LatencyHistogram:
+    __doc__ = """
+    This class records latencies with `significant_digits` of precision.
+    The histograms of the clients are recorded separately and merged with `add`.
+    Example:
+        histogram = LatencyHistogram()
+        histogram.record(0.0123)  # seconds
+        histogram.get_percentile(99)  # milliseconds
+    """
+
+    def __init__(self, significant_digits: int = 3):
+        self.significant_digits = significant_digits
+        self.counts = Counter()
+        self.total_count = 0
+        self.max_value = 0
+
+    def get_bucket(self, value: int) -> int:
+        """
+        Round the value down to its significant digits, the key of its bucket.
+        """
+        if value < 10**self.significant_digits:
+            return value
+
+        scale = 10 ** (int(math.log10(value)) + 1 - self.significant_digits)
+        return value // scale * scale
+
+    def record(self, seconds: float):
+        value = max(int(seconds * 1_000_000), 0)
+
+        self.counts[self.get_bucket(value)] += 1
+        self.total_count += 1
+        self.max_value = max(self.max_value, value)
+
+    def add(self, other: "LatencyHistogram"):
+        self.counts.update(other.counts)
+        self.total_count += other.total_count
+        self.max_value = max(self.max_value, other.max_value)
+
+    def get_percentile(self, percent: float) -> float:
+        """
+        Return the value at the percentile in milliseconds, 0 for an empty histogram.
+        """
+        if not self.total_count:
+            return 0.0
+
+        rank = max(math.ceil(percent / 100 * self.total_count), 1)
+        seen = 0
+
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                return min(bucket, self.max_value) / 1000
+
+        return self.max_value / 1000
+
+    def get_mean(self) -> float:
+        if not self.total_count:
+            return 0.0
+
+        return sum(bucket * count for bucket, count in self.counts.items()) / self.total_count / 1000
+
+    def get_percentile_distribution(self, ticks_per_half: int = 2) -> list:
+        """
+        Return the percentile distribution, as printed by HdrHistogram: the percentiles get
+        closer to 100 by halving the remaining distance in `ticks_per_half` steps.
+        Returns:
+            list: `(value_ms, percentile, total_count)` tuples, up to the 100th percentile.
+        """
+        if not self.total_count:
+            return []
+
+        percentiles = [0.0]
+        remaining = 100.0
+        while remaining > 100 / self.total_count:
+            step = remaining / 2 / ticks_per_half
+            for _ in range(ticks_per_half):
+                percentiles.append(percentiles[-1] + step)
+            remaining /= 2
+        percentiles.append(100.0)
+
+        return [
+            (
+                self.get_percentile(percent),
+                round(percent, 4),
+                math.ceil(percent / 100 * self.total_count),
+            )
+            for percent in percentiles
+        ]
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.total_count,
+            "mean_ms": round(self.get_mean(), 3),
+            "p50_ms": self.get_percentile(50),
+            "p90_ms": self.get_percentile(90),
+            "p99_ms": self.get_percentile(99),
+            "p99_9_ms": self.get_percentile(99.9),
+            "max_ms": self.max_value / 1000,
+        }
@@ -0,0 +1,295 @@
+"""
+Concurrent load generator.
+Drives the API with concurrent clients, each a thread with its own keep-alive HTTP connection,
+sending a weighted mix of requests read from a scenario file, and records the latencies in
+HDR-style histograms per request and overall.
+The WSGI application may be served on a local port by `start_server`, with one thread and one
+database connection per client connection, as the Django development server does.
+"""
+
+import json
+import random
+import threading
+import http.client
+from collections import Counter
+from urllib.parse import urlencode, urlsplit
+from timeit import default_timer as timer
+
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+from django.core.servers.basehttp import get_internal_wsgi_application
+
+from utils.constants import BASE_PATH
+from utils.functions import get_uuid
+from utils.load_data.generate import PASSWORD
+
+from .histogram import LatencyHistogram
+
+METHODS = ("GET", "POST", "PUT", "PATCH", "DELETE")
+
+# The placeholders of the scenario requests, sampled from the rows of the database.
+ID_PLACEHOLDERS = {
+    "customer_id": "customer.db_models.Customer",
+    "vehicle_id": "vehicle.db_models.Vehicle",
+    "invoice_id": "invoice.db_models.Invoice",
+}
+
+
+class QuietWSGIRequestHandler(WSGIRequestHandler):
+    """
+    Request handler which does not log every request.
+    """
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(host: str = "127.0.0.1", port: int = 0):
+    """
+    Serve the WSGI application in a background thread.
+    Returns:
+        tuple: The server and the port it listens on, stop it with `server.shutdown()`.
+    """
+    server = ThreadedWSGIServer((host, port), QuietWSGIRequestHandler, allow_reuse_address=True)
+    server.set_app(get_internal_wsgi_application())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    return server, server.server_address[1]
+
+
+def load_scenario(path: str) -> dict:
+    """
+    Read and validate a scenario file, see `benchmarks/scenarios/default.json`.
+    Raises:
+        ValueError: If the scenario is invalid.
+    """
+    with open(path, "r") as scenario_file:
+        scenario = json.load(scenario_file)
+
+    requests = scenario.get("requests")
+    if not requests:
+        raise ValueError("The scenario has no requests.")
+
+    for request in requests:
+        missing = {"name", "method", "path", "weight"} - set(request)
+        if missing:
+            raise ValueError(f"The scenario request {request} misses {sorted(missing)}.")
+        if request["method"] not in METHODS:
+            raise ValueError(f"{request['name']}: unsupported method {request['method']}.")
+        if request["weight"] <= 0:
+            raise ValueError(f"{request['name']}: the weight must be positive.")
+
+    return scenario
+
+
+def get_ids(sample_size: int = 1000) -> dict:
+    """
+    Sample the ids of the latest rows of every placeholder table.
+    """
+    from django.utils.module_loading import import_string
+
+    return {
+        placeholder: list(
+            import_string(model)
+            .objects.filter(is_deleted=False)
+            .order_by("-created_dtm")
+            .values_list("pk", flat=True)[:sample_size]
+        )
+        for placeholder, model in ID_PLACEHOLDERS.items()
+    }
+
+
+def render(value, values: dict):
+    """
+    Format the placeholders of the strings of a path, query params or body.
+    """
+    if isinstance(value, str):
+        return value.format_map(values)
+    if isinstance(value, dict):
+        return {key: render(item, values) for key, item in value.items()}
+    if isinstance(value, list):
+        return [render(item, values) for item in value]
+    return value
+
+
+class LoadClient:
+    __doc__ = """
+    This class is a client of the load test, it sends requests until the deadline.
+    Args:
+        host (str): The host of the server.
+        port (int): The port of the server.
+        token (str): The token of the user the client is authenticated as.
+        scenario (dict): The scenario, see `load_scenario`.
+        ids (dict): The ids of the placeholders, see `get_ids`.
+        seed (int): The seed of the choice of the requests.
+    """
+
+    def __init__(self, host, port, token, scenario, ids, seed):
+        self.host = host
+        self.port = port
+        self.token = token
+        self.requests = scenario["requests"]
+        self.weights = [request["weight"] for request in self.requests]
+        self.ids = ids
+        self.rng = random.Random(seed)
+        self.connection = None
+
+        self.histogram = LatencyHistogram()
+        self.histograms = {request["name"]: LatencyHistogram() for request in self.requests}
+        self.errors = Counter()
+        self.statuses = Counter()
+
+    def get_values(self) -> dict:
+        values = {"uuid": get_uuid()}
+        values.update(
+            {placeholder: self.rng.choice(ids) for placeholder, ids in self.ids.items() if ids}
+        )
+        return values
+
+    def send(self, request: dict) -> int:
+        """
+        Send the request on the keep-alive connection, reconnecting after a failure.
+        Returns:
+            int: The status code of the response.
+        """
+        values = self.get_values()
+        path = f"{BASE_PATH}{render(request['path'], values)}"
+        if request.get("query_params"):
+            path = f"{path}?{urlencode(render(request['query_params'], values))}"
+
+        body = json.dumps(render(request["body"], values)) if "body" in request else None
+        headers = {"Authorization": f"Bearer {self.token}", "Accept": "application/json"}
+        if body is not None:
+            headers["Content-Type"] = "application/json"
+
+        if self.connection is None:
+            self.connection = http.client.HTTPConnection(self.host, self.port, timeout=60)
+
+        try:
+            self.connection.request(request["method"], path, body=body, headers=headers)
+            response = self.connection.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            self.connection.close()
+            self.connection = None
+            raise
+
+        if response.will_close:
+            self.connection.close()
+            self.connection = None
+
+        return response.status
+
+    def run(self, deadline: float):
+        while timer() < deadline:
+            request = self.rng.choices(self.requests, weights=self.weights)[0]
+
+            start = timer()
+            try:
+                status = self.send(request)
+            except (OSError, http.client.HTTPException) as exc:
+                status = type(exc).__name__
+            duration = timer() - start
+
+            self.histogram.record(duration)
+            self.histograms[request["name"]].record(duration)
+            self.statuses[status] += 1
+            if not isinstance(status, int) or status >= 400:
+                self.errors[request["name"]] += 1
+
+        if self.connection is not None:
+            self.connection.close()
+
+
+def login(host: str, port: int, email: str, password: str = PASSWORD) -> str:
+    """
+    Log a user in and return their token.
+    """
+    connection = http.client.HTTPConnection(host, port, timeout=60)
+    try:
+        connection.request(
+            "POST",
+            f"{BASE_PATH}/auth/login",
+            body=json.dumps({"username": email, "password": password}),
+            headers={"Content-Type": "application/json"},
+        )
+        response = connection.getresponse()
+        content = response.read()
+    finally:
+        connection.close()
+
+    if response.status != 201:
+        raise RuntimeError(f"Failed to log {email} in: {content[:500]!r}")
+
+    return json.loads(content)["data"]["token"]
+
+
+def run_load(
+    url: str,
+    scenario: dict,
+    concurrency: int = 10,
+    duration: float = 30,
+    users: int = 1,
+    seed: int = 0,
+) -> dict:
+    """
+    Run the load test.
+    Args:
+        url (str): The URL of the server, e.g. `http://127.0.0.1:8000`.
+        scenario (dict): The scenario, see `load_scenario`.
+        concurrency (int): The number of concurrent clients.
+        duration (float): The duration of the test in seconds.
+        users (int): The number of generated users the clients are spread on, every user
+            logs in once as a login revokes the previous tokens of the user.
+        seed (int): The seed of the choice of the requests.
+    Returns:
+        dict: The report of the test, with the histograms of the requests.
+    """
+    address = urlsplit(url)
+    host, port = address.hostname, address.port or 80
+
+    tokens = [login(host, port, f"user{index}@example.com") for index in range(users)]
+    ids = get_ids()
+
+    clients = [
+        LoadClient(host, port, tokens[index % users], scenario, ids, seed * 1000 + index)
+        for index in range(concurrency)
+    ]
+
+    start = timer()
+    deadline = start + duration
+    threads = [threading.Thread(target=client.run, args=(deadline,)) for client in clients]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = timer() - start
+
+    histogram = LatencyHistogram()
+    histograms = {request["name"]: LatencyHistogram() for request in scenario["requests"]}
+    errors = Counter()
+    statuses = Counter()
+
+    for client in clients:
+        histogram.add(client.histogram)
+        for name, client_histogram in client.histograms.items():
+            histograms[name].add(client_histogram)
+        errors.update(client.errors)
+        statuses.update(client.statuses)
+
+    total_errors = sum(errors.values())
+
+    return {
+        "concurrency": concurrency,
+        "duration_s": round(elapsed, 3),
+        "requests": histogram.total_count,
+        "errors": total_errors,
+        "throughput_rps": round(histogram.total_count / elapsed, 2),
+        "error_rate": round(total_errors / histogram.total_count, 4) if histogram.total_count else 0,
+        "statuses": {str(status): count for status, count in statuses.items()},
+        "latency": histogram.to_dict(),
+        "distribution": histogram.get_percentile_distribution(),
+        "by_request": {
+            name: {**request_histogram.to_dict(), "errors": errors[name]}
+            for name, request_histogram in histograms.items()
+        },
+    }
@@ -0,0 +1,213 @@
+"""
+Benchmark runner.
+Sends the requests of the benchmark cases through the Django test client and measures them:
+- the p50, p95 and p99 latencies over the timed iterations,
+- the queries per request and the memory allocated per request (tracemalloc peak), measured
+  in a separate pass as tracing slows the requests down.
+The results are compared with a stored JSON baseline to detect the regressions.
+"""
+
+import json
+import math
+import tracemalloc
+from pathlib import Path
+from timeit import default_timer as timer
+
+from django.db import connections
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from utils.constants import BASE_PATH
+from utils.load_data.generate import PASSWORD
+
+from .cases import BenchmarkCase
+
+# The metrics compared with the baseline. The p99 is reported only, it is too noisy over a
+# few iterations, and the query counts are deterministic and compared exactly.
+LATENCY_METRICS = ("p50_ms", "p95_ms")
+RELATIVE_METRICS = ("memory_kb",)
+EXACT_METRICS = ("queries",)
+
+
+def percentile(values: list, percent: float) -> float:
+    """
+    Nearest-rank percentile of the values.
+    """
+    ordered = sorted(values)
+    rank = max(math.ceil(percent / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def login(client: Client, email: str) -> str:
+    """
+    Log the generated user in and return their token.
+    """
+    response = client.post(
+        f"{BASE_PATH}/auth/login",
+        data={"username": email, "password": PASSWORD},
+        content_type="application/json",
+    )
+    if response.status_code != 201:
+        raise RuntimeError(f"Failed to log {email} in: {response.content!r}")
+
+    return response.json()["data"]["token"]
+
+
+class BenchmarkRunner:
+    __doc__ = """
+    This class runs the benchmark cases against the dataset of the current database.
+    The requests are authenticated as the generated user `user0@example.com`, the cases
+    logging users in and out use `user1@example.com` so that the client stays logged in.
+    Args:
+        iterations (int): The number of timed requests per case.
+        warmup (int): The number of untimed requests sent first, to fill the caches.
+        memory_iterations (int): The number of requests traced for the queries and memory,
+            their medians are reported.
+    """
+
+    def __init__(self, iterations: int = 50, warmup: int = 5, memory_iterations: int = 5):
+        self.iterations = max(iterations, 1)
+        self.warmup = max(warmup, 0)
+        self.memory_iterations = max(memory_iterations, 1)
+        self.client = Client()
+        self.context = {}
+
+    def setup(self):
+        """
+        Log the client in and collect the ids of the rows requested by the cases.
+        """
+        from customer.db_models import Customer
+        from invoice.db_models import Invoice
+
+        token = login(self.client, "user0@example.com")
+        self.client.defaults["HTTP_AUTHORIZATION"] = f"Bearer {token}"
+
+        invoice = Invoice.objects.filter(is_deleted=False).order_by("pk").first()
+        if invoice is None:
+            raise RuntimeError("The database has no invoices, generate a dataset first.")
+
+        self.context = {
+            "customer_id": invoice.customer_id,
+            "vehicle_id": invoice.vehicle_id,
+            "invoice_id": invoice.pk,
+            "customer_name": Customer.objects.get(pk=invoice.customer_id).first_name,
+        }
+
+    def send(self, case: BenchmarkCase, iteration: int):
+        headers = case.prepare(self.client, self.context) if case.prepare else {}
+        request = case.get_request(self.context, iteration)
+
+        response = self.client.generic(
+            case.method,
+            f"{BASE_PATH}{request['path']}",
+            data=request["data"],
+            content_type="application/json",
+            query_params=request["query_params"],
+            headers=headers,
+        )
+        if response.status_code >= 400:
+            raise RuntimeError(
+                f"{case.name} failed with {response.status_code}: {response.content[:500]!r}"
+            )
+
+        # Consume the streamed responses so that their generation is measured.
+        if response.streaming:
+            for _ in response.streaming_content:
+                pass
+
+        return response
+
+    def run_case(self, case: BenchmarkCase) -> dict:
+        """
+        Returns:
+            dict: The latency percentiles in milliseconds, the queries per request and the
+                peak memory allocated per request in KiB.
+        """
+        iteration = 0
+
+        for _ in range(self.warmup):
+            self.send(case, iteration)
+            iteration += 1
+
+        durations = []
+        for _ in range(self.iterations):
+            start = timer()
+            self.send(case, iteration)
+            durations.append((timer() - start) * 1000)
+            iteration += 1
+
+        queries = []
+        memory = []
+        tracemalloc.start()
+        try:
+            for _ in range(self.memory_iterations):
+                with CaptureQueriesContext(connections["default"]) as captured:
+                    tracemalloc.reset_peak()
+                    start_size, _ = tracemalloc.get_traced_memory()
+                    self.send(case, iteration)
+                    _, peak = tracemalloc.get_traced_memory()
+
+                queries.append(len(captured))
+                memory.append((peak - start_size) / 1024)
+                iteration += 1
+        finally:
+            tracemalloc.stop()
+
+        return {
+            "p50_ms": round(percentile(durations, 50), 3),
+            "p95_ms": round(percentile(durations, 95), 3),
+            "p99_ms": round(percentile(durations, 99), 3),
+            "queries": percentile(queries, 50),
+            "memory_kb": round(percentile(memory, 50), 1),
+        }
+
+    def run(self, cases: list) -> dict:
+        self.setup()
+        return {case.name: self.run_case(case) for case in cases}
+
+
+def load_baseline(path: Path) -> dict:
+    with open(path, "r") as baseline_file:
+        return json.load(baseline_file)
+
+
+def save_baseline(path: Path, dataset: dict, results: dict):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as baseline_file:
+        json.dump({"dataset": dataset, "results": results}, baseline_file, indent=4)
+
+
+def compare(results: dict, baseline: dict, tolerance: float, min_delta_ms: float = 1.0) -> list:
+    """
+    Compare the results with the baseline results.
+    Args:
+        results (dict): The results of the run, keyed by case name.
+        baseline (dict): The results of the baseline, keyed by case name.
+        tolerance (float): The allowed relative increase of the latencies and memory, e.g. 0.25.
+        min_delta_ms (float): The latency increase always allowed, as the timer noise.
+    Returns:
+        list: The regressions, as messages.
+    """
+    regressions = []
+
+    for name, metrics in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+
+        limits = {
+            metric: max(expected[metric] * (1 + tolerance), expected[metric] + min_delta_ms)
+            for metric in LATENCY_METRICS
+        }
+        limits.update(
+            {metric: expected[metric] * (1 + tolerance) for metric in RELATIVE_METRICS}
+        )
+        limits.update({metric: expected[metric] for metric in EXACT_METRICS})
+
+        regressions.extend(
+            f"{name}: {metric} {metrics[metric]} > {limit:.3f} (baseline {expected[metric]})"
+            for metric, limit in limits.items()
+            if metrics[metric] > limit
+        )
+
+    return regressions
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class CmdsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "cmds"
+
+    def ready(self):
+        # Connects the post_migrate receiver rebuilding the stale search indexes.
+        from base.search import operations  # noqa: F401
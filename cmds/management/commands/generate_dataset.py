@@ -0,0 +1,86 @@
+from timeit import default_timer as timer
+
+from django.core.management.base import BaseCommand, CommandError
+
+from utils.logger import log_msg, logging
+from utils.load_data.generate import generate_dataset, get_scale, clear_dataset
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a deterministic synthetic dataset of users, customers, vehicles, invoices "
+        "and notifications, scaled on the number of invoices."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--invoices",
+            type=int,
+            default=10_000,
+            help="Number of invoices, the other tables are scaled on it.",
+        )
+        parser.add_argument("--customers", type=int, help="Number of customers.")
+        parser.add_argument("--vehicles", type=int, help="Number of vehicles.")
+        parser.add_argument("--users", type=int, help="Number of users.")
+        parser.add_argument("--notifications", type=int, help="Number of notifications.")
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Seed of the dataset, a same seed always generates the same rows.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Number of rows generated and inserted per chunk.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Number of generating processes, 1 generates in the current process.",
+        )
+        parser.add_argument(
+            "--clear",
+            action="store_true",
+            help="Delete the existing users, customers, vehicles, invoices and notifications first.",
+        )
+
+    def handle(self, *args, **kwargs):
+        scale = get_scale(
+            kwargs["invoices"],
+            customers=kwargs["customers"],
+            vehicles=kwargs["vehicles"],
+            users=kwargs["users"],
+            notifications=kwargs["notifications"],
+        )
+
+        if min(scale["customers"], scale["vehicles"], scale["users"]) < 1:
+            raise CommandError("At least one user, customer and vehicle is required.")
+        if min(scale.values()) < 0 or kwargs["batch_size"] < 1:
+            raise CommandError("The counts and the batch size must be positive.")
+
+        if kwargs["clear"]:
+            log_msg(logging.INFO, "Deleting the existing dataset...")
+            clear_dataset()
+
+        log_msg(
+            logging.INFO,
+            "Generating the dataset "
+            + ", ".join(f"{count} {key}" for key, count in scale.items())
+            + f" with the seed {kwargs['seed']}...",
+        )
+
+        start = timer()
+        inserted = generate_dataset(
+            scale,
+            seed=kwargs["seed"],
+            batch_size=kwargs["batch_size"],
+            workers=max(kwargs["workers"], 1),
+        )
+
+        log_msg(
+            logging.INFO,
+            f"Generated {sum(inserted.values())} rows in {timer() - start:.2f}s.",
+        )
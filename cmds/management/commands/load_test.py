@@ -0,0 +1,116 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from utils.logger import log_msg, logging
+from benchmarks.load import load_scenario, run_load, start_server
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive the API with concurrent clients sending the weighted requests of a scenario, "
+        "and report the throughput, the error rate and the latency histograms. "
+        "The requests run against the configured database, generate a dataset first."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scenario",
+            default="benchmarks/scenarios/default.json",
+            help="Path of the scenario file.",
+        )
+        parser.add_argument(
+            "--concurrency", type=int, default=10, help="Number of concurrent clients."
+        )
+        parser.add_argument(
+            "--duration", type=float, default=30, help="Duration of the test in seconds."
+        )
+        parser.add_argument(
+            "--users",
+            type=int,
+            default=1,
+            help="Number of generated users the clients are authenticated as.",
+        )
+        parser.add_argument("--seed", type=int, default=0, help="Seed of the request mix.")
+        parser.add_argument(
+            "--url",
+            default=None,
+            help="URL of a running server, by default the application is served on --port.",
+        )
+        parser.add_argument(
+            "--port",
+            type=int,
+            default=0,
+            help="Local port the application is served on, 0 for a free port.",
+        )
+        parser.add_argument(
+            "--output", default=None, help="Path of the JSON report with the histograms."
+        )
+
+    def handle(self, *args, **kwargs):
+        if kwargs["concurrency"] < 1 or kwargs["users"] < 1 or kwargs["duration"] <= 0:
+            raise CommandError("The concurrency, users and duration must be positive.")
+
+        try:
+            scenario = load_scenario(kwargs["scenario"])
+        except (OSError, ValueError) as exc:
+            raise CommandError(f"Invalid scenario {kwargs['scenario']}: {exc}")
+
+        server = None
+        url = kwargs["url"]
+        if url is None:
+            server, port = start_server(port=kwargs["port"])
+            url = f"http://127.0.0.1:{port}"
+
+        log_msg(
+            logging.INFO,
+            f"Running {kwargs['scenario']} against {url} with {kwargs['concurrency']} "
+            f"clients for {kwargs['duration']}s...",
+        )
+
+        try:
+            report = run_load(
+                url,
+                scenario,
+                concurrency=kwargs["concurrency"],
+                duration=kwargs["duration"],
+                users=kwargs["users"],
+                seed=kwargs["seed"],
+            )
+        except RuntimeError as exc:
+            raise CommandError(str(exc))
+        finally:
+            if server is not None:
+                server.shutdown()
+                server.server_close()
+
+        self.log_report(report)
+
+        if kwargs["output"]:
+            with open(kwargs["output"], "w") as output_file:
+                json.dump(report, output_file, indent=4)
+            log_msg(logging.INFO, f"Report stored at {kwargs['output']}.")
+
+    @staticmethod
+    def log_report(report: dict):
+        latency = report["latency"]
+        log_msg(
+            logging.INFO,
+            f"{report['requests']} requests in {report['duration_s']}s: "
+            f"{report['throughput_rps']} req/s, {report['errors']} errors "
+            f"({report['error_rate']:.2%}), statuses {report['statuses']}.",
+            f"Latency p50 {latency['p50_ms']}ms, p90 {latency['p90_ms']}ms, "
+            f"p99 {latency['p99_ms']}ms, p99.9 {latency['p99_9_ms']}ms, max {latency['max_ms']}ms.",
+            "",
+            f"{'Value(ms)':>12} {'Percentile':>12} {'TotalCount':>12}",
+            *(
+                f"{value:>12.3f} {percentile / 100:>12.6f} {count:>12}"
+                for value, percentile, count in report["distribution"]
+            ),
+            "",
+            *(
+                f"{name}: {stats['count']} requests, {stats['errors']} errors, "
+                f"p50 {stats['p50_ms']}ms, p99 {stats['p99_ms']}ms, max {stats['max_ms']}ms"
+                for name, stats in report["by_request"].items()
+            ),
+        )
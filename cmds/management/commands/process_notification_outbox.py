@@ -0,0 +1,72 @@
+import time
+
+from django.db import close_old_connections
+from django.core.management.base import BaseCommand
+
+from utils import settings
+from utils.logger import log_msg, logging
+from notification.db_access import notification_outbox_manager
+
+
+class Command(BaseCommand):
+    help = (
+        "Send the notifications of the outbox in batches, "
+        "polling for new ones until stopped, or once with --once."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Send the notifications due now and exit.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.read("NOTIFICATION_OUTBOX_BATCH_SIZE"),
+            help="Number of notifications claimed and inserted together.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=settings.read("NOTIFICATION_OUTBOX_POLL_INTERVAL"),
+            help="Seconds to wait when the outbox is empty.",
+        )
+        parser.add_argument(
+            "--max-attempts",
+            type=int,
+            default=settings.read("NOTIFICATION_OUTBOX_MAX_ATTEMPTS"),
+            help="Number of attempts before a notification is marked as failed.",
+        )
+
+    def handle(self, *args, **kwargs):
+        batch_size = max(kwargs["batch_size"], 1)
+        total_sent = total_failed = 0
+
+        log_msg(logging.INFO, "Processing the notification outbox...")
+
+        try:
+            while True:
+                close_old_connections()
+
+                claimed, sent, failed = notification_outbox_manager.process_batch(
+                    batch_size, kwargs["max_attempts"]
+                )
+                total_sent += sent
+                total_failed += failed
+
+                # A full batch means more rows are probably due, so poll again right away.
+                if claimed == batch_size:
+                    continue
+
+                if kwargs["once"]:
+                    break
+
+                time.sleep(kwargs["poll_interval"])
+        except KeyboardInterrupt:
+            pass
+
+        log_msg(
+            logging.INFO,
+            f"Sent {total_sent} notifications, {total_failed} failed.",
+        )
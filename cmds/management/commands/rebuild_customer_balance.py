@@ -0,0 +1,90 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connection
+from django.core.management.base import BaseCommand, CommandError
+
+from utils.logger import log_msg, logging
+from customer.db_access import customer_manager
+from payment.db_access import customer_balance_manager
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the customer balance ledger from the invoices, "
+        "or verify it with --verify, in parallel chunks of customers."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--verify",
+            action="store_true",
+            help="Only compare the ledger with the invoices and report the mismatches.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Number of customers aggregated per query.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help=(
+                "Number of chunks processed in parallel, 1 runs them in the current thread. "
+                "Defaults to 1 on SQLite, which has a single writer at a time, and to 4 otherwise."
+            ),
+        )
+
+    def handle(self, *args, **kwargs):
+        verify = kwargs["verify"]
+        chunk_size = max(kwargs["chunk_size"], 1)
+        workers = kwargs["workers"]
+        if workers is None:
+            workers = 1 if connection.vendor == "sqlite" else 4
+
+        customer_ids = list(
+            customer_manager.list(query={}, order_by=["pk"]).values_list("pk", flat=True)
+        )
+        chunks = [
+            customer_ids[index : index + chunk_size]
+            for index in range(0, len(customer_ids), chunk_size)
+        ]
+
+        log_msg(
+            logging.INFO,
+            f"{'Verifying' if verify else 'Rebuilding'} the balance of "
+            f"{len(customer_ids)} customers in {len(chunks)} chunks...",
+        )
+
+        process = customer_balance_manager.verify if verify else customer_balance_manager.rebuild
+
+        def run(chunk):
+            try:
+                return process(chunk)
+            finally:
+                # Every worker thread opens its own connection.
+                connection.close()
+
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(run, chunks))
+        else:
+            results = [process(chunk) for chunk in chunks]
+
+        if not verify:
+            log_msg(logging.INFO, f"Rebuilt {sum(results)} customer balances.")
+            return
+
+        mismatches = {key: value for result in results for key, value in result.items()}
+        for customer_id, mismatch in mismatches.items():
+            log_msg(
+                logging.WARNING,
+                f"Customer {customer_id}: expected {mismatch['expected']}, "
+                f"found {mismatch['actual']}",
+            )
+
+        if mismatches:
+            raise CommandError(f"{len(mismatches)} customer balances are out of date.")
+
+        log_msg(logging.INFO, "All customer balances are up to date.")
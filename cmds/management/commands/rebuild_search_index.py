@@ -0,0 +1,23 @@
+from django.apps import apps
+from django.db import connection
+from django.core.management.base import BaseCommand
+
+from utils.logger import log_msg, logging
+from base.search.operations import rebuild_search_indexes
+
+
+class Command(BaseCommand):
+    help = (
+        "Recreate the SQLite FTS5 search tables and their triggers, and index every row again. "
+        "The indexes missing a trigger, e.g. after a migration remaking a searched table, are "
+        "rebuilt after every migrate already."
+    )
+
+    def handle(self, *args, **kwargs):
+        if connection.vendor != "sqlite":
+            log_msg(logging.INFO, "The search indexes of this database need no rebuild.")
+            return
+
+        rebuilt = rebuild_search_indexes(apps.get_models())
+
+        log_msg(logging.INFO, f"Rebuilt {len(rebuilt)} search indexes.")
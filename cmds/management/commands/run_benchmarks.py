@@ -0,0 +1,160 @@
+from pathlib import Path
+
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.core.management.base import BaseCommand, CommandError
+
+from tms.test_runner import test_caches
+from utils.logger import log_msg, logging
+from utils.load_data.generate import generate_dataset, get_scale
+from benchmarks import CASES, BenchmarkRunner, compare, load_baseline, save_baseline
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the endpoints against a generated dataset in a test database, "
+        "and compare the results with a stored baseline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--invoices",
+            type=int,
+            default=10_000,
+            help="Number of invoices of the generated dataset.",
+        )
+        parser.add_argument("--seed", type=int, default=0, help="Seed of the dataset.")
+        parser.add_argument(
+            "--iterations", type=int, default=50, help="Number of timed requests per case."
+        )
+        parser.add_argument(
+            "--warmup", type=int, default=5, help="Number of untimed requests per case."
+        )
+        parser.add_argument(
+            "--memory-iterations",
+            type=int,
+            default=5,
+            help="Number of requests per case traced for the queries and memory.",
+        )
+        parser.add_argument(
+            "--case",
+            action="append",
+            dest="cases",
+            help="Run only the cases starting with this name, e.g. `invoice`. Repeatable.",
+        )
+        parser.add_argument(
+            "--baseline",
+            default=None,
+            help="Path of the baseline, defaults to benchmarks/baselines/<database vendor>.json.",
+        )
+        parser.add_argument(
+            "--save",
+            action="store_true",
+            help="Store the results as the baseline instead of comparing them.",
+        )
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=0.5,
+            help="Allowed relative increase of the latencies and memory, e.g. 0.5 for 50%%.",
+        )
+        parser.add_argument(
+            "--min-delta-ms",
+            type=float,
+            default=1.0,
+            help="Latency increase always allowed, in milliseconds.",
+        )
+        parser.add_argument(
+            "--keepdb",
+            action="store_true",
+            help="Keep the test database and its dataset between runs.",
+        )
+
+    def handle(self, *args, **kwargs):
+        cases = [
+            case
+            for case in CASES
+            if not kwargs["cases"] or case.name.startswith(tuple(kwargs["cases"]))
+        ]
+        if not cases:
+            raise CommandError("No benchmark case matches the --case filters.")
+
+        baseline_path = Path(
+            kwargs["baseline"] or f"benchmarks/baselines/{connection.vendor}.json"
+        )
+        baseline = None
+        if not kwargs["save"]:
+            if not baseline_path.exists():
+                raise CommandError(f"No baseline at {baseline_path}, record one with --save.")
+            baseline = load_baseline(baseline_path)
+
+        dataset = {"invoices": kwargs["invoices"], "seed": kwargs["seed"]}
+        if baseline and baseline["dataset"] != dataset:
+            raise CommandError(
+                f"The baseline was recorded on the dataset {baseline['dataset']}, not {dataset}."
+            )
+
+        results = self.run(cases, dataset, kwargs)
+
+        for name, metrics in results.items():
+            log_msg(
+                logging.INFO,
+                f"{name}: p50 {metrics['p50_ms']}ms, p95 {metrics['p95_ms']}ms, "
+                f"p99 {metrics['p99_ms']}ms, {metrics['queries']} queries, "
+                f"{metrics['memory_kb']}KiB",
+            )
+
+        if kwargs["save"]:
+            save_baseline(baseline_path, dataset, results)
+            log_msg(logging.INFO, f"Baseline stored at {baseline_path}.")
+            return
+
+        regressions = compare(
+            results, baseline["results"], kwargs["tolerance"], kwargs["min_delta_ms"]
+        )
+        for regression in regressions:
+            log_msg(logging.WARNING, f"Regression {regression}")
+
+        if regressions:
+            raise CommandError(f"{len(regressions)} benchmark regressions.")
+
+        log_msg(logging.INFO, "No benchmark regression.")
+
+    @staticmethod
+    def run(cases: list, dataset: dict, options: dict) -> dict:
+        """
+        Run the cases in a test database seeded with the dataset and on the test caches, the
+        database is destroyed afterwards unless `keepdb`.
+        """
+        from invoice.db_models import Invoice
+        from authentication.last_login import last_login_tracker
+
+        setup_test_environment()
+        caches = test_caches()
+        caches.enable()
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, keepdb=options["keepdb"])
+
+        try:
+            if not Invoice.objects.exists():
+                log_msg(logging.INFO, "Generating the benchmark dataset...")
+                generate_dataset(
+                    get_scale(dataset["invoices"]),
+                    seed=dataset["seed"],
+                    workers=4,
+                )
+
+            runner = BenchmarkRunner(
+                iterations=options["iterations"],
+                warmup=options["warmup"],
+                memory_iterations=options["memory_iterations"],
+            )
+            return runner.run(cases)
+        finally:
+            # The buffered last logins are written before the database is destroyed.
+            last_login_tracker.flush()
+            connection.creation.destroy_test_db(
+                old_name, verbosity=0, keepdb=options["keepdb"]
+            )
+            caches.disable()
+            teardown_test_environment()
@@ -1,10 +1,79 @@
-from base.db_access import manager
+from django.db.models import QuerySet
+
+from base.db_access import manager, CachePolicy
+from invoice.db_access import invoice_manager
+from payment.db_access import customer_balance_manager
+
 from ..db_models import Customer
 
+
 class CustomerManager(manager.Manager[Customer]):
     """
     Manager class for the Customer model.
     """
+
     model = Customer
-    
-customer_manager = CustomerManager()
\ No newline at end of file
+    cache_policy = CachePolicy()
+
+    def create(self, data, many=False, batch_size=None):
+        """
+        Create the customer(s), adding the ledger rows of customers created in bulk.
+        """
+        objs = super().create(data, many=many, batch_size=batch_size)
+
+        if many:
+            customer_balance_manager.create_missing([obj.pk for obj in objs])
+
+        return objs
+
+    def bulk_upsert(self, rows, unique_fields, update_fields=None, batch_size=None):
+        """
+        Upsert the customers, adding the ledger rows of the inserted ones.
+        """
+        objs = super().bulk_upsert(
+            rows,
+            unique_fields=unique_fields,
+            update_fields=update_fields,
+            batch_size=batch_size,
+        )
+
+        customer_balance_manager.create_missing([obj.pk for obj in objs])
+
+        return objs
+
+    def list_payment_summary(
+        self,
+        query: dict,
+        having: dict = None,
+        order_by: list = None,
+    ) -> QuerySet:
+        """
+        List customers with their invoice totals computed in a single GROUP BY query.
+        Args:
+            query (dict): Query dictionary for filtering the customers.
+            having (dict, optional): Query dictionary on the aggregated amounts,
+                e.g. `{"pending_amount__gt": 0}`. Defaults to None.
+            order_by (list, optional): Ordering, aggregated amounts can be used. Defaults to None.
+        Returns:
+            QuerySet: Rows with the customer fields and the payment summary annotations.
+        Example:
+            customer_manager.list_payment_summary({}, order_by=["-pending_amount"])
+        """
+        objects = (
+            self.list(query=query)
+            .values("customer_id", "first_name", "last_name", "created_dtm")
+            .annotate(
+                **invoice_manager.get_payment_summary_annotations(prefix="invoice__")
+            )
+        )
+
+        if having:
+            objects = objects.filter(self.query_builder.build_query(having))
+
+        if order_by:
+            objects = objects.order_by(*order_by)
+
+        return objects
+
+
+customer_manager = CustomerManager()
@@ -4,8 +4,9 @@ Contains configurations unique to customer module.
 """
 from django.db import models
 from base.db_models.model import BaseModel
+from base.serialization import Field, Serialization
 from customer.constants import CustomerTypeChoices
-from utils.functions import get_uuid
+from utils.functions import get_uuid, get_full_name
 
 
 class Customer(BaseModel, models.Model):
@@ -29,10 +30,45 @@ class Customer(BaseModel, models.Model):
     class Meta:
         """
         db_table (str): Specifies the database table name for the model.
+        indexes (list): Partial indexes on the rows which are not soft deleted.
         """
 
         db_table = "customer"
+        indexes = [
+            models.Index(
+                fields=["created_dtm", "customer_id"],
+                name="customer_created_idx",
+                condition=models.Q(is_deleted=False),
+            ),
+            models.Index(
+                fields=["customer_type"],
+                name="customer_type_idx",
+                condition=models.Q(is_deleted=False),
+            ),
+            models.Index(
+                fields=["first_name", "last_name"],
+                name="customer_name_idx",
+                condition=models.Q(is_deleted=False),
+            ),
+            models.Index(
+                fields=["company_name"],
+                name="customer_company_name_idx",
+                condition=models.Q(is_deleted=False),
+            ),
+        ]
         
+    serialization = Serialization(
+        "customer_id",
+        "customer_type",
+        "company_name",
+        "first_name",
+        "last_name",
+        Field("full_name", "first_name", "last_name", transform=get_full_name),
+        "mobile_number",
+        "email",
+        "address",
+    )
+
     @property
     def get_full_name(self):
         """
@@ -41,23 +77,4 @@ class Customer(BaseModel, models.Model):
         Returns:
             str: Full name of the customer.
         """
-        return f"{self.first_name} {self.last_name}".title()
-
-    def to_dict(self):
-        """
-        Convert the Customer instance to a dictionary representation.
-
-        Returns:
-            dict: Dictionary representation of the Customer instance.
-        """
-        return {
-            "customer_id": self.customer_id,
-            "customer_type": self.customer_type,
-            "company_name": self.company_name,
-            "first_name": self.first_name,
-            "last_name": self.last_name,
-            "full_name": self.get_full_name,
-            "mobile_number": self.mobile_number,
-            "email": self.email,
-            "address": self.address,
-        }
+        return get_full_name(self.first_name, self.last_name)
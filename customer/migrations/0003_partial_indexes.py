@@ -0,0 +1,29 @@
+# Generated by Django 5.2.3 on 2026-10-18 07:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customer', '0002_customer_company_name_customer_customer_type_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='customer',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['created_dtm', 'customer_id'], name='customer_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='customer',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['customer_type'], name='customer_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='customer',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['first_name', 'last_name'], name='customer_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='customer',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['company_name'], name='customer_company_name_idx'),
+        ),
+    ]
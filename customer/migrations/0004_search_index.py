@@ -0,0 +1,17 @@
+from django.db import migrations
+
+from base.search.operations import create_trigram_extension, create_search_index
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("customer", "0003_partial_indexes"),
+    ]
+
+    operations = [
+        create_trigram_extension(),
+        *create_search_index(
+            "customer", "customer_id", ["company_name", "first_name", "last_name", "email"]
+        ),
+    ]
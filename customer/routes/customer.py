@@ -1,5 +1,6 @@
 from django.urls import path
 
+from base.views import ExportView
 from customer.views import CustomerViewSet
 
 urlpatterns = [
@@ -8,6 +9,11 @@ urlpatterns = [
         CustomerViewSet.as_view(CustomerViewSet.get_method_view_mapping()),
         name="customer",
     ),
+    path(
+        "customer/export",
+        CustomerViewSet.as_view(ExportView.get_method_view_mapping()),
+        name="customer-export",
+    ),
     path(
         "customer/<str:customer_id>",
         CustomerViewSet.as_view(CustomerViewSet.get_method_view_mapping(True)),
@@ -9,7 +9,7 @@ from drf_spectacular.utils import extend_schema
 
 from authentication import get_authentication_classes
 
-from base.views import BaseView
+from base.views import BaseView, ExportView
 from utils.swagger import (
     responses_400,
     responses_404,
@@ -17,6 +17,8 @@ from utils.swagger import (
     responses_400_example,
     responses_404_example,
     responses_401_example,
+    responses_export,
+    export_parameters,
 )
 
 from ..db_access.customer import customer_manager
@@ -35,7 +37,7 @@ from ..serializers.query import CustomerQuerySerializer
 MODULE_NAME = "Customer"
 
 
-class CustomerViewSet(BaseView, viewsets.ViewSet):
+class CustomerViewSet(BaseView, ExportView, viewsets.ViewSet):
     """
     ViewSet for handling customer endpoints.
     """
@@ -45,6 +47,7 @@ class CustomerViewSet(BaseView, viewsets.ViewSet):
     serializer_class = CustomerSerializer
     list_serializer_class = CustomerQuerySerializer
     lookup_field = "customer_id"
+    export_name = "customers"
     search_fields = [
         "customer_type",
         "company_name",
@@ -52,6 +55,7 @@ class CustomerViewSet(BaseView, viewsets.ViewSet):
         "last_name",
         "email",
     ]
+    text_search_fields = ["company_name", "first_name", "last_name", "email"]
 
     @extend_schema(
         responses={201: CustomerResponseSerializer, **responses_400, **responses_401},
@@ -84,6 +88,16 @@ class CustomerViewSet(BaseView, viewsets.ViewSet):
         """List all customers."""
         return super().list_all(request, *args, **kwargs)
 
+    @extend_schema(
+        parameters=export_parameters,
+        responses={**responses_export, **responses_400, **responses_401},
+        examples=[responses_400_example, responses_401_example],
+        tags=[MODULE_NAME],
+    )
+    def export(self, request, *args, **kwargs):
+        """Export the customers matching the list filters as NDJSON or CSV."""
+        return super().export(request, *args, **kwargs)
+
     @extend_schema(
         responses={200: CustomerResponseSerializer, **responses_404, **responses_401},
         examples=[
@@ -1,13 +1,19 @@
+from decimal import Decimal
+
+from django.db import transaction
 from django.dispatch import receiver
 from django.db.models.signals import post_save
+from django.db.models import Q, F, Sum, Count, Value, DecimalField
+from django.db.models.functions import Coalesce
 
 from base.db_access import manager
+from utils.exceptions import PreconditionFailedError
 from notification.constants import NotificationTypes
 from notification.helper import Notification
-
+from payment.db_access import customer_balance_manager
 
 from ..db_models.invoice import Invoice
-from ..constants import InvoiceNotificationMessages
+from ..constants import InvoiceNotificationMessages, InvoiceStatusChoices
 
 
 class InvoiceManager(manager.Manager[Invoice]):
@@ -16,12 +22,206 @@ class InvoiceManager(manager.Manager[Invoice]):
     """
 
     model = Invoice
+    balance_fields: tuple = ("customer_id", "total", "status")
+    max_update_retries: int = 3
+
+    @staticmethod
+    def get_balance_delta(invoices, sign: int = 1) -> dict:
+        """
+        Return the customer balance delta of adding (sign=1) or removing (sign=-1) invoices.
+        Args:
+            invoices (iterable): `(customer_id, total, status)` rows of the invoices.
+            sign (int, optional): 1 for added invoices, -1 for removed ones. Defaults to 1.
+        Returns:
+            dict: `{customer_id: {"invoice_count": ..., "total_amount": ..., "paid_amount": ...}}`
+        """
+        deltas = []
+
+        for customer_id, total, status in invoices:
+            total = Decimal(str(total)) * sign
+            paid = total if status == InvoiceStatusChoices.PAID else Decimal(0)
+
+            deltas.append(
+                {
+                    customer_id: {
+                        "invoice_count": sign,
+                        "total_amount": total,
+                        "paid_amount": paid,
+                    }
+                }
+            )
+
+        return customer_balance_manager.merge_deltas(*deltas)
+
+    def create(self, data, many=False, batch_size=None):
+        """
+        Create the invoice(s) and add them to the customer balances in the same transaction.
+        """
+        with transaction.atomic(savepoint=False):
+            objs = super().create(data, many=many, batch_size=batch_size)
+
+            customer_balance_manager.apply_deltas(
+                self.get_balance_delta(
+                    (obj.customer_id, obj.total, obj.status)
+                    for obj in (objs if many else [objs])
+                )
+            )
+
+        return objs
+
+    def update(
+        self, data, query, instance=None, expected_updated_dtm=None
+    ) -> Invoice | None:
+        """
+        Update the invoice and move the difference into the customer balances.
+        Instead of locking the row, the update is made conditional on the `updated_dtm` the
+        previous amounts were read at (compare-and-swap), so a delta is never computed from stale
+        amounts. A lost race re-reads the invoice and retries, unless the caller asked for a
+        specific version with `expected_updated_dtm`.
+        Raises:
+            PreconditionFailedError: If the invoice kept changing during `max_update_retries` attempts.
+        """
+        for _ in range(self.max_update_retries):
+            before = instance or self.get(query=dict(query))
+            if not before:
+                return None
+
+            with transaction.atomic(savepoint=False):
+                obj = super().update(
+                    data,
+                    query,
+                    instance=before,
+                    expected_updated_dtm=expected_updated_dtm or before.updated_dtm,
+                )
+
+                if obj:
+                    customer_balance_manager.apply_deltas(
+                        customer_balance_manager.merge_deltas(
+                            self.get_balance_delta(
+                                [(before.customer_id, before.total, before.status)],
+                                sign=-1,
+                            ),
+                            self.get_balance_delta([(obj.customer_id, obj.total, obj.status)]),
+                        )
+                    )
+                    return obj
+
+            if expected_updated_dtm:
+                return None
+
+            instance = None
+
+        raise PreconditionFailedError()
+
+    def upsert(self, data, query) -> Invoice:
+        """
+        Update the invoice if it exists or create it, keeping the customer balances in sync.
+        """
+        if self.exists(query=dict(query)):
+            return self.update(data, query)
+        return self.create(data)
+
+    def bulk_upsert(self, rows, unique_fields, update_fields=None, batch_size=None):
+        """
+        Upsert the invoices and move the difference into the customer balances.
+        The existing rows are locked before the upsert and read back after it, so the delta
+        is exact whichever fields are updated.
+        """
+        if not rows:
+            return []
+
+        unique_fields = [self.model._meta.get_field(name).attname for name in unique_fields]
+
+        if len(unique_fields) == 1:
+            name = unique_fields[0]
+            conflicts = {f"{name}__in": [row[name] for row in rows if name in row]}
+        else:
+            conflicts = {"OR": [{name: row[name] for name in unique_fields} for row in rows]}
+
+        with transaction.atomic(savepoint=False):
+            before = list(
+                self.list(query=conflicts)
+                .select_for_update()
+                .values_list(*self.balance_fields)
+            )
+
+            objs = super().bulk_upsert(
+                rows,
+                unique_fields=unique_fields,
+                update_fields=update_fields,
+                batch_size=batch_size,
+            )
+
+            after = self.list(query={"pk__in": [obj.pk for obj in objs]}).values_list(
+                *self.balance_fields
+            )
+
+            customer_balance_manager.apply_deltas(
+                customer_balance_manager.merge_deltas(
+                    self.get_balance_delta(before, sign=-1),
+                    self.get_balance_delta(after),
+                )
+            )
+
+        return objs
+
+    def delete(self, query=None, data=None, soft_delete=True, force_delete=False):
+        """
+        Delete the invoices and remove them from the customer balances in the same transaction.
+        """
+        with transaction.atomic(savepoint=False):
+            removed = list(
+                self.list(query=query).select_for_update().values_list(*self.balance_fields)
+            )
+
+            result = super().delete(
+                query=query,
+                data=data,
+                soft_delete=soft_delete,
+                force_delete=force_delete,
+            )
+
+            customer_balance_manager.apply_deltas(
+                self.get_balance_delta(removed, sign=-1)
+            )
+
+        return result
+
+    @staticmethod
+    def get_payment_summary_annotations(prefix: str = "") -> dict:
+        """
+        Return the conditional aggregations used for payment summaries.
+        Soft-deleted invoices are excluded from every amount.
+        Args:
+            prefix (str, optional): Lookup prefix to reach the invoice from the annotated model,
+                e.g. `invoice__` when annotating customers. Defaults to "" for invoice querysets.
+        Returns:
+            dict: `invoice_count`, `total_amount`, `paid_amount` and `pending_amount` expressions.
+        """
+        amount_field = DecimalField(max_digits=14, decimal_places=2)
+        zero = Value(Decimal("0.00"), output_field=amount_field)
+
+        active = Q(**{f"{prefix}is_deleted": False}) if prefix else Q()
+        paid = active & Q(**{f"{prefix}status": InvoiceStatusChoices.PAID})
+
+        return {
+            "invoice_count": Count(f"{prefix}pk", filter=active),
+            "total_amount": Coalesce(
+                Sum(f"{prefix}total", filter=active), zero, output_field=amount_field
+            ),
+            "paid_amount": Coalesce(
+                Sum(f"{prefix}total", filter=paid), zero, output_field=amount_field
+            ),
+            "pending_amount": F("total_amount") - F("paid_amount"),
+        }
 
 
 @receiver(post_save, sender=Invoice)
 def send_notification_on_invoice_movement(sender, instance: Invoice, created, **__):
     """
-    Signal receiver that sends a notification when a Invoice instance is created.
+    Signal receiver that enqueues a notification when a Invoice instance is created.
+    The outbox row is written in the transaction of the invoice, the notification is
+    sent by the `process_notification_outbox` worker.
     """
     if not created:
         return
@@ -39,7 +239,7 @@ def send_notification_on_invoice_movement(sender, instance: Invoice, created, **
         InvoiceNotificationMessages.MESSAGE,
         NotificationTypes.INVOICE,
         notification_data,
-    ).send_notification([created_by])
+    ).enqueue([created_by])
 
 
 invoice_manager = InvoiceManager()
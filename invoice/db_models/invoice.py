@@ -1,5 +1,6 @@
 from django.db import models
 from base.db_models.model import BaseModel
+from base.serialization import Field, Serialization
 
 from utils.functions import get_uuid
 
@@ -24,17 +25,43 @@ class Invoice(BaseModel, models.Model):
     
     class Meta:
         db_table = "invoice"
+        indexes = [
+            models.Index(
+                fields=["created_dtm", "invoice_id"],
+                name="invoice_created_idx",
+                condition=models.Q(is_deleted=False),
+            ),
+            models.Index(
+                fields=["customer_id", "status"],
+                name="invoice_customer_status_idx",
+                condition=models.Q(is_deleted=False),
+            ),
+            models.Index(
+                fields=["vehicle_id", "status"],
+                name="invoice_vehicle_status_idx",
+                condition=models.Q(is_deleted=False),
+            ),
+            models.Index(
+                fields=["date"],
+                name="invoice_date_idx",
+                condition=models.Q(is_deleted=False),
+            ),
+            models.Index(
+                fields=["status", "date"],
+                name="invoice_status_date_idx",
+                condition=models.Q(is_deleted=False),
+            ),
+        ]
 
-    def to_dict(self):
-        return {
-            "invoice_id": self.invoice_id,
-            "customer": self.customer.customer_id,
-            "vehicle": self.vehicle.vehicle_id,
-            "date": self.date,
-            "loading_address": self.loading_address,
-            "delivery_address": self.delivery_address,
-            "weight": float(self.weight),
-            "rate": float(self.rate),
-            "total": float(self.total),
-            "status": self.status,
-        }
+    serialization = Serialization(
+        "invoice_id",
+        Field("customer", "customer_id"),
+        Field("vehicle", "vehicle_id"),
+        "date",
+        "loading_address",
+        "delivery_address",
+        Field("weight", transform=float),
+        Field("rate", transform=float),
+        Field("total", transform=float),
+        "status",
+    )
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.3 on 2026-10-18 07:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customer', '0003_partial_indexes'),
+        ('invoice', '0001_initial'),
+        ('vehicle', '0002_partial_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='invoice',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['created_dtm', 'invoice_id'], name='invoice_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='invoice',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['customer_id', 'status'], name='invoice_customer_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='invoice',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['vehicle_id', 'status'], name='invoice_vehicle_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='invoice',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['date'], name='invoice_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='invoice',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['status', 'date'], name='invoice_status_date_idx'),
+        ),
+    ]
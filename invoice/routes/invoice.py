@@ -1,5 +1,6 @@
 from django.urls import path
 
+from base.views import ExportView
 from invoice.views import InvoiceViewSet
 
 urlpatterns = [
@@ -8,6 +9,11 @@ urlpatterns = [
         InvoiceViewSet.as_view(InvoiceViewSet.get_method_view_mapping()),
         name="invoice",
     ),
+    path(
+        "invoice/export",
+        InvoiceViewSet.as_view(ExportView.get_method_view_mapping()),
+        name="invoice-export",
+    ),
     path(
         "invoice/<str:invoice_id>",
         InvoiceViewSet.as_view(InvoiceViewSet.get_method_view_mapping(True)),
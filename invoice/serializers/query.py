@@ -12,6 +12,8 @@ class InvoiceQuerySerializer(QuerySerializer):
     """
 
     date = serializers.DateField()
+    date_from = serializers.DateField(help_text="Invoices dated on or after this date.")
+    date_to = serializers.DateField(help_text="Invoices dated on or before this date.")
     status = serializers.ChoiceField(
         choices=InvoiceStatusChoices.choices,
     )
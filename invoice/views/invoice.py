@@ -9,7 +9,10 @@ from drf_spectacular.utils import extend_schema
 
 from authentication import get_authentication_classes
 
-from base.views import BaseView
+from base.views import BaseView, ExportView
+from base.serialization import Nested
+from customer.db_models import Customer
+from vehicle.db_models import Vehicle
 from utils.swagger import (
     responses_400,
     responses_404,
@@ -17,8 +20,11 @@ from utils.swagger import (
     responses_400_example,
     responses_404_example,
     responses_401_example,
+    responses_export,
+    export_parameters,
 )
 
+from ..db_models import Invoice
 from ..db_access.invoice import invoice_manager
 from ..serializers import (
     InvoiceSerializer,
@@ -32,13 +38,10 @@ from ..serializers import (
 )
 from ..serializers.query import InvoiceQuerySerializer
 
-from customer.db_access import customer_manager
-from vehicle.db_access import vehicle_manager
-
 MODULE_NAME = "Invoice"
 
 
-class InvoiceViewSet(BaseView, viewsets.ViewSet):
+class InvoiceViewSet(BaseView, ExportView, viewsets.ViewSet):
     """
     ViewSet for handling invoice endpoints.
     """
@@ -48,6 +51,20 @@ class InvoiceViewSet(BaseView, viewsets.ViewSet):
     serializer_class = InvoiceSerializer
     list_serializer_class = InvoiceQuerySerializer
     lookup_field = "invoice_id"
+    export_name = "invoices"
+    list_select_related = ["customer", "vehicle"]
+    # The customer and vehicle columns are joined in the list query, and the invoices are
+    # serialized with them from the fetched rows.
+    list_serialization = Invoice.serialization.replace(
+        Nested("customer", Customer.serialization),
+        Nested("vehicle", Vehicle.serialization),
+    )
+    # With `?include=customer,vehicle` the invoices hold the ids, and each customer and
+    # vehicle of the page is serialized once in the `included` section.
+    list_includes = [
+        Nested("customer", Customer.serialization),
+        Nested("vehicle", Vehicle.serialization),
+    ]
     search_fields = [
         "date",
         "status",
@@ -59,6 +76,14 @@ class InvoiceViewSet(BaseView, viewsets.ViewSet):
         "vehicle_type",
         "vehicle_number",
     ]
+    text_search_fields = [
+        "customer__company_name",
+        "customer__first_name",
+        "customer__last_name",
+        "vehicle__vehicle_name",
+        "vehicle__vehicle_type",
+        "vehicle__vehicle_number",
+    ]
 
     def get_list_query_object(self, query=None, **_):
         """
@@ -66,6 +91,14 @@ class InvoiceViewSet(BaseView, viewsets.ViewSet):
         """
         query_obj = {}
 
+        date_from = query.pop("date_from", None)
+        if date_from:
+            query_obj["date__gte"] = date_from
+
+        date_to = query.pop("date_to", None)
+        if date_to:
+            query_obj["date__lte"] = date_to
+
         company_type = query.pop("company_type", None)
         if company_type:
             query_obj["customer__company_type__icontains"] = company_type
@@ -122,6 +155,16 @@ class InvoiceViewSet(BaseView, viewsets.ViewSet):
         """List all invoices."""
         return super().list_all(request, *args, **kwargs)
 
+    @extend_schema(
+        parameters=export_parameters,
+        responses={**responses_export, **responses_400, **responses_401},
+        examples=[responses_400_example, responses_401_example],
+        tags=[MODULE_NAME],
+    )
+    def export(self, request, *args, **kwargs):
+        """Export the invoices matching the list filters as NDJSON or CSV."""
+        return super().export(request, *args, **kwargs)
+
     @extend_schema(
         responses={200: InvoiceResponseSerializer, **responses_404, **responses_401},
         examples=[
@@ -160,28 +203,3 @@ class InvoiceViewSet(BaseView, viewsets.ViewSet):
     def destroy(self, request, *args, **kwargs):
         """Delete an invoice."""
         return super().destroy(request, *args, **kwargs)
-
-    def get_list(self, objects, request=None):
-        """
-        Convert a list of invoice objects to a list of dictionaries with
-        additional customer and vehicle information.
-        """
-        customer_ids = [obj.customer_id for obj in objects]
-        vehicle_ids = [obj.vehicle_id for obj in objects]
-
-        customers_map = customer_manager.get_objects_mapping(
-            query={"customer_id__in": customer_ids}, mapping_by="customer_id"
-        )
-        vehicles_map = vehicle_manager.get_objects_mapping(
-            query={"vehicle_id__in": vehicle_ids}, mapping_by="vehicle_id"
-        )
-
-        data_list = []
-
-        for obj in objects:
-            obj_dict = obj.to_dict()
-            obj_dict["vehicle"] = vehicles_map[obj.vehicle_id].to_dict()
-            obj_dict["customer"] = customers_map[obj.customer_id].to_dict()
-            data_list.append(obj_dict)
-
-        return data_list
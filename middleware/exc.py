@@ -23,6 +23,7 @@ from utils.exceptions import (
     ValidationError,
     BadRequestError,
     PermissionDenied,
+    PreconditionFailedError,
 )
 
 from authentication.exception import UnauthorizedException, WrongCredentialsException
@@ -65,7 +66,10 @@ class DRFExceptionMiddleware(MiddlewareMixin):
                 errors=format_serializer_errors(exception.message),
             )
 
-        if isinstance(exception, (NoDataFoundError, BadRequestError, PermissionDenied)):
+        if isinstance(
+            exception,
+            (NoDataFoundError, BadRequestError, PermissionDenied, PreconditionFailedError),
+        ):
             return generate_response(
                 create_json_response=True,
                 status_code=exception.status_code,
@@ -0,0 +1,21 @@
+"""
+This module activates the identity map of the managers for the duration of each request.
+"""
+
+# Local imports
+from base.db_access.identity_map import IdentityMap
+
+
+class IdentityMapMiddleware:
+    __doc__ = """
+        This Middleware activates a new `IdentityMap` for each request, so that the rows read by
+        `Manager.get` and the results of `Manager.exists` are reused within the request.
+        The map is dropped with the request, the rows are never shared between requests.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with IdentityMap().activate():
+            return self.get_response(request)
@@ -1,5 +1,5 @@
 """
-This module adds the Performance time and System version in the response headers.
+This module adds the Performance time, the Server-Timing and System version in the response headers.
 """
 
 # Standard Library Imports
@@ -9,12 +9,17 @@ from timeit import default_timer as timer
 from django.utils import timezone
 
 # Local imports
+from utils import settings
+from utils.timing import RequestTimer, request_timer
+from utils.logger import log_msg, logging
 from utils.version import get_version_str
 
 
 class AddResponseHeadersMiddleware:
     __doc__ = """
-        This Middleware adds the Performance time and System version in the response headers.
+        This Middleware adds the Performance time, the Server-Timing and System version in the response headers.
+        The Server-Timing header splits the request time in the `db`, `serialize` and `app` phases, the
+        requests slower than `SLOW_REQUEST_THRESHOLD_MS` are logged with their SQL statements.
     """
 
     def __init__(self, get_response):
@@ -23,10 +28,13 @@ class AddResponseHeadersMiddleware:
     def __call__(self, request):
         """
         This method is called for each request.
-        And it adds the Performance time and System version in the response headers.
+        And it adds the Performance time, the Server-Timing and System version in the response headers.
         """
+        recorder = RequestTimer(max_statements=settings.read("SLOW_REQUEST_MAX_LOGGED_QUERIES"))
+
         start = timer()
-        response = self.get_response(request)
+        with recorder.record():
+            response = self.get_response(request)
         end = timer()
 
         _timedelta = timezone.timedelta(seconds=end - start)
@@ -35,4 +43,37 @@ class AddResponseHeadersMiddleware:
         response["Req-Performance-Time"] = str(_timedelta) + str(
             f"[HH:MM:SS:MS] | {_timedelta.total_seconds() * 1000}[MS]"
         )
+        response["Server-Timing"] = recorder.get_server_timing(end - start)
+
+        if (end - start) * 1000 >= settings.read("SLOW_REQUEST_THRESHOLD_MS"):
+            self.log_slow_request(request, recorder, end - start)
+
         return response
+
+    def process_template_response(self, request, response):
+        """
+        Time the rendering of the response as the `serialize` phase.
+        """
+        recorder = request_timer.get()
+        if recorder is not None:
+            recorder.begin("serialize")
+            response.add_post_render_callback(lambda _: recorder.end("serialize"))
+
+        return response
+
+    @staticmethod
+    def log_slow_request(request, recorder: RequestTimer, total: float):
+        """
+        Log the request with its statements in execution order, without their params.
+        """
+        statements = [f"{duration * 1000:.2f}ms {sql}" for sql, duration in recorder.statements]
+        if recorder.query_count > len(statements):
+            statements.append(f"... {recorder.query_count - len(statements)} more queries")
+
+        log_msg(
+            logging.WARNING,
+            f"Slow request {request.method} {request.path}: {total * 1000:.2f}ms, "
+            f"{recorder.query_count} queries in {recorder.db_time * 1000:.2f}ms, "
+            f"slowest {recorder.slowest[1] * 1000 if recorder.slowest else 0:.2f}ms.",
+            *statements,
+        )
@@ -12,3 +12,13 @@ class NotificationTypes(models.TextChoices):
 
     INVOICE = "INVOICE", "Invoice"
     PAYMENT = "PAYMENT", "Payment"
+
+
+class OutboxStatus(models.TextChoices):
+    """
+    Enum for the statuses of the notification outbox rows.
+    """
+
+    PENDING = "PENDING", "Pending"
+    SENT = "SENT", "Sent"
+    FAILED = "FAILED", "Failed"
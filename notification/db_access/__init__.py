@@ -5,5 +5,10 @@ It imports the NotificationManager class from the notification module.
 
 from .notification import notification_manager
 from .user_notification import user_notification_manager
+from .notification_outbox import notification_outbox_manager
 
-__all__ = ["notification_manager", "user_notification_manager"]
+__all__ = [
+    "notification_manager",
+    "user_notification_manager",
+    "notification_outbox_manager",
+]
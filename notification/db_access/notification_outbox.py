@@ -0,0 +1,151 @@
+"""
+Notification Outbox manager module.
+This module contains the NotificationOutboxManager class, which is responsible
+for enqueuing the notifications and delivering them in batches.
+"""
+
+from django.db import transaction
+from django.utils import timezone
+
+from utils import settings
+from utils.logger import log_msg, logging
+from utils.functions import get_current_datetime
+from base.db_access import manager
+
+from ..constants import OutboxStatus
+from ..db_models import NotificationOutbox, Notification, UserNotification
+
+
+class NotificationOutboxManager(manager.Manager[NotificationOutbox]):
+    """
+    Manager class for the NotificationOutbox model.
+    """
+
+    model = NotificationOutbox
+    check_is_deleted: bool = False
+
+    def enqueue(
+        self,
+        title: str,
+        message: str,
+        notification_type: str,
+        notification_data: dict,
+        user_ids: list,
+    ) -> NotificationOutbox:
+        """
+        Write a notification to the outbox, in the transaction of the caller.
+        """
+        return self.create(
+            data={
+                "title": title,
+                "message": message,
+                "notification_type_id": notification_type,
+                "notification_data": notification_data,
+                "user_ids": user_ids,
+            }
+        )
+
+    def claim(self, batch_size: int) -> list:
+        """
+        Lock and return the pending rows due for delivery, oldest first.
+        Must run in a transaction: the rows locked by another worker are skipped, on
+        databases without `SELECT ... FOR UPDATE` (SQLite) the writes are serialized instead.
+        """
+        return list(
+            self.model.objects.select_for_update(skip_locked=True)
+            .filter(status=OutboxStatus.PENDING, available_dtm__lte=get_current_datetime())
+            .order_by("available_dtm")[:batch_size]
+        )
+
+    def deliver(self, rows: list):
+        """
+        Create the notifications of the rows with one insert per table and mark them as sent.
+        The notifications take the id of their outbox row.
+        """
+        notifications = []
+        user_notifications = []
+
+        for row in rows:
+            notifications.append(
+                Notification(
+                    notification_id=row.outbox_id,
+                    title=row.title,
+                    message=row.message,
+                    notification_type_id=row.notification_type_id,
+                    notification_data=row.notification_data,
+                )
+            )
+            user_notifications.extend(
+                UserNotification(user_id=user_id, notification_id=row.outbox_id)
+                for user_id in row.user_ids
+            )
+
+        Notification.objects.bulk_create(notifications)
+        UserNotification.objects.bulk_create(user_notifications)
+
+        self.model.objects.filter(pk__in=[row.pk for row in rows]).update(
+            status=OutboxStatus.SENT, processed_dtm=get_current_datetime()
+        )
+
+    def retry(self, rows: list, error: Exception, max_attempts: int):
+        """
+        Schedule the rows again with an exponential backoff, or mark them as failed
+        once they reached the maximum number of attempts.
+        """
+        now = get_current_datetime()
+        base_delay = settings.read("NOTIFICATION_OUTBOX_RETRY_DELAY")
+        max_delay = settings.read("NOTIFICATION_OUTBOX_RETRY_MAX_DELAY")
+
+        for row in rows:
+            row.attempts += 1
+            row.last_error = repr(error)
+            row.available_dtm = now + timezone.timedelta(
+                seconds=min(base_delay * 2 ** (row.attempts - 1), max_delay)
+            )
+            if row.attempts >= max_attempts:
+                row.status = OutboxStatus.FAILED
+                row.processed_dtm = now
+
+        self.model.objects.bulk_update(
+            rows, ["attempts", "last_error", "available_dtm", "status", "processed_dtm"]
+        )
+
+    def process_batch(self, batch_size: int, max_attempts: int) -> tuple:
+        """
+        Claim a batch of rows and deliver it. If the batch fails, its rows are delivered
+        one by one so that only the failing ones are retried.
+        Returns:
+            tuple: The number of rows claimed, sent and failed.
+        """
+        with transaction.atomic():
+            rows = self.claim(batch_size)
+            if not rows:
+                return 0, 0, 0
+
+            try:
+                with transaction.atomic():
+                    self.deliver(rows)
+                return len(rows), len(rows), 0
+            except Exception:
+                log_msg(
+                    logging.WARNING,
+                    f"Failed to deliver a batch of {len(rows)} notifications, "
+                    "delivering them one by one.",
+                )
+
+            failed = 0
+            for row in rows:
+                try:
+                    with transaction.atomic():
+                        self.deliver([row])
+                except Exception as exc:
+                    log_msg(
+                        logging.ERROR, f"Failed to deliver the notification {row.pk}: {exc!r}"
+                    )
+                    self.retry([row], exc, max_attempts)
+                    failed += 1
+
+            return len(rows), len(rows) - failed, failed
+
+
+notification_outbox_manager = NotificationOutboxManager()
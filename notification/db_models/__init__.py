@@ -5,5 +5,6 @@ It imports the Notification model from the notification module.
 
 from .notification import Notification
 from .user_notification import UserNotification
+from .notification_outbox import NotificationOutbox
 
-__all__ = ["Notification", "UserNotification"]
+__all__ = ["Notification", "UserNotification", "NotificationOutbox"]
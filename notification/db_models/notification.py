@@ -6,6 +6,7 @@ from django.db import models
 
 from utils.functions import get_uuid
 from base.db_models.model import BaseModel
+from base.serialization import Field, Serialization
 
 
 from ..constants import NotificationTypes
@@ -30,19 +31,22 @@ class Notification(BaseModel):
     class Meta:
         """
         db_table (str): Specifies the database table name for the model.
+        indexes (list): Partial indexes on the rows which are not soft deleted.
         """
 
         db_table = "notification"
-
-    def to_dict(self):
-        """
-        Converts the notification instance to a dictionary representation.
-        """
-
-        return {
-            "title": self.title,
-            "message": self.message,
-            "notification_id": self.notification_id,
-            "notification_data": self.notification_data,
-            "notification_type": self.notification_type_id,
-        }
+        indexes = [
+            models.Index(
+                fields=["created_dtm", "notification_id"],
+                name="notification_created_idx",
+                condition=models.Q(is_deleted=False),
+            ),
+        ]
+
+    serialization = Serialization(
+        "title",
+        "message",
+        "notification_id",
+        "notification_data",
+        Field("notification_type", "notification_type_id"),
+    )
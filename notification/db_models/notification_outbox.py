@@ -0,0 +1,65 @@
+"""
+Notification outbox model.
+Notifications are written to the outbox in the transaction of the change that triggers
+them, and delivered in batches by the `process_notification_outbox` worker.
+"""
+
+from django.db import models
+
+from utils.functions import get_uuid, get_current_datetime
+
+from ..constants import NotificationTypes, OutboxStatus
+
+
+class NotificationOutbox(models.Model):
+    """
+    Model to save a notification waiting to be sent to its users.
+    """
+
+    outbox_id = models.CharField(primary_key=True, default=get_uuid, max_length=128)
+
+    title = models.TextField(null=True, blank=True)
+    message = models.TextField(null=True, blank=True)
+    notification_data = models.JSONField(null=True, blank=True)
+    notification_type_id = models.CharField(
+        max_length=64, choices=NotificationTypes.choices
+    )
+    user_ids = models.JSONField(default=list)
+
+    status = models.CharField(
+        max_length=16, choices=OutboxStatus.choices, default=OutboxStatus.PENDING
+    )
+    attempts = models.IntegerField(default=0)
+    available_dtm = models.DateTimeField(default=get_current_datetime)
+    last_error = models.TextField(null=True, blank=True)
+    created_dtm = models.DateTimeField(auto_now_add=True)
+    processed_dtm = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        """
+        db_table (str): Specifies the database table name for the model.
+        indexes (list): Index used by the worker to claim the rows due for delivery.
+        """
+
+        db_table = "notification_outbox"
+        indexes = [
+            models.Index(
+                fields=["status", "available_dtm"], name="notification_outbox_due_idx"
+            ),
+        ]
+
+    def to_dict(self):
+        """
+        Converts the notification outbox instance to a dictionary representation.
+        """
+
+        return {
+            "outbox_id": self.outbox_id,
+            "title": self.title,
+            "message": self.message,
+            "notification_data": self.notification_data,
+            "notification_type": self.notification_type_id,
+            "user_ids": self.user_ids,
+            "status": self.status,
+            "attempts": self.attempts,
+        }
@@ -2,6 +2,7 @@ from django.db import models
 
 from utils.functions import get_uuid
 from base.db_models.model import BaseModel
+from base.serialization import Serialization
 
 
 class UserNotification(BaseModel, models.Model):
@@ -24,17 +25,21 @@ class UserNotification(BaseModel, models.Model):
     class Meta:
         """
         db_table (str): Specifies the database table name for the model.
+        indexes (list): Partial index listing the unread notifications of a user in order.
         """
 
         db_table = "user_notification_mapping"
-
-    def to_dict(self):
-        """
-        Converts the UserNotifications instance to a dictionary representation.
-        """
-        return {
-            "user_id": self.user_id,
-            "is_read": self.is_read,
-            "notification_id": self.notification_id,
-            "user_notification_id": self.user_notification_id,
-        }
+        indexes = [
+            models.Index(
+                fields=["user_id", "created_dtm", "user_notification_id"],
+                name="user_notification_unread_idx",
+                condition=models.Q(is_deleted=False, is_read=False),
+            ),
+        ]
+
+    serialization = Serialization(
+        "user_id",
+        "is_read",
+        "notification_id",
+        "user_notification_id",
+    )
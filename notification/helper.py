@@ -1,4 +1,8 @@
-from .db_access import notification_manager, user_notification_manager
+from .db_access import (
+    notification_manager,
+    user_notification_manager,
+    notification_outbox_manager,
+)
 
 
 class Notification:
@@ -49,3 +53,25 @@ class Notification:
         )
 
         return True
+
+    def enqueue(self, user_ids: str | list[str]):
+        """
+        Write the notification to the outbox in the current transaction, it is sent
+        to the users by the `process_notification_outbox` worker once committed.
+        """
+
+        if not user_ids:
+            return False
+
+        if isinstance(user_ids, str):
+            user_ids = [user_ids]
+
+        notification_outbox_manager.enqueue(
+            self.title,
+            self.message,
+            self.notification_type,
+            self.notification_data,
+            user_ids,
+        )
+
+        return True
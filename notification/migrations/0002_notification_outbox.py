@@ -0,0 +1,35 @@
+# Generated by Django 5.2.3 on 2026-10-18 07:07
+
+import utils.functions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notification', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationOutbox',
+            fields=[
+                ('outbox_id', models.CharField(default=utils.functions.get_uuid, max_length=128, primary_key=True, serialize=False)),
+                ('title', models.TextField(blank=True, null=True)),
+                ('message', models.TextField(blank=True, null=True)),
+                ('notification_data', models.JSONField(blank=True, null=True)),
+                ('notification_type_id', models.CharField(choices=[('INVOICE', 'Invoice'), ('PAYMENT', 'Payment')], max_length=64)),
+                ('user_ids', models.JSONField(default=list)),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('SENT', 'Sent'), ('FAILED', 'Failed')], default='PENDING', max_length=16)),
+                ('attempts', models.IntegerField(default=0)),
+                ('available_dtm', models.DateTimeField(default=utils.functions.get_current_datetime)),
+                ('last_error', models.TextField(blank=True, null=True)),
+                ('created_dtm', models.DateTimeField(auto_now_add=True)),
+                ('processed_dtm', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'notification_outbox',
+                'indexes': [models.Index(fields=['status', 'available_dtm'], name='notification_outbox_due_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.3 on 2026-10-18 07:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notification', '0002_notification_outbox'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['created_dtm', 'notification_id'], name='notification_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='usernotification',
+            index=models.Index(condition=models.Q(('is_deleted', False), ('is_read', False)), fields=['user_id', 'created_dtm', 'user_notification_id'], name='user_notification_unread_idx'),
+        ),
+    ]
@@ -8,6 +8,7 @@ from rest_framework import viewsets, status
 from drf_spectacular.utils import extend_schema
 
 from base.views.base import UpdateView, ListView
+from base.serialization import Nested, Serialization
 from authentication import get_authentication_classes
 from utils.constants import MethodEnum
 from utils.response import generate_response
@@ -28,7 +29,8 @@ from ..serializers import (
     mark_as_read_success_example,
     mark_as_read_warning_example,
 )
-from ..db_access import user_notification_manager, notification_manager
+from ..db_models import Notification
+from ..db_access import user_notification_manager
 
 MODULE = "Notification"
 
@@ -41,6 +43,8 @@ class NotificationViewSet(UpdateView, ListView, viewsets.ViewSet):
     authentication_classes = get_authentication_classes()
     serializer_class = MarkAsReadRequestSerializer
     manager = user_notification_manager
+    list_select_related = ["notification"]
+    list_serialization = Serialization(Nested("notification", Notification.serialization))
 
     @classmethod
     def get_method_view_mapping(cls):
@@ -53,8 +57,13 @@ class NotificationViewSet(UpdateView, ListView, viewsets.ViewSet):
         """
         Override the method to return the query object for listing notifications.
         This method is used to filter notifications based on user_id.
+        The soft-deleted notifications are not listed.
         """
-        return {"user_id": request.user.user_id, "is_read": False}
+        return {
+            "user_id": request.user.user_id,
+            "is_read": False,
+            "notification__is_deleted": False,
+        }
 
     @extend_schema(
         responses={
@@ -72,25 +81,6 @@ class NotificationViewSet(UpdateView, ListView, viewsets.ViewSet):
     def list_all(self, request, *args, **kwargs):
         return super().list_all(request, *args, **kwargs)
 
-    def get_list(self, objects, **_):
-        notification_ids = []
-        for obj in objects:
-            notification_ids.append(obj.notification_id)
-
-        notification_data = notification_manager.get_objects_mapping(
-            query={"notification_id__in": notification_ids},
-            mapping_by="notification_id",
-        )
-
-        data_list = []
-
-        for obj in objects:
-            data_dict = {}
-            data_dict["notification"] = notification_data[obj.notification_id].to_dict()
-            data_list.append(data_dict)
-
-        return data_list
-
     @extend_schema(
         responses={
             200: MarkAsReadResponseSerializer,
@@ -0,0 +1,7 @@
+"""
+This module contains the database access managers for the payment app.
+"""
+
+from .customer_balance import customer_balance_manager
+
+__all__ = ["customer_balance_manager"]
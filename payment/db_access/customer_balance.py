@@ -0,0 +1,185 @@
+"""
+Customer Balance manager module.
+This module contains the CustomerBalanceManager class, which
+is responsible for managing the CustomerBalance read model.
+"""
+
+from decimal import Decimal
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import F
+from django.dispatch import receiver
+from django.db.models.signals import post_save
+
+from base.db_access import manager
+from customer.db_models import Customer
+
+from ..db_models import CustomerBalance
+
+BALANCE_FIELDS = ("invoice_count", "total_amount", "paid_amount", "pending_amount")
+CENTS = Decimal("0.01")
+
+
+class CustomerBalanceManager(manager.Manager[CustomerBalance]):
+    """
+    Manager class for the CustomerBalance model.
+    """
+
+    model = CustomerBalance
+    check_is_deleted: bool = False
+    cursor_ordering: tuple = ("customer__created_dtm", "pk")
+
+    @staticmethod
+    def merge_deltas(*deltas: dict) -> dict:
+        """
+        Merge balance deltas keyed by customer id into a single delta per customer.
+        Args:
+            *deltas (dict): `{customer_id: {"invoice_count": 1, "total_amount": ..., "paid_amount": ...}}`
+        Returns:
+            dict: The summed delta per customer, without the customers whose delta is zero.
+        """
+        merged = defaultdict(lambda: defaultdict(Decimal))
+
+        for delta in deltas:
+            for customer_id, values in delta.items():
+                for key, value in values.items():
+                    merged[customer_id][key] += value
+
+        return {
+            customer_id: dict(values)
+            for customer_id, values in merged.items()
+            if any(values.values())
+        }
+
+    def create_missing(self, customer_ids: list):
+        """
+        Create the empty ledger rows of the given customers, skipping the existing ones.
+        Used for customers created in bulk, as `bulk_create` sends no `post_save` signal.
+        """
+        self.model.objects.bulk_create(
+            [self.model(customer_id=customer_id) for customer_id in customer_ids],
+            batch_size=self.bulk_batch_size,
+            ignore_conflicts=True,
+        )
+
+    def apply_deltas(self, deltas: dict):
+        """
+        Apply balance deltas with atomic `F()` increments, creating missing ledger rows.
+        Must be called in the same transaction as the invoice write.
+        Args:
+            deltas (dict): `{customer_id: {"invoice_count": 1, "total_amount": ..., "paid_amount": ...}}`
+        """
+        for customer_id, delta in self.merge_deltas(deltas).items():
+            invoice_count = int(delta.get("invoice_count", 0))
+            total_amount = delta.get("total_amount", Decimal(0))
+            paid_amount = delta.get("paid_amount", Decimal(0))
+
+            changes = {
+                "invoice_count": F("invoice_count") + invoice_count,
+                "total_amount": F("total_amount") + total_amount,
+                "paid_amount": F("paid_amount") + paid_amount,
+                "pending_amount": F("pending_amount") + (total_amount - paid_amount),
+            }
+
+            with transaction.atomic(savepoint=False):
+                objects = self.model.objects.filter(customer_id=customer_id)
+
+                if not objects.update(**changes):
+                    self.model.objects.bulk_create(
+                        [self.model(customer_id=customer_id)], ignore_conflicts=True
+                    )
+                    objects.update(**changes)
+
+    def rebuild(self, customer_ids: list) -> int:
+        """
+        Recompute the ledger rows of the given customers from their invoices.
+        The ledger rows are locked before the invoices are summed, an invoice write committed
+        meanwhile is either counted in the sums or applies its delta to the rebuilt row once the
+        lock is released, it is never overwritten with the previous sums.
+        Args:
+            customer_ids (list): The customers to rebuild.
+        Returns:
+            int: The number of rebuilt rows.
+        """
+        with transaction.atomic():
+            self.create_missing(
+                list(Customer.objects.filter(pk__in=customer_ids).values_list("pk", flat=True))
+            )
+            balances = list(
+                self.model.objects.select_for_update()
+                .filter(customer_id__in=customer_ids)
+                .order_by("pk")
+            )
+
+            expected = self.get_expected_balances(customer_ids)
+
+            self.model.objects.filter(customer_id__in=customer_ids).exclude(
+                customer_id__in=list(expected)
+            ).delete()
+
+            balances = [balance for balance in balances if balance.customer_id in expected]
+            for balance in balances:
+                for field, value in expected[balance.customer_id].items():
+                    setattr(balance, field, value)
+
+            self.model.objects.bulk_update(
+                balances, BALANCE_FIELDS, batch_size=self.bulk_batch_size
+            )
+
+        return len(expected)
+
+    def verify(self, customer_ids: list) -> dict:
+        """
+        Compare the ledger rows of the given customers with their invoices.
+        Args:
+            customer_ids (list): The customers to verify.
+        Returns:
+            dict: `{customer_id: {"expected": {...}, "actual": {...}}}` for every mismatch.
+        """
+        expected = self.get_expected_balances(customer_ids)
+
+        actual = {
+            row.pop("customer_id"): row
+            for row in self.model.objects.filter(customer_id__in=customer_ids).values(
+                "customer_id", *BALANCE_FIELDS
+            )
+        }
+
+        return {
+            customer_id: {"expected": values, "actual": actual.get(customer_id)}
+            for customer_id, values in expected.items()
+            if actual.get(customer_id) != values
+        }
+
+    def get_expected_balances(self, customer_ids: list) -> dict:
+        """
+        Compute the balances of the given customers from their invoices in a single GROUP BY query.
+        The amounts are rounded to the cents stored in the ledger, SQLite sums them as floats.
+        """
+        from customer.db_access import customer_manager
+
+        return {
+            row["customer_id"]: {
+                field: row[field] if field == "invoice_count" else row[field].quantize(CENTS)
+                for field in BALANCE_FIELDS
+            }
+            for row in customer_manager.list_payment_summary(
+                query={"customer_id__in": customer_ids}
+            )
+        }
+
+
+@receiver(post_save, sender=Customer)
+def create_balance_on_customer_creation(sender, instance: Customer, created, **__):
+    """
+    Signal receiver that creates an empty ledger row when a Customer instance is created,
+    so every customer shows up in the payment summaries.
+    """
+    if not created:
+        return
+
+    customer_balance_manager.create_missing([instance.customer_id])
+
+
+customer_balance_manager = CustomerBalanceManager()
@@ -0,0 +1,7 @@
+"""
+This module contains the database models for the payment app.
+"""
+
+from .customer_balance import CustomerBalance
+
+__all__ = ["CustomerBalance"]
@@ -0,0 +1,54 @@
+"""
+Customer balance model.
+Read model holding the invoice totals of every customer, maintained incrementally
+from the invoice write paths so that payment summaries never aggregate invoices.
+"""
+
+from django.db import models
+
+from customer.db_models import Customer
+
+
+class CustomerBalance(models.Model):
+    """
+    Model to save the invoice count and amounts of a customer.
+    """
+
+    customer = models.OneToOneField(
+        Customer,
+        primary_key=True,
+        related_name="balance",
+        on_delete=models.CASCADE,
+    )
+    invoice_count = models.IntegerField(default=0)
+    total_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    paid_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    pending_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    updated_dtm = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        """
+        db_table (str): Specifies the database table name for the model.
+        indexes (list): Indexes used to order the payment summaries by amount.
+        """
+
+        db_table = "customer_balance"
+        indexes = [
+            models.Index(fields=["pending_amount"], name="customer_balance_pending_idx"),
+            models.Index(fields=["total_amount"], name="customer_balance_total_idx"),
+        ]
+
+    def to_dict(self):
+        """
+        Convert the CustomerBalance instance to a dictionary representation.
+
+        Returns:
+            dict: Dictionary representation of the CustomerBalance instance.
+        """
+        return {
+            "customer_id": self.customer_id,
+            "invoice_count": self.invoice_count,
+            "total_amount": float(self.total_amount),
+            "paid_amount": float(self.paid_amount),
+            "pending_amount": float(self.pending_amount),
+        }
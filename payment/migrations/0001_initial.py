@@ -0,0 +1,66 @@
+# Generated by Django 5.2.3 on 2026-10-18 06:57
+
+from decimal import Decimal
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Q, F, Sum, Count, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_customer_balance(apps, schema_editor):
+    """
+    Create the ledger row of every existing customer from its invoices.
+    """
+    Customer = apps.get_model("customer", "Customer")
+    CustomerBalance = apps.get_model("payment", "CustomerBalance")
+
+    amount_field = models.DecimalField(max_digits=14, decimal_places=2)
+    zero = Value(Decimal("0.00"), output_field=amount_field)
+    active = Q(invoice__is_deleted=False)
+    paid = active & Q(invoice__status="PAID")
+
+    rows = (
+        Customer.objects.order_by()
+        .values("customer_id")
+        .annotate(
+            invoice_count=Count("invoice__pk", filter=active),
+            total_amount=Coalesce(Sum("invoice__total", filter=active), zero, output_field=amount_field),
+            paid_amount=Coalesce(Sum("invoice__total", filter=paid), zero, output_field=amount_field),
+        )
+        .annotate(pending_amount=F("total_amount") - F("paid_amount"))
+    )
+
+    CustomerBalance.objects.bulk_create(
+        (CustomerBalance(**row) for row in rows.iterator(chunk_size=2000)),
+        batch_size=2000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('customer', '0002_customer_company_name_customer_customer_type_and_more'),
+        ('invoice', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CustomerBalance',
+            fields=[
+                ('customer', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='balance', serialize=False, to='customer.customer')),
+                ('invoice_count', models.IntegerField(default=0)),
+                ('total_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('paid_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('pending_amount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('updated_dtm', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'customer_balance',
+                'indexes': [models.Index(fields=['pending_amount'], name='customer_balance_pending_idx'), models.Index(fields=['total_amount'], name='customer_balance_total_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_customer_balance, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+from rest_framework import serializers
+from base.serializers.query import QuerySerializer
+
+from customer.constants import CustomerTypeChoices
+
+
+class PaymentQuerySerializer(QuerySerializer):
+    """
+    Serializer for querying customer payment summaries.
+    Inherits from QuerySerializer to handle common query parameters.
+    """
+
+    customer_type = serializers.ChoiceField(choices=CustomerTypeChoices.choices)
+    company_name = serializers.CharField(max_length=100)
+    first_name = serializers.CharField(max_length=50)
+    last_name = serializers.CharField(max_length=50)
+    has_pending = serializers.BooleanField(
+        help_text="Only return customers with (true) or without (false) a pending amount."
+    )
@@ -15,6 +15,9 @@ class PaymentDataSerializer(serializers.Serializer):
 
     customer_id = serializers.CharField(help_text="Unique identifier for the customer.")
     full_name = serializers.CharField(help_text="Full name of the customer.")
+    invoice_count = serializers.IntegerField(
+        help_text="Number of invoices of the customer."
+    )
     total_amount = serializers.FloatField(
         help_text="Total amount invoiced for the customer."
     )
@@ -56,6 +59,7 @@ class PaymentListResponseSerializer(serializers.Serializer):
 payment_example_data = {
     "customer_id": "57c35e7e-33d5-4253-b94e-0ad68991d95c",
     "full_name": "Shubham Patil",
+    "invoice_count": 2,
     "total_amount": 21883.76,
     "paid_amount": 0,
     "pending_amount": 21883.76,
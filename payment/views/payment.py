@@ -9,6 +9,8 @@ from drf_spectacular.utils import extend_schema
 
 from authentication import get_authentication_classes
 from base.views import ListView
+from base.serialization import Field, Serialization
+from utils.functions import get_full_name
 
 from utils.swagger import (
     responses_400,
@@ -19,14 +21,12 @@ from utils.swagger import (
     responses_404_example,
 )
 
-from customer.db_access import customer_manager
-from invoice.db_models.invoice import Invoice
-from customer.db_models.customer import Customer
-
+from ..db_access import customer_balance_manager
 from ..serializers import (
     PaymentListResponseSerializer,
     Payment_list_success_example,
 )
+from ..serializers.query import PaymentQuerySerializer
 
 MODULE_NAME = "Payment"
 
@@ -34,12 +34,37 @@ MODULE_NAME = "Payment"
 class PaymentViewSet(ListView, viewsets.ViewSet):
     """
     ViewSet to return payment summary for all customers.
+    The summaries are read from the `customer_balance` ledger, which is kept up to date
+    by the invoice writes, so no invoice is aggregated on read.
     """
 
     authentication_classes = get_authentication_classes()
-    is_pagination = False
-    list_serializer_class = None
-    manager = customer_manager
+    list_serializer_class = PaymentQuerySerializer
+    manager = customer_balance_manager
+    list_select_related = ["customer"]
+    list_serialization = Serialization(
+        "customer_id",
+        Field(
+            "full_name",
+            "customer__first_name",
+            "customer__last_name",
+            transform=get_full_name,
+        ),
+        "invoice_count",
+        Field("total_amount", transform=float),
+        Field("paid_amount", transform=float),
+        Field("pending_amount", transform=float),
+    )
+    customer_ordering_fields = ["first_name", "last_name", "created_dtm"]
+    ordering_fields = [
+        "first_name",
+        "last_name",
+        "created_dtm",
+        "invoice_count",
+        "total_amount",
+        "paid_amount",
+        "pending_amount",
+    ]
 
     @extend_schema(
         responses={
@@ -55,30 +80,55 @@ class PaymentViewSet(ListView, viewsets.ViewSet):
             responses_404_example,
         ],
         tags=[MODULE_NAME],
+        parameters=[PaymentQuerySerializer(partial=True)],
     )
     def list_all(self, request, *args, **kwargs):
         """List all customers with their payment summaries."""
         return super().list_all(request, *args, **kwargs)
 
-    def get_list(self, objects, request=None):
-        customers = Customer.objects.all()
-
-        result = []
-        for customer in customers:
-            invoices = Invoice.objects.filter(customer=customer)
-
-            total = sum(inv.total for inv in invoices)
-            paid = sum(inv.total for inv in invoices if inv.status == "PAID")
-            pending = total - paid
-
-            result.append(
-                {
-                    "customer_id": customer.customer_id,
-                    "full_name": customer.get_full_name,
-                    "total_amount": total,
-                    "paid_amount": paid,
-                    "pending_amount": pending,
-                }
-            )
+    def get_list_query_object(self, query=None, **_):
+        """
+        Override to filter the balances by customer and pending amount.
+        Soft-deleted customers are never listed.
+        """
+        query_obj = {"customer__is_deleted": False}
+
+        customer_type = query.pop("customer_type", None)
+        if customer_type:
+            query_obj["customer__customer_type"] = customer_type
+
+        company_name = query.pop("company_name", None)
+        if company_name:
+            query_obj["customer__company_name__icontains"] = company_name
+
+        first_name = query.pop("first_name", None)
+        if first_name:
+            query_obj["customer__first_name__icontains"] = first_name
 
-        return result
+        last_name = query.pop("last_name", None)
+        if last_name:
+            query_obj["customer__last_name__icontains"] = last_name
+
+        has_pending = query.pop("has_pending", None)
+        if has_pending is not None:
+            query_obj["pending_amount__gt" if has_pending else "pending_amount"] = 0
+
+        return query_obj
+
+    def get_ordering(self, query_params: dict, **kwargs) -> list | None:
+        """
+        Override to order by the customer columns through the ledger relation.
+        """
+        order_by = super().get_ordering(query_params, **kwargs)
+
+        if not order_by:
+            return order_by
+
+        return [
+            (
+                f"{'-' if order.startswith('-') else ''}customer__{order.lstrip('-')}"
+                if order.lstrip("-") in self.customer_ordering_fields
+                else order
+            )
+            for order in order_by
+        ]
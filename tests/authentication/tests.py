@@ -0,0 +1,331 @@
+"""
+Test cases for the authentication of the API requests.
+
+This module includes tests for the write-behind last login tracking, covering:
+- Authenticated requests not writing the user
+- Buffering the last login at most once per update interval
+- Flushing the buffered last logins in a single statement
+
+And for the token cache, covering:
+- Authenticated requests running no auth query on a warm cache
+- Invalidating the cached tokens on logout, login and user update
+- Not serving a snapshot read before a logout and cached after it
+
+And for the signed access tokens, covering:
+- Authenticating without any query
+- Refusing tampered, expired and revoked tokens
+- Bypassing the revocation filter, without releasing the lock of another writer, when it
+  can not be locked
+- Checking the tokens against the database when the revocation filter is evicted or unavailable
+- Refreshing the access token
+"""
+
+import time
+from unittest import mock
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from tests_utils.base_test import BaseTest
+
+
+@override_settings(LAST_LOGIN_UPDATE_INTERVAL=60, LAST_LOGIN_FLUSH_INTERVAL=3600)
+class LastLoginTestCase(BaseTest):
+    """
+    TestCase for the last login tracking.
+    """
+
+    def setUp(self, *args, **kwargs):
+        super().setUp(*args, **kwargs)
+
+        from auth_user.models import User
+        from authentication.last_login import LastLoginTracker
+
+        self.tracker = LastLoginTracker()
+        self.users = list(User.objects.all())
+        User.objects.update(last_login=None)
+
+    def test_authenticated_request_does_not_write_user(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get("/customer")
+        self.assertIn(response.status_code, [200, 404], msg=response.content)
+
+        writes = [
+            query["sql"]
+            for query in context.captured_queries
+            if query["sql"].startswith("UPDATE") and "auth_users" in query["sql"]
+        ]
+        self.assertEqual(writes, [])
+
+    def test_touch_buffers_once_per_interval(self):
+        user = self.users[0]
+
+        with self.assertNumQueries(0):
+            self.tracker.touch(user)
+            self.tracker.touch(user)
+
+        self.assertEqual(list(self.tracker._pending), [user.pk])
+
+        user.last_login = None
+        self.tracker.flush()
+        self.tracker.touch(user)
+        self.assertEqual(self.tracker._pending, {})
+
+    def test_touch_skips_recent_last_login(self):
+        user = self.users[0]
+        user.last_login = timezone.now()
+
+        self.tracker.touch(user)
+        self.assertEqual(self.tracker._pending, {})
+
+    def test_flush_writes_all_users_in_one_statement(self):
+        from auth_user.models import User
+
+        self.users.append(User.objects.create(email="second.user@example.com"))
+
+        for user in self.users:
+            self.tracker.touch(user)
+
+        with self.assertNumQueries(1):
+            self.tracker.flush()
+
+        self.assertEqual(len(self.tracker._touched), 2)
+        for user in User.objects.all():
+            self.assertEqual(user.last_login, self.tracker._touched[user.pk])
+
+        with self.assertNumQueries(0):
+            self.tracker.flush()
+
+
+class TokenCacheTestCase(BaseTest):
+    """
+    TestCase for the authentication token cache.
+    """
+
+    user_id = "ed0b2cfb-864a-4c34-93d1-8876bbb5cd7a"
+
+    def _get_auth_queries(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get("/customer")
+        self.assertIn(response.status_code, [200, 404], msg=response.content)
+
+        return [
+            query["sql"]
+            for query in context.captured_queries
+            if '"token"' in query["sql"] or '"auth_users"' in query["sql"]
+        ]
+
+    def test_warm_cache_runs_no_auth_query(self):
+        from authentication.cache import token_cache
+
+        token_cache.cache.clear_local()
+        token_cache.delete_user(self.user_id)
+
+        self.assertEqual(len(self._get_auth_queries()), 1)
+        self.assertEqual(self._get_auth_queries(), [])
+
+    def test_logout_invalidates_token(self):
+        self._get_auth_queries()
+
+        response = self.client.delete("/auth/logout")
+        self.assertEqual(response.status_code, 204, msg=response.content)
+
+        response = self.client.get("/customer")
+        self.assertEqual(response.status_code, 401, msg=response.content)
+
+    def test_login_invalidates_previous_token(self):
+        from tests_utils.auth import get_auth_token
+
+        self._get_auth_queries()
+        get_auth_token()
+
+        response = self.client.get("/customer")
+        self.assertEqual(response.status_code, 401, msg=response.content)
+
+    def test_user_update_invalidates_token(self):
+        from authentication.cache import token_cache
+
+        self._get_auth_queries()
+
+        response = self.client.patch(
+            f"/user/{self.user_id}", data={"first_name": "Renamed"}
+        )
+        self.assertEqual(response.status_code, 200, msg=response.content)
+        self.assertIsNone(token_cache.get(self.client.token))
+
+        self._get_auth_queries()
+        self.assertEqual(token_cache.get(self.client.token).user.first_name, "Renamed")
+
+    def test_snapshot_read_before_logout_is_not_served(self):
+        from authentication.cache import token_cache
+        from auth_user.db_access import token_manager
+
+        token_cache.delete_user(self.user_id)
+
+        # An authentication reads the token, a logout completes, then the snapshot is cached.
+        generation = token_cache.get_generation(self.client.token)
+        token = token_manager.get({"token": self.client.token}, select_related=["user"])
+
+        response = self.client.delete("/auth/logout")
+        self.assertEqual(response.status_code, 204, msg=response.content)
+
+        token_cache.set(token, generation)
+        self.assertIsNone(token_cache.get(self.client.token))
+
+        response = self.client.get("/customer")
+        self.assertEqual(response.status_code, 401, msg=response.content)
+
+    def test_delete_user_invalidates_every_token(self):
+        from authentication.cache import token_cache
+        from auth_user.db_access import token_manager
+        from auth_user.db_models import Token
+
+        # The tokens are read from the database, no cached index of them can miss one.
+        other = Token.objects.create(token="other-token", user_id=self.user_id)
+        for key in (self.client.token, other.token):
+            generation = token_cache.get_generation(key)
+            token_cache.set(
+                token_manager.get({"token": key}, select_related=["user"]), generation
+            )
+
+        token_cache.delete_user(self.user_id)
+
+        self.assertIsNone(token_cache.get(self.client.token))
+        self.assertIsNone(token_cache.get(other.token))
+
+
+@override_settings(LAST_LOGIN_FLUSH_INTERVAL=3600)
+class SignedTokenTestCase(BaseTest):
+    """
+    TestCase for the signed access token authentication.
+    """
+
+    user_id = "ed0b2cfb-864a-4c34-93d1-8876bbb5cd7a"
+
+    def setUp(self, *args, **kwargs):
+        super().setUp(*args, **kwargs)
+
+        from authentication.signed_token import SignedTokenAuthentication
+
+        self.authentication = SignedTokenAuthentication()
+
+        response = self.client.post(
+            "/auth/login",
+            data={"username": "test.user@example.com", "password": "TestUser@123"},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 201, msg=response.content)
+        self.login = response.json()["data"]
+
+    def _authenticate(self, token):
+        from django.test import RequestFactory
+
+        request = RequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+        return self.authentication.authenticate(request)
+
+    def test_authenticate_without_query(self):
+        with self.assertNumQueries(0):
+            user, _ = self._authenticate(self.login["access_token"])
+
+        self.assertEqual(user.user_id, self.user_id)
+
+    def test_authenticate_refresh_token(self):
+        user, token = self._authenticate(self.login["token"])
+
+        self.assertEqual(user.user_id, self.user_id)
+        self.assertEqual(token.token, self.login["token"])
+
+    def test_refuse_tampered_and_expired_tokens(self):
+        from authentication.exception import UnauthorizedException
+        from authentication.signed_token import create_access_token
+        from auth_user.db_access import token_manager
+
+        with self.assertRaises(UnauthorizedException):
+            self._authenticate(self.login["access_token"][:-2] + "xx")
+
+        token = token_manager.get({"token": self.login["token"]})
+        with override_settings(ACCESS_TOKEN_LIFETIME=-1):
+            access_token = create_access_token(token)["access_token"]
+
+        with self.assertRaises(UnauthorizedException):
+            self._authenticate(access_token)
+
+    def test_refuse_revoked_token(self):
+        from authentication.exception import UnauthorizedException
+
+        self.client.set_auth_header(self.login["token"])
+        response = self.client.delete("/auth/logout")
+        self.assertEqual(response.status_code, 204, msg=response.content)
+
+        with self.assertRaises(UnauthorizedException):
+            self._authenticate(self.login["access_token"])
+
+    def test_locked_revocation_filter_is_bypassed(self):
+        from authentication.exception import UnauthorizedException
+        from authentication.revocation import cache, revocation_filter
+
+        # Another writer holds the lock of the filter.
+        cache.add(revocation_filter.lock_key, "other", timeout=60)
+
+        with mock.patch.object(revocation_filter, "lock_attempts", 1):
+            self.client.set_auth_header(self.login["token"])
+            response = self.client.delete("/auth/logout")
+        self.assertEqual(response.status_code, 204, msg=response.content)
+
+        self.assertEqual(cache.get(revocation_filter.lock_key), "other")
+        self.assertTrue(revocation_filter.might_contain("any-token", time.time()))
+
+        with self.assertRaises(UnauthorizedException):
+            self._authenticate(self.login["access_token"])
+
+    def test_unavailable_revocation_filter_fails_closed(self):
+        from authentication.exception import UnauthorizedException
+        from authentication.revocation import cache
+        from authentication.signed_token import create_access_token
+        from auth_user.db_access import token_manager
+
+        self.client.set_auth_header(self.login["token"])
+        response = self.client.delete("/auth/logout")
+        self.assertEqual(response.status_code, 204, msg=response.content)
+
+        # A valid token issued after the logout is still served from the database.
+        response = self.client.post(
+            "/auth/login",
+            data={"username": "test.user@example.com", "password": "TestUser@123"},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 201, msg=response.content)
+        token = token_manager.get({"token": response.json()["data"]["token"]})
+        access_token = create_access_token(token)["access_token"]
+
+        # The filters are evicted.
+        cache.cache.clear()
+        with self.assertRaises(UnauthorizedException):
+            self._authenticate(self.login["access_token"])
+
+        with self.assertNumQueries(1):
+            user, _ = self._authenticate(access_token)
+        self.assertEqual(user.user_id, self.user_id)
+
+        # The shared cache is unreachable.
+        with mock.patch.object(cache.cache, "get_many", side_effect=ConnectionError):
+            with self.assertRaises(UnauthorizedException):
+                self._authenticate(self.login["access_token"])
+
+            with self.assertNumQueries(1):
+                user, _ = self._authenticate(access_token)
+        self.assertEqual(user.user_id, self.user_id)
+
+    def test_refresh_access_token(self):
+        response = self.client.post(
+            "/auth/refresh", data={"refresh_token": self.login["token"]}
+        )
+        self.assertEqual(response.status_code, 201, msg=response.content)
+
+        user, _ = self._authenticate(response.json()["data"]["access_token"])
+        self.assertEqual(user.user_id, self.user_id)
+
+        response = self.client.post("/auth/refresh", data={"refresh_token": "revoked"})
+        self.assertEqual(response.status_code, 401, msg=response.content)
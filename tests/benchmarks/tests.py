@@ -0,0 +1,130 @@
+"""
+Test cases for the endpoint benchmarks.
+
+This module includes tests for the benchmark runner, the baseline comparison and the load test:
+- Running the cases of every viewset against a generated dataset
+- Reporting the latency, query and memory regressions beyond the tolerance
+- Recording latencies in HDR-style histograms
+- Driving the served application with concurrent clients
+"""
+
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from benchmarks import CASES, BenchmarkRunner, compare
+from benchmarks.histogram import LatencyHistogram
+from benchmarks.load import load_scenario, run_load, start_server
+from utils.load_data.generate import generate_dataset, get_scale
+
+
+class BenchmarkTestCase(TestCase):
+    """
+    TestCase for the benchmark runner.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        generate_dataset(get_scale(600), batch_size=200)
+
+    def tearDown(self):
+        from authentication.last_login import last_login_tracker
+
+        last_login_tracker.flush()
+
+    def test_run_benchmarks(self):
+        runner = BenchmarkRunner(iterations=3, warmup=1, memory_iterations=1)
+        results = runner.run(CASES)
+
+        self.assertEqual(list(results), [case.name for case in CASES])
+        for name, metrics in results.items():
+            self.assertLessEqual(metrics["p50_ms"], metrics["p95_ms"], msg=name)
+            self.assertLessEqual(metrics["p95_ms"], metrics["p99_ms"], msg=name)
+            self.assertGreater(metrics["memory_kb"], 0, msg=name)
+
+        self.assertEqual(results["invoice.list"]["queries"], 2)
+
+    def test_compare_with_baseline(self):
+        baseline = {
+            "invoice.list": {
+                "p50_ms": 10.0,
+                "p95_ms": 20.0,
+                "p99_ms": 30.0,
+                "queries": 2,
+                "memory_kb": 100.0,
+            }
+        }
+        within = {
+            "invoice.list": {
+                "p50_ms": 12.0,
+                "p95_ms": 24.0,
+                "p99_ms": 90.0,
+                "queries": 2,
+                "memory_kb": 120.0,
+            }
+        }
+        self.assertEqual(compare(within, baseline, tolerance=0.25), [])
+
+        regressed = {
+            "invoice.list": {**within["invoice.list"], "p95_ms": 26.0, "queries": 3},
+            "customer.list": within["invoice.list"],
+        }
+        regressions = compare(regressed, baseline, tolerance=0.25)
+
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(regressions[0].startswith("invoice.list: p95_ms 26.0 > 25.000"))
+        self.assertTrue(regressions[1].startswith("invoice.list: queries 3 > 2"))
+
+
+class LoadTestCase(TransactionTestCase):
+    """
+    TestCase for the load test and its histograms.
+    """
+
+    def test_latency_histogram(self):
+        histogram = LatencyHistogram(significant_digits=2)
+        for milliseconds in range(1, 101):
+            histogram.record(milliseconds / 1000)
+
+        other = LatencyHistogram(significant_digits=2)
+        other.record(1.2345)
+        histogram.add(other)
+
+        self.assertEqual(histogram.total_count, 101)
+        self.assertEqual(histogram.get_percentile(50), 51.0)
+        self.assertEqual(histogram.get_percentile(99), 100.0)
+        self.assertEqual(histogram.get_percentile(100), 1200.0)
+        self.assertEqual(histogram.max_value, 1_234_500)
+
+        distribution = histogram.get_percentile_distribution()
+        self.assertEqual(distribution[-1], (1200.0, 100.0, 101))
+        self.assertEqual(
+            [percentile for _, percentile, _ in distribution],
+            sorted(percentile for _, percentile, _ in distribution),
+        )
+
+    @override_settings(ALLOWED_HOSTS=["127.0.0.1"])
+    def test_run_load(self):
+        from authentication.last_login import last_login_tracker
+
+        generate_dataset(get_scale(100), batch_size=100)
+
+        scenario = load_scenario("benchmarks/scenarios/default.json")
+        # The reads only, but the search which may match none of the few generated customers.
+        scenario["requests"] = [
+            request
+            for request in scenario["requests"]
+            if request["method"] == "GET" and "q" not in request.get("query_params", {})
+        ]
+
+        server, port = start_server()
+        try:
+            report = run_load(f"http://127.0.0.1:{port}", scenario, concurrency=2, duration=1)
+        finally:
+            server.shutdown()
+            server.server_close()
+            last_login_tracker.flush()
+
+        self.assertGreater(report["requests"], 0)
+        self.assertEqual(report["errors"], 0, msg=report["by_request"])
+        self.assertEqual(
+            sum(stats["count"] for stats in report["by_request"].values()), report["requests"]
+        )
@@ -0,0 +1,235 @@
+"""
+Test cases for the two tier cache.
+
+This module includes tests for utils.cache.CacheInterface, covering:
+- Reading through the local tier and the shared tier
+- Reading and writing many keys at once
+- Invalidating a namespace and separating the key versions
+- Recomputing the values early with get_or_set
+- Evicting the least recently used keys of the local tier
+- Running the tests on the test caches instead of the configured ones
+
+and for the query cache of the managers (base.db_access.cache), covering:
+- Serving get, exists, count and get_objects_mapping from the cache
+- Invalidating the results on save, delete and on the bulk writes of the manager
+- Bypassing the cache for a model written in the current transaction
+- Caching the existence checks of the serializers
+"""
+
+from django.core.cache import caches
+from django.db import transaction
+from django.test import SimpleTestCase
+
+from tests_utils.base_test import BaseTest
+from utils.cache import CacheInterface, LocalCache
+
+
+class CacheInterfaceTestCase(SimpleTestCase):
+    """
+    TestCase for the two tier cache.
+    """
+
+    def setUp(self):
+        caches["default"].clear()
+
+    def test_read_through_tiers(self):
+        cache = CacheInterface(local_size=10, local_timeout=60)
+        cache.set("key", "value")
+
+        # The local tier serves the value until its TTL, even once gone from the shared tier.
+        caches["default"].clear()
+        self.assertEqual(cache.get("key"), "value")
+        self.assertIsNone(cache.get("key", local=False))
+
+        cache.clear_local()
+        self.assertIsNone(cache.get("key"))
+        self.assertEqual(cache.get("key", "default"), "default")
+
+        # A value read from the shared tier fills the local tier.
+        cache.set("other", "value", local=False)
+        self.assertIsNone(cache.local.get(cache.make_key("other")))
+        self.assertEqual(cache.get("other"), "value")
+        self.assertEqual(cache.local.get(cache.make_key("other")), "value")
+
+        cache.delete("other")
+        self.assertIsNone(cache.get("other"))
+
+    def test_get_many_and_set_many(self):
+        cache = CacheInterface(local_size=10, local_timeout=60)
+        self.assertEqual(cache.set_many({"a": 1, "b": 2, "c": 3}), [])
+
+        cache.local.delete(cache.make_key("b"))
+        self.assertEqual(cache.get_many(["a", "b", "c", "d"]), {"a": 1, "b": 2, "c": 3})
+        self.assertEqual(cache.local.get(cache.make_key("b")), 2)
+
+        cache.delete_many(["a", "b"])
+        self.assertEqual(cache.get_many(["a", "b", "c"]), {"c": 3})
+
+    def test_namespaces_and_versions(self):
+        invoices = CacheInterface(namespace="invoice", local_size=10, local_timeout=60)
+        customers = CacheInterface(namespace="customer", local_size=10, local_timeout=60)
+        invoices_v2 = CacheInterface(namespace="invoice", version=2, local_size=0)
+
+        invoices.set("1", "invoice")
+        customers.set("1", "customer")
+        self.assertEqual(invoices.get("1"), "invoice")
+        self.assertEqual(customers.get("1"), "customer")
+        self.assertIsNone(invoices_v2.get("1"))
+
+        invoices.invalidate_namespace()
+        self.assertIsNone(invoices.get("1"))
+        self.assertEqual(customers.get("1"), "customer")
+
+        # Another process sees the new namespace version once its local tier expires.
+        other_process = CacheInterface(namespace="invoice", local_size=0)
+        self.assertEqual(other_process.get_namespace_version(), 2)
+
+    def test_get_or_set_recomputes_early(self):
+        cache = CacheInterface(local_size=0)
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return len(calls)
+
+        self.assertEqual(cache.get_or_set("key", compute, timeout=60, beta=0), 1)
+        self.assertEqual(cache.get_or_set("key", compute, timeout=60, beta=0), 1)
+        self.assertEqual(len(calls), 1)
+
+        # With a huge beta the value is always considered close to its expiry.
+        self.assertEqual(cache.get_or_set("key", compute, timeout=60, beta=10**12), 2)
+        self.assertEqual(cache.get_or_set("key", compute, timeout=60, beta=0), 2)
+
+    def test_tests_run_on_test_caches(self):
+        from django.conf import settings
+        from django.core.cache.backends.locmem import LocMemCache
+
+        self.assertEqual(settings.CACHES, settings.TEST_CACHES)
+        self.assertIsInstance(caches["default"], LocMemCache)
+
+    def test_local_cache_evicts_least_recently_used(self):
+        local = LocalCache(max_size=2, default_timeout=60)
+        local.set("a", 1)
+        local.set("b", 2)
+        local.get("a")
+        local.set("c", 3)
+
+        self.assertEqual(local.get("a"), 1)
+        self.assertIsNone(local.get("b"))
+        self.assertEqual(local.get("c"), 3)
+
+        local.set("d", 4, timeout=-1)
+        self.assertIsNone(local.get("d"))
+
+
+class QueryCacheTestCase(BaseTest):
+    """
+    TestCase for the query cache of the managers.
+    """
+
+    def setUp(self, *args, **kwargs):
+        super().setUp(*args, **kwargs)
+        self.test_vehicle = {
+            "vehicle_name": "Toyota Corolla",
+            "vehicle_type": "Sedan",
+            "vehicle_number": "KA01AB1234",
+            "vehicle_model": "2021",
+            "vehicle_color": "White",
+        }
+
+    def _create_vehicle(self, **data):
+        from vehicle.db_access import vehicle_manager
+
+        return vehicle_manager.create({**self.test_vehicle, **data})
+
+    def test_reads_are_cached(self):
+        from vehicle.db_access import vehicle_manager
+
+        vehicle = self._create_vehicle()
+        query = {"vehicle_id": vehicle.vehicle_id}
+
+        self.assertEqual(vehicle_manager.get(query).vehicle_name, "Toyota Corolla")
+        self.assertTrue(vehicle_manager.exists(query))
+        self.assertEqual(vehicle_manager.count({}), 1)
+        self.assertIsNone(vehicle_manager.get({"vehicle_id": "missing"}))
+        self.assertEqual(list(vehicle_manager.get_objects_mapping({})), [vehicle.vehicle_id])
+
+        with self.assertNumQueries(0):
+            self.assertEqual(vehicle_manager.get(dict(query)).vehicle_name, "Toyota Corolla")
+            self.assertTrue(vehicle_manager.exists(dict(query)))
+            self.assertEqual(vehicle_manager.count({}), 1)
+            self.assertIsNone(vehicle_manager.get({"vehicle_id": "missing"}))
+            self.assertEqual(
+                list(vehicle_manager.get_objects_mapping({})), [vehicle.vehicle_id]
+            )
+
+        # The other options of a read are part of its key.
+        with self.assertNumQueries(1):
+            vehicle_manager.get(dict(query), only=["vehicle_id"])
+
+        # The objects loaded with their relations are not cached.
+        with self.assertNumQueries(2):
+            vehicle_manager.get(dict(query), prefetch_related=["invoice_set"])
+
+    def test_writes_invalidate(self):
+        from vehicle.db_access import vehicle_manager
+
+        vehicle = self._create_vehicle()
+        query = {"vehicle_id": vehicle.vehicle_id}
+        self.assertEqual(vehicle_manager.count({}), 1)
+
+        # post_save
+        self._create_vehicle(vehicle_number="KA01AB5678")
+        self.assertEqual(vehicle_manager.count({}), 2)
+
+        # The bulk writes of the manager send no signal.
+        vehicle_manager.create(
+            [{**self.test_vehicle, "vehicle_number": "KA01AB9999"}], many=True
+        )
+        self.assertEqual(vehicle_manager.count({}), 3)
+
+        self.assertEqual(vehicle_manager.get(dict(query)).vehicle_color, "White")
+        vehicle_manager.update({"vehicle_color": "Black"}, dict(query))
+        self.assertEqual(vehicle_manager.get(dict(query)).vehicle_color, "Black")
+
+        vehicle_manager.delete(dict(query))
+        self.assertIsNone(vehicle_manager.get(dict(query)))
+        self.assertEqual(vehicle_manager.count({}), 2)
+
+        # post_delete
+        vehicle_manager.delete({}, soft_delete=False, force_delete=True)
+        self.assertEqual(vehicle_manager.count({}), 0)
+
+    def test_transaction_bypasses_cache(self):
+        from vehicle.db_access import vehicle_manager
+
+        self.assertEqual(vehicle_manager.count({}), 0)
+
+        with transaction.atomic():
+            with self.assertNumQueries(0):
+                vehicle_manager.count({})
+
+            self._create_vehicle()
+
+            # The uncommitted rows are read from the database and not cached.
+            with self.assertNumQueries(2):
+                self.assertEqual(vehicle_manager.count({}), 1)
+                self.assertEqual(vehicle_manager.count({}), 1)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(vehicle_manager.count({}), 1)
+
+    def test_serializer_existence_check(self):
+        from invoice.serializers import InvoiceSerializer
+
+        vehicle = self._create_vehicle()
+        data = {"vehicle_id": vehicle.vehicle_id}
+
+        self.assertTrue(InvoiceSerializer(data=data, partial=True).is_valid())
+        with self.assertNumQueries(0):
+            self.assertTrue(InvoiceSerializer(data=data, partial=True).is_valid())
+
+        from vehicle.db_access import vehicle_manager
+
+        vehicle_manager.delete({"vehicle_id": vehicle.vehicle_id})
+        self.assertFalse(InvoiceSerializer(data=data, partial=True).is_valid())
@@ -4,12 +4,23 @@ Test cases for the Customer API endpoints.
 This module includes integration tests for the CustomerViewSet, covering CRUD operations:
 - Creating a new customer
 - Retrieving a customer by ID
-- Listing all customers
+- Listing all customers, within a query budget independent of the number of customers
+- Searching customers with the `q` query param
+- Searching customers after their rowids change, and after the search index is rebuilt
+- Rebuilding the search index missing a trigger after a migrate
 - Updating a customer
 - Deleting a customer
+- Bulk upserting customers through the manager
 """
 
+from unittest import skipUnless
+
+from django.db import connection
+from django.core.management import call_command
+from django.test import override_settings
+
 from tests_utils.base_test import BaseTest
+from tests_utils.query_budget import assert_constant_queries
 
 
 class CustomerTestCase(BaseTest):
@@ -123,6 +134,204 @@ class CustomerTestCase(BaseTest):
         self.assertEqual(pagination["current_page"], 1)
         self.assertEqual(pagination["total_pages"], 1)
 
+    def _create_customers(self, count):
+        for _ in range(count):
+            index = self.customer_count = getattr(self, "customer_count", 0) + 1
+            self._create_customer({**self.test_customer, "email": f"test{index}@example.com"})
+
+    def test_list_customers_query_budget(self):
+        count = assert_constant_queries(
+            self._create_customers,
+            lambda: self.client.get(self.customer_url, max_queries=2),
+        )
+        self.assertEqual(count, 2)
+
+        count = assert_constant_queries(
+            self._create_customers,
+            lambda: self.client.get(
+                self.customer_url, data={"q": "test", "cursor": ""}, max_queries=1
+            ),
+            sizes=(21, 25),
+        )
+        self.assertEqual(count, 1)
+
+    def _create_search_customers(self):
+        return [
+            self._create_customer(
+                {
+                    **self.test_customer,
+                    "first_name": first_name,
+                    "last_name": last_name,
+                    "company_name": company_name,
+                    "email": f"{first_name.lower()}@example.com",
+                }
+            )
+            for first_name, last_name, company_name in [
+                ("Ravi", "Kumar", "Kumar Logistics"),
+                ("Anita", "Sharma", "Sharma Freight"),
+                ("Kumari", "Iyer", "Iyer Transport"),
+            ]
+        ]
+
+    def test_search_customers(self):
+        ravi_id, _, kumari_id = self._create_search_customers()
+
+        response = self.client.get(self.customer_url, data={"q": "kum"})
+        self.assertEqual(response.status_code, 200, msg=response.content)
+
+        data = response.json()["data"]
+        # Ravi matches in two fields, so he ranks first.
+        self.assertEqual([item["customer_id"] for item in data["list"]], [ravi_id, kumari_id])
+        self.assertEqual(data["pagination"]["count"], 2)
+
+        response = self.client.get(self.customer_url, data={"q": "kumar logistics"})
+        self.assertEqual(
+            [item["customer_id"] for item in response.json()["data"]["list"]], [ravi_id]
+        )
+
+        response = self.client.get(self.customer_url, data={"q": "unknown"})
+        self.assertEqual(response.status_code, 404, msg=response.content)
+
+    def test_search_customers_after_update_and_with_cursor(self):
+        ravi_id, anita_id, kumari_id = self._create_search_customers()
+
+        response = self.client.patch(
+            f"{self.customer_url}/{anita_id}", data={"last_name": "Kumar"}
+        )
+        self.assertEqual(response.status_code, 200, msg=response.content)
+
+        response = self.client.get(
+            self.customer_url, data={"q": "kumar", "cursor": "", "page_size": 2}
+        )
+        self.assertEqual(response.status_code, 200, msg=response.content)
+
+        data = response.json()["data"]
+        found_ids = [item["customer_id"] for item in data["list"]]
+
+        response = self.client.get(
+            self.customer_url,
+            data={"q": "kumar", "cursor": data["pagination"]["next_cursor"], "page_size": 2},
+        )
+        self.assertEqual(response.status_code, 200, msg=response.content)
+
+        data = response.json()["data"]
+        found_ids += [item["customer_id"] for item in data["list"]]
+
+        self.assertEqual(sorted(found_ids), sorted([ravi_id, anita_id, kumari_id]))
+        self.assertIsNone(data["pagination"]["next_cursor"])
+
+    @skipUnless(connection.vendor == "sqlite", "The FTS5 search index is SQLite specific.")
+    def test_search_index_is_keyed_by_primary_key(self):
+        ravi_id, anita_id, kumari_id = self._create_search_customers()
+
+        # The rowids change when the table is remade, e.g. by an AlterField or a VACUUM.
+        with connection.cursor() as cursor:
+            cursor.execute("UPDATE customer SET rowid = rowid + 1000")
+
+        response = self.client.get(self.customer_url, data={"q": "kumar"})
+        self.assertEqual(response.status_code, 200, msg=response.content)
+        self.assertEqual(
+            sorted(item["customer_id"] for item in response.json()["data"]["list"]),
+            sorted([ravi_id, kumari_id]),
+        )
+
+        # Remaking the table drops the triggers, the command creates them again.
+        with connection.cursor() as cursor:
+            cursor.execute("DROP TRIGGER customer_search_update")
+
+        call_command("rebuild_search_index")
+
+        response = self.client.patch(
+            f"{self.customer_url}/{anita_id}", data={"last_name": "Kumar"}
+        )
+        self.assertEqual(response.status_code, 200, msg=response.content)
+
+        response = self.client.get(self.customer_url, data={"q": "kumar"})
+        self.assertEqual(
+            sorted(item["customer_id"] for item in response.json()["data"]["list"]),
+            sorted([ravi_id, anita_id, kumari_id]),
+        )
+
+    @skipUnless(connection.vendor == "sqlite", "The FTS5 search index is SQLite specific.")
+    def test_stale_search_index_is_rebuilt_after_migrate(self):
+        from django.core.management.sql import emit_post_migrate_signal
+
+        ravi_id, anita_id, kumari_id = self._create_search_customers()
+
+        # A migration remaking the table drops the triggers, rows then change unindexed.
+        with connection.cursor() as cursor:
+            cursor.execute("DROP TRIGGER customer_search_update")
+            cursor.execute(
+                "UPDATE customer SET last_name = 'Kumar' WHERE customer_id = %s", [anita_id]
+            )
+
+        emit_post_migrate_signal(verbosity=0, interactive=False, db="default")
+
+        response = self.client.get(self.customer_url, data={"q": "kumar"})
+        self.assertEqual(response.status_code, 200, msg=response.content)
+        self.assertEqual(
+            sorted(item["customer_id"] for item in response.json()["data"]["list"]),
+            sorted([ravi_id, anita_id, kumari_id]),
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT name FROM sqlite_master WHERE name = 'customer_search_update'")
+            self.assertEqual(len(cursor.fetchall()), 1)
+
+    @override_settings(SEARCH_BACKENDS={})
+    def test_search_customers_with_contains_backend(self):
+        ravi_id, _, kumari_id = self._create_search_customers()
+
+        response = self.client.get(self.customer_url, data={"q": "UMAR"})
+        self.assertEqual(response.status_code, 200, msg=response.content)
+        self.assertEqual(
+            [item["customer_id"] for item in response.json()["data"]["list"]], [ravi_id, kumari_id]
+        )
+
+    def test_list_customers_with_cursor(self):
+        created_ids = []
+        for index in range(3):
+            created_ids.append(
+                self._create_customer(
+                    {**self.test_customer, "email": f"test{index}@example.com"}
+                )
+            )
+
+        response = self.client.get(self.customer_url, data={"cursor": "", "page_size": 2})
+        self.assertEqual(response.status_code, 200, msg=response.content)
+
+        data = response.json()["data"]
+        first_page = [customer["customer_id"] for customer in data["list"]]
+        pagination = data["pagination"]
+
+        self.assertEqual(len(first_page), 2)
+        self.assertEqual(pagination["page_size"], 2)
+        self.assertNotIn("count", pagination)
+        self.assertIsNotNone(pagination["next_cursor"])
+
+        response = self.client.get(
+            self.customer_url,
+            data={"cursor": pagination["next_cursor"], "page_size": 2},
+        )
+        self.assertEqual(response.status_code, 200, msg=response.content)
+
+        data = response.json()["data"]
+        second_page = [customer["customer_id"] for customer in data["list"]]
+
+        self.assertEqual(len(second_page), 1)
+        self.assertIsNone(data["pagination"]["next_cursor"])
+        self.assertEqual(sorted(first_page + second_page), sorted(created_ids))
+
+    def test_list_customers_with_invalid_cursor(self):
+        self._create_customer()
+
+        response = self.client.get(self.customer_url, data={"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, 400, msg=response.content)
+
+        errors = response.json()["errors"]
+        self.assertEqual(errors["code"], "INVALID")
+        self.assertEqual(errors["message"], "Invalid Cursor.")
+
     def test_update_customer(self):
         customer_id = self._create_customer()
         update_data = {
@@ -190,3 +399,37 @@ class CustomerTestCase(BaseTest):
         errors = response.json()["errors"]
         self.assertEqual(errors["code"], "NO_DATA_FOUND")
         self.assertEqual(errors["message"], "No Data Found.")
+
+    def test_bulk_upsert_customers(self):
+        from customer.db_access import customer_manager
+        from payment.db_access import customer_balance_manager
+
+        customer_id = self._create_customer()
+
+        rows = [
+            {
+                **self.test_customer,
+                "first_name": f"Synced{index}",
+                "email": f"synced{index}@example.com",
+                "created_by": "erp",
+                "updated_by": "erp",
+            }
+            for index in range(3)
+        ]
+        rows[0]["email"] = self.test_customer["email"]
+
+        objs = customer_manager.bulk_upsert(rows, unique_fields=["email"], batch_size=2)
+
+        self.assertEqual(objs[0].pk, customer_id)
+        self.assertEqual(customer_manager.count(query={}), 3)
+
+        customer = customer_manager.get(query={"customer_id": customer_id})
+        self.assertEqual(customer.first_name, "Synced0")
+        self.assertNotEqual(customer.created_by, "erp")
+
+        self.assertEqual(
+            customer_balance_manager.count(
+                query={"customer_id__in": [obj.pk for obj in objs]}
+            ),
+            3,
+        )
@@ -0,0 +1,81 @@
+"""
+Test cases for the synthetic dataset generator.
+
+This module includes tests for the `generate_dataset` command:
+- Generating every table at the requested scale, with the customer balances rebuilt
+- Generating the same rows from a same seed, whatever the number of workers
+- Bounding the number of chunks generated ahead of the inserts
+"""
+
+from django.core.management import call_command
+from django.test import TestCase
+
+
+class GenerateDatasetTestCase(TestCase):
+    """
+    TestCase for the generate_dataset command.
+    """
+
+    options = {"invoices": 300, "customers": 20, "vehicles": 5, "users": 3, "batch_size": 70}
+
+    def _get_invoices(self):
+        from invoice.db_models import Invoice
+
+        return list(
+            Invoice.objects.order_by("pk").values_list(
+                "pk", "customer_id", "vehicle_id", "date", "total", "status", "created_dtm"
+            )
+        )
+
+    def test_generate_dataset(self):
+        from auth_user.models import User
+        from customer.db_models import Customer
+        from vehicle.db_models import Vehicle
+        from invoice.db_models import Invoice
+        from notification.db_models import Notification, UserNotification
+        from payment.db_access import customer_balance_manager
+
+        call_command("generate_dataset", workers=1, **self.options)
+
+        self.assertEqual(User.objects.count(), 3)
+        self.assertEqual(Customer.objects.count(), 20)
+        self.assertEqual(Vehicle.objects.count(), 5)
+        self.assertEqual(Invoice.objects.count(), 300)
+        self.assertEqual(Notification.objects.count(), 30)
+        self.assertEqual(UserNotification.objects.count(), 30)
+
+        dates = Invoice.objects.values_list("created_dtm", flat=True).distinct()
+        self.assertGreater(len(dates), 1)
+
+        customer_ids = list(Customer.objects.values_list("pk", flat=True))
+        self.assertEqual(customer_balance_manager.verify(customer_ids), {})
+
+    def test_generate_dataset_is_deterministic(self):
+        call_command("generate_dataset", workers=1, seed=7, **self.options)
+        invoices = self._get_invoices()
+
+        call_command("generate_dataset", workers=2, seed=7, clear=True, **self.options)
+        self.assertEqual(self._get_invoices(), invoices)
+
+        call_command("generate_dataset", workers=1, seed=8, clear=True, **self.options)
+        self.assertNotEqual(self._get_invoices(), invoices)
+
+    def test_chunks_generated_ahead_are_bounded(self):
+        from multiprocessing.pool import ThreadPool
+
+        from utils.load_data.generate import imap_bounded
+
+        submitted = []
+
+        def get_tasks():
+            for task in range(20):
+                submitted.append(task)
+                yield task
+
+        with ThreadPool(2) as pool:
+            for task, result in enumerate(imap_bounded(pool, abs, get_tasks(), max_pending=3)):
+                self.assertEqual(result, task)
+                # The consumed chunk, and at most 3 chunks submitted ahead of it.
+                self.assertLessEqual(len(submitted) - task, 4)
+
+        self.assertEqual(len(submitted), 20)
@@ -0,0 +1,194 @@
+"""
+Regression tests for the indexes of the list endpoints.
+
+The tables are seeded with `WITH RECURSIVE` inserts and analyzed, then the queries built by
+the managers for the list endpoints are explained to check that they use their partial index:
+- Invoices in the default order, by customer and status, by vehicle and by date
+- Customers and vehicles in the default order
+- Unread notifications of a user
+"""
+
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+
+SEED_EXPRESSIONS = {
+    "sqlite": {
+        "date": "date('2024-01-01', '+' || (n % 365) || ' days')",
+        "dtm": "datetime('2024-01-01', '+' || n || ' seconds')",
+    },
+    "postgresql": {
+        "date": "DATE '2024-01-01' + (n % 365)",
+        "dtm": "TIMESTAMPTZ '2024-01-01' + n * INTERVAL '1 second'",
+    },
+}
+
+
+@skipUnless(connection.vendor in SEED_EXPRESSIONS, "EXPLAIN output is database specific.")
+class ListIndexTestCase(TestCase):
+    """
+    TestCase for the indexes used by the list endpoints.
+    """
+
+    invoice_count = 1_000_000
+    customer_count = 10_000
+    vehicle_count = 1_000
+    user_notification_count = 100_000
+
+    @classmethod
+    def seed(cls, table: str, count: int, columns: dict):
+        """
+        Insert `count` rows in the table, `columns` maps the columns to SQL expressions of `n`.
+        Every 50th row is soft deleted.
+        """
+        expressions = SEED_EXPRESSIONS[connection.vendor]
+        columns = {
+            "is_active": "TRUE",
+            "is_deleted": "(n % 50 = 0)",
+            "created_by": "'seed'",
+            "updated_by": "'seed'",
+            "created_dtm": expressions["dtm"],
+            "updated_dtm": expressions["dtm"],
+            **columns,
+        }
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "WITH RECURSIVE seq(n) AS "
+                f"(SELECT 1 UNION ALL SELECT n + 1 FROM seq WHERE n < {int(count)}) "
+                f"INSERT INTO {table} ({', '.join(columns)}) "
+                f"SELECT {', '.join(columns.values())} FROM seq"
+            )
+
+    @classmethod
+    def setUpTestData(cls):
+        from auth_user.models import User
+
+        expressions = SEED_EXPRESSIONS[connection.vendor]
+
+        cls.user = User.objects.create(
+            user_id="index-user", email="index@example.com", password="!"
+        )
+        User.objects.create(user_id="other-user", email="other@example.com", password="!")
+
+        cls.seed(
+            "customer",
+            cls.customer_count,
+            {
+                "customer_id": "'cus-' || n",
+                "customer_type": "'BUSINESS'",
+                "company_name": "'Company ' || n",
+                "first_name": "'First ' || (n % 500)",
+                "last_name": "'Last ' || (n % 700)",
+                "mobile_number": "'9876543210'",
+                "email": "'customer' || n || '@example.com'",
+                "address": "'Pune'",
+            },
+        )
+        cls.seed(
+            "vehicle",
+            cls.vehicle_count,
+            {
+                "vehicle_id": "'veh-' || n",
+                "vehicle_name": "'Vehicle ' || (n % 100)",
+                "vehicle_type": "'Truck ' || (n % 10)",
+                "vehicle_number": "'KA' || n",
+                "vehicle_model": "'2021'",
+                "vehicle_color": "'White'",
+            },
+        )
+        cls.seed(
+            "invoice",
+            cls.invoice_count,
+            {
+                "invoice_id": "'inv-' || n",
+                "customer_id": f"'cus-' || (n % {cls.customer_count} + 1)",
+                "vehicle_id": f"'veh-' || (n % {cls.vehicle_count} + 1)",
+                "date": expressions["date"],
+                "loading_address": "'A'",
+                "delivery_address": "'B'",
+                "weight": "10",
+                "rate": "10",
+                "total": "100",
+                "status": "CASE WHEN n % 4 = 0 THEN 'PENDING' ELSE 'PAID' END",
+            },
+        )
+        cls.seed(
+            "notification",
+            1,
+            {
+                "notification_id": "'ntf-' || n",
+                "notification_type_id": "'INVOICE'",
+            },
+        )
+        cls.seed(
+            "user_notification_mapping",
+            cls.user_notification_count,
+            {
+                "user_notification_id": "'usn-' || n",
+                "user_id": "CASE WHEN n % 1000 = 0 THEN 'index-user' ELSE 'other-user' END",
+                "notification_id": "'ntf-1'",
+                "is_read": "(n % 3 = 0)",
+            },
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def assertUsesIndex(self, objects, index_name):
+        plan = objects.explain()
+        self.assertIn(index_name, plan, msg=plan)
+
+    def test_list_invoices(self):
+        from invoice.db_access import invoice_manager
+
+        objects = invoice_manager.list(
+            query={},
+            order_by=invoice_manager.get_pagination_ordering(),
+            select_related=["customer", "vehicle"],
+        )[:10]
+        self.assertUsesIndex(objects, "invoice_created_idx")
+
+    def test_list_invoices_by_customer_and_status(self):
+        from invoice.db_access import invoice_manager
+
+        objects = invoice_manager.list(query={"customer_id": "cus-42", "status": "PENDING"})
+        self.assertUsesIndex(objects, "invoice_customer_status_idx")
+
+    def test_list_invoices_by_vehicle(self):
+        from invoice.db_access import invoice_manager
+
+        objects = invoice_manager.list(query={"vehicle_id": "veh-42", "status": "PAID"})
+        self.assertUsesIndex(objects, "invoice_vehicle_status_idx")
+
+    def test_list_invoices_by_date(self):
+        from invoice.db_access import invoice_manager
+
+        objects = invoice_manager.list(query={"date": "2024-05-15"})
+        self.assertUsesIndex(objects, "invoice_date_idx")
+
+    def test_list_customers(self):
+        from customer.db_access import customer_manager
+
+        objects = customer_manager.list(
+            query={}, order_by=customer_manager.get_pagination_ordering()
+        )[:10]
+        self.assertUsesIndex(objects, "customer_created_idx")
+
+    def test_list_vehicles(self):
+        from vehicle.db_access import vehicle_manager
+
+        objects = vehicle_manager.list(
+            query={}, order_by=vehicle_manager.get_pagination_ordering()
+        )[:10]
+        self.assertUsesIndex(objects, "vehicle_created_idx")
+
+    def test_list_unread_notifications(self):
+        from notification.db_access import user_notification_manager
+
+        objects = user_notification_manager.list(
+            query={"user_id": self.user.user_id, "is_read": False},
+            order_by=user_notification_manager.get_pagination_ordering(),
+        )[:10]
+        self.assertUsesIndex(objects, "user_notification_unread_idx")
@@ -4,12 +4,25 @@ Test cases for the Invoice API endpoints.
 This module includes integration tests for the InvoiceViewSet, covering CRUD operations:
 - Creating a new invoice
 - Retrieving an invoice by ID
-- Listing all invoices
-- Updating an invoice
+- Listing all invoices, within a query budget independent of the number of invoices
+- Searching invoices on their customer and vehicle
+- Exporting invoices as NDJSON or CSV, optionally searched
+- Updating an invoice, optionally conditioned on its ETag
 - Deleting an invoice
+- Sending the invoice notifications through the outbox
+- Listing the notifications within a query budget independent of their number
+- Not listing the soft-deleted notifications
 """
 
+import csv
+import gzip
+import json
+from unittest import mock
+
+from django.core.management import call_command
+
 from tests_utils.base_test import BaseTest
+from tests_utils.query_budget import QueryBudget, assert_constant_queries
 
 
 class InvoiceTestCase(BaseTest):
@@ -117,6 +130,116 @@ class InvoiceTestCase(BaseTest):
         self.assertEqual(pagination["current_page"], 1)
         self.assertEqual(pagination["total_pages"], 1)
 
+    def _create_invoices(self, count):
+        """
+        Create invoices of distinct customers and vehicles.
+        """
+        for _ in range(count):
+            index = self.invoice_count = getattr(self, "invoice_count", 0) + 1
+            self.test_customer["email"] = f"test{index}@example.com"
+            self.test_vehicle["vehicle_number"] = f"KA01AB{index:04d}"
+            self._create_invoice()
+
+    def test_list_invoices_query_budget(self):
+        count = assert_constant_queries(
+            self._create_invoices, lambda: self.client.get(self.invoice_url, max_queries=2)
+        )
+        self.assertEqual(count, 2)
+
+    def test_query_budget_detects_n_plus_one(self):
+        from invoice.db_models import Invoice
+
+        self._create_invoices(3)
+
+        with self.assertRaisesMessage(AssertionError, "N+1"):
+            with QueryBudget():
+                [invoice.customer.first_name for invoice in Invoice.objects.all()]
+
+        with QueryBudget(max_queries=1):
+            [
+                invoice.customer.first_name
+                for invoice in Invoice.objects.select_related("customer")
+            ]
+
+    def test_list_invoices_embeds_customer_and_vehicle(self):
+        _, invoice_data = self._create_invoice()
+
+        response = self.client.get(self.invoice_url)
+        self.assertEqual(response.status_code, 200, msg=response.content)
+
+        invoice = response.json()["data"]["list"][0]
+        self.assertEqual(invoice["customer"]["customer_id"], invoice_data["customer_id"])
+        self.assertEqual(invoice["customer"]["email"], self.test_customer["email"])
+        self.assertEqual(invoice["vehicle"]["vehicle_id"], invoice_data["vehicle_id"])
+        self.assertEqual(
+            invoice["vehicle"]["vehicle_number"], self.test_vehicle["vehicle_number"]
+        )
+
+    def test_search_invoices(self):
+        invoice_id, _ = self._create_invoice()
+
+        response = self.client.get(self.invoice_url, data={"q": "testname corolla"})
+        self.assertEqual(response.status_code, 200, msg=response.content)
+        self.assertEqual(
+            [item["invoice_id"] for item in response.json()["data"]["list"]], [invoice_id]
+        )
+
+        response = self.client.get(self.invoice_url, data={"q": "testname truck"})
+        self.assertEqual(response.status_code, 404, msg=response.content)
+
+    def test_export_invoices(self):
+        invoice_id, invoice_data = self._create_invoice()
+
+        response = self.client.get(
+            f"{self.invoice_url}/export", data={"date_from": "2024-04-01", "date_to": "2024-06-30"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+
+        rows = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["invoice_id"], invoice_id)
+        self.assertEqual(rows[0]["customer"]["customer_id"], invoice_data["customer_id"])
+
+        response = self.client.get(f"{self.invoice_url}/export", data={"date_from": "2024-07-01"})
+        self.assertEqual(b"".join(response.streaming_content), b"")
+
+    def test_export_searched_invoices(self):
+        invoice_id, _ = self._create_invoice()
+
+        response = self.client.get(f"{self.invoice_url}/export", data={"q": "testname corolla"})
+        self.assertEqual(response.status_code, 200)
+        rows = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+        self.assertEqual([row["invoice_id"] for row in rows], [invoice_id])
+
+        response = self.client.get(f"{self.invoice_url}/export", data={"q": "testname truck"})
+        self.assertEqual(b"".join(response.streaming_content), b"")
+
+    def test_export_invoices_as_gzipped_csv(self):
+        invoice_id, invoice_data = self._create_invoice()
+
+        response = self.client.get(
+            f"{self.invoice_url}/export",
+            data={"export_format": "csv"},
+            HTTP_ACCEPT_ENCODING="gzip, deflate",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn('filename="invoices.csv"', response["Content-Disposition"])
+
+        content = gzip.decompress(b"".join(response.streaming_content)).decode()
+        rows = list(csv.DictReader(content.splitlines()))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["invoice_id"], invoice_id)
+        self.assertEqual(rows[0]["vehicle.vehicle_id"], invoice_data["vehicle_id"])
+        self.assertEqual(rows[0]["status"], invoice_data["status"])
+
+    def test_export_invoices_with_invalid_format(self):
+        response = self.client.get(f"{self.invoice_url}/export", data={"export_format": "xml"})
+        self.assertEqual(response.status_code, 400, msg=response.content)
+        self.assertEqual(response.json()["errors"]["message"], "Invalid Export Format.")
+
     def test_update_invoice(self):
         invoice_id, invoice_data = self._create_invoice()
 
@@ -167,6 +290,109 @@ class InvoiceTestCase(BaseTest):
         self.assertEqual(errors["code"], "NO_DATA_FOUND")
         self.assertEqual(errors["message"], "No Data Found.")
 
+    def test_update_invoice_with_if_match(self):
+        invoice_id, _ = self._create_invoice()
+
+        response = self.client.get(f"{self.invoice_url}/{invoice_id}")
+        self.assertEqual(response.status_code, 200, msg=response.content)
+        etag = response["ETag"]
+
+        response = self.client.patch(
+            f"{self.invoice_url}/{invoice_id}",
+            data={"status": "PENDING"},
+            HTTP_IF_MATCH=etag,
+        )
+        self.assertEqual(response.status_code, 200, msg=response.content)
+        self.assertEqual(response.json()["data"]["status"], "PENDING")
+        self.assertNotEqual(response["ETag"], etag)
+
+        response = self.client.patch(
+            f"{self.invoice_url}/{invoice_id}",
+            data={"status": "PAID"},
+            HTTP_IF_MATCH=etag,
+        )
+        self.assertEqual(response.status_code, 412, msg=response.content)
+        self.assertEqual(response.json()["errors"]["code"], "PRECONDITION_FAILED")
+
+        response = self.client.get(f"{self.invoice_url}/{invoice_id}")
+        self.assertEqual(response.json()["data"]["status"], "PENDING")
+
+    def test_create_invoice_enqueues_notification(self):
+        from notification.constants import OutboxStatus
+        from notification.db_models import NotificationOutbox, UserNotification
+
+        self._create_invoice()
+
+        outbox = NotificationOutbox.objects.get()
+        self.assertEqual(outbox.status, OutboxStatus.PENDING)
+        self.assertFalse(UserNotification.objects.exists())
+
+        call_command("process_notification_outbox", once=True)
+
+        outbox.refresh_from_db()
+        self.assertEqual(outbox.status, OutboxStatus.SENT)
+
+        user_notification = UserNotification.objects.get()
+        self.assertEqual(user_notification.notification_id, outbox.outbox_id)
+        self.assertEqual(user_notification.user_id, outbox.user_ids[0])
+
+    def _create_notifications(self, count):
+        self._create_invoices(count)
+        call_command("process_notification_outbox", once=True)
+
+    def test_list_notifications_query_budget(self):
+        def list_notifications():
+            response = self.client.get("/notifications", max_queries=2)
+            self.assertEqual(response.status_code, 200, msg=response.content)
+
+        count = assert_constant_queries(self._create_notifications, list_notifications)
+        self.assertEqual(count, 2)
+
+    def test_list_notifications_skips_deleted_notifications(self):
+        from notification.db_models import Notification, UserNotification
+
+        self._create_notifications(2)
+        deleted = UserNotification.objects.order_by("pk").first().notification_id
+        Notification.objects.filter(pk=deleted).update(is_deleted=True)
+
+        response = self.client.get("/notifications")
+        self.assertEqual(response.status_code, 200, msg=response.content)
+
+        notifications = response.json()["data"]["list"]
+        self.assertEqual(len(notifications), 1)
+        self.assertNotEqual(notifications[0]["notification"]["notification_id"], deleted)
+
+    def test_notification_outbox_retries_with_backoff(self):
+        from notification.constants import OutboxStatus
+        from notification.db_models import NotificationOutbox, UserNotification
+        from notification.db_access import notification_outbox_manager
+
+        self._create_invoice()
+
+        with mock.patch.object(
+            notification_outbox_manager, "deliver", side_effect=RuntimeError("down")
+        ):
+            call_command("process_notification_outbox", once=True)
+
+        outbox = NotificationOutbox.objects.get()
+        self.assertEqual(outbox.status, OutboxStatus.PENDING)
+        self.assertEqual(outbox.attempts, 1)
+        self.assertGreater(outbox.available_dtm, outbox.created_dtm)
+
+        # Not due yet, so the worker leaves it alone.
+        call_command("process_notification_outbox", once=True)
+        self.assertFalse(UserNotification.objects.exists())
+
+        with mock.patch.object(
+            notification_outbox_manager, "deliver", side_effect=RuntimeError("down")
+        ):
+            NotificationOutbox.objects.update(available_dtm=outbox.created_dtm)
+            call_command("process_notification_outbox", once=True, max_attempts=2)
+
+        outbox.refresh_from_db()
+        self.assertEqual(outbox.status, OutboxStatus.FAILED)
+        self.assertEqual(outbox.attempts, 2)
+
     def test_delete_invoice(self):
         invoice_id, _ = self._create_invoice()
         response = self.client.delete(f"{self.invoice_url}/{invoice_id}")
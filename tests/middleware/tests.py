@@ -0,0 +1,218 @@
+"""
+Test cases for the response headers middleware.
+
+This module includes integration tests for the AddResponseHeadersMiddleware:
+- The Server-Timing header with the query count and the phases of the request
+- The logging of the slow requests with their SQL statements
+
+and for the IdentityMapMiddleware:
+- Reusing the rows and the existence checks read within a request
+- Discarding the rows of a model once written
+- Reading the rows by primary key without ORDER BY
+- Re-reading a row changed by another writer when a conditional update loses the race
+"""
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from tests_utils.base_test import BaseTest
+
+
+class ResponseHeadersTestCase(BaseTest):
+    """
+    TestCase for the headers added by AddResponseHeadersMiddleware.
+    """
+
+    def setUp(self, *args, **kwargs):
+        super().setUp(*args, **kwargs)
+        self.customer_url = "/customer"
+        self.test_customer = {
+            "customer_type": "BUSINESS",
+            "company_name": "test",
+            "first_name": "Test",
+            "last_name": "TestName",
+            "mobile_number": "9876543210",
+            "email": "test@example.com",
+            "address": "1234 MG Road, Pune, Maharashtra",
+        }
+
+    def get_server_timing(self, response) -> dict:
+        metrics = {}
+
+        for metric in response["Server-Timing"].split(", "):
+            name, *params = metric.split(";")
+            metrics[name] = dict(param.split("=", 1) for param in params)
+
+        return metrics
+
+    def test_server_timing(self):
+        response = self.client.post(self.customer_url, data=self.test_customer)
+        self.assertEqual(response.status_code, 201, msg=response.content)
+
+        response = self.client.get(self.customer_url)
+        self.assertEqual(response.status_code, 200, msg=response.content)
+
+        metrics = self.get_server_timing(response)
+        self.assertEqual(list(metrics), ["db", "serialize", "app", "total"])
+        # The count and the page of customers.
+        self.assertRegex(metrics["db"]["desc"], r'^"[2-9] queries"$')
+
+        phases = sum(float(metrics[name]["dur"]) for name in ("db", "serialize", "app"))
+        self.assertAlmostEqual(phases, float(metrics["total"]["dur"]), delta=0.1)
+
+    @override_settings(SLOW_REQUEST_THRESHOLD_MS=0)
+    def test_slow_request_is_logged(self):
+        with self.assertLogs(level="WARNING") as logs:
+            response = self.client.get(self.customer_url, data={"company_name": "secret"})
+
+        self.assertEqual(response.status_code, 404, msg=response.content)
+
+        log = "\n".join(logs.output)
+        self.assertIn("Slow request GET /api/customer", log)
+        self.assertIn('FROM "customer"', log)
+        self.assertNotIn("secret", log)
+
+    def test_fast_request_is_not_logged(self):
+        self.client.post(self.customer_url, data=self.test_customer)
+
+        with self.assertNoLogs(level="WARNING"):
+            response = self.client.get(self.customer_url)
+
+        self.assertIn("Server-Timing", response)
+
+
+class IdentityMapTestCase(BaseTest):
+    """
+    TestCase for the identity map activated by IdentityMapMiddleware.
+    """
+
+    def setUp(self, *args, **kwargs):
+        super().setUp(*args, **kwargs)
+        self.test_vehicle = {
+            "vehicle_name": "Toyota Corolla",
+            "vehicle_type": "Sedan",
+            "vehicle_number": "KA01AB1234",
+            "vehicle_model": "2021",
+            "vehicle_color": "White",
+        }
+
+    def test_rows_are_reused(self):
+        from base.db_access.identity_map import IdentityMap
+        from vehicle.db_access import vehicle_manager
+
+        vehicle = vehicle_manager.create(self.test_vehicle)
+        other = vehicle_manager.create({**self.test_vehicle, "vehicle_number": "KA01AB5678"})
+        cache.clear()
+
+        with IdentityMap().activate():
+            with self.assertNumQueries(1):
+                obj = vehicle_manager.get({"vehicle_id": vehicle.vehicle_id})
+                self.assertIs(vehicle_manager.get({"pk": vehicle.vehicle_id}), obj)
+                self.assertTrue(vehicle_manager.exists({"vehicle_id": vehicle.vehicle_id}))
+
+            with self.assertNumQueries(1):
+                self.assertIsNone(vehicle_manager.get({"vehicle_id": "missing"}))
+                self.assertFalse(vehicle_manager.exists({"vehicle_id": "missing"}))
+
+            with self.assertNumQueries(1):
+                self.assertTrue(vehicle_manager.exists({"vehicle_type": "Sedan"}))
+                self.assertTrue(vehicle_manager.exists({"vehicle_type": "Sedan"}))
+
+            with self.assertNumQueries(1):
+                ids = [vehicle.vehicle_id, other.vehicle_id]
+                self.assertEqual(
+                    set(vehicle_manager.get_objects_mapping({"pk__in": ids})), set(ids)
+                )
+                vehicle_manager.get({"vehicle_id": other.vehicle_id})
+
+            # The written model is read again.
+            vehicle_manager.update({"vehicle_color": "Black"}, {"vehicle_id": vehicle.vehicle_id})
+            with self.assertNumQueries(1):
+                obj = vehicle_manager.get({"vehicle_id": vehicle.vehicle_id})
+            self.assertEqual(obj.vehicle_color, "Black")
+
+        # No identity map out of a request.
+        cache.clear()
+        with self.assertNumQueries(2):
+            vehicle_manager.get({"vehicle_id": vehicle.vehicle_id})
+            vehicle_manager.exists({"vehicle_id": vehicle.vehicle_id})
+
+    def test_get_by_pk_is_not_ordered(self):
+        from vehicle.db_access import vehicle_manager
+
+        vehicle = vehicle_manager.create(self.test_vehicle)
+        cache.clear()
+
+        with CaptureQueriesContext(connection) as context:
+            vehicle_manager.get({"vehicle_id": vehicle.vehicle_id})
+            vehicle_manager.get({"vehicle_number": vehicle.vehicle_number})
+
+        self.assertNotIn("ORDER BY", context.captured_queries[0]["sql"])
+        self.assertIn("ORDER BY", context.captured_queries[1]["sql"])
+
+    def test_lost_race_rereads_the_row(self):
+        from django.utils import timezone
+
+        from base.db_access.identity_map import IdentityMap
+        from invoice.db_access import invoice_manager
+        from invoice.db_models import Invoice
+
+        response = self.client.post("/vehicle", data=self.test_vehicle)
+        vehicle_id = response.json()["data"]["vehicle_id"]
+        response = self.client.post(
+            "/customer",
+            data={
+                "customer_type": "BUSINESS",
+                "company_name": "test",
+                "first_name": "test",
+                "last_name": "name",
+                "mobile_number": "9876543210",
+                "email": "test@example.com",
+                "address": "1234 MG Road, Pune, Maharashtra",
+            },
+        )
+        customer_id = response.json()["data"]["customer_id"]
+        response = self.client.post(
+            "/invoice",
+            data={
+                "customer_id": customer_id,
+                "vehicle_id": vehicle_id,
+                "date": "2024-05-15",
+                "loading_address": "Warehouse A, Industrial Area",
+                "delivery_address": "Retail Store B, City Center",
+                "weight": 100,
+                "rate": 1,
+                "total": 100,
+                "status": "PENDING",
+            },
+        )
+        self.assertEqual(response.status_code, 201, msg=response.content)
+        invoice_id = response.json()["data"]["invoice_id"]
+
+        with IdentityMap().activate():
+            invoice_manager.get({"invoice_id": invoice_id})
+
+            # Another writer wins the race, the kept invoice is stale.
+            Invoice.objects.filter(pk=invoice_id).update(
+                delivery_address="Changed", updated_dtm=timezone.now()
+            )
+
+            invoice = invoice_manager.update({"status": "PAID"}, {"invoice_id": invoice_id})
+
+        self.assertEqual(invoice.status, "PAID")
+        self.assertEqual(invoice.delivery_address, "Changed")
+
+    def test_update_request(self):
+        response = self.client.post("/vehicle", data=self.test_vehicle)
+        self.assertEqual(response.status_code, 201, msg=response.content)
+        vehicle_id = response.json()["data"]["vehicle_id"]
+        cache.clear()
+
+        # The vehicle is read once by primary key and written with a single UPDATE.
+        response = self.client.patch(
+            f"/vehicle/{vehicle_id}", data={"vehicle_color": "Black"}, max_queries=2
+        )
+        self.assertEqual(response.status_code, 200, msg=response.content)
+        self.assertEqual(response.json()["data"]["vehicle_color"], "Black")
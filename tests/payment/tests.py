@@ -0,0 +1,266 @@
+"""
+Test cases for the Payment API endpoints.
+
+This module includes integration tests for the PaymentViewSet, covering:
+- Summing paid and pending amounts per customer
+- Listing the payment summaries within a query budget independent of the number of customers
+- Ignoring soft-deleted invoices
+- Ordering by the outstanding balance
+- Paginating with a cursor on the customer columns, NULL values included
+- Filtering customers with a pending amount
+- Keeping the customer balance ledger in sync with invoice updates
+- Rebuilding and verifying the ledger with the management command
+"""
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from payment.db_models import CustomerBalance
+from tests_utils.base_test import BaseTest
+from tests_utils.query_budget import assert_constant_queries
+
+
+class PaymentTestCase(BaseTest):
+    """
+    TestCase for Payment API endpoints.
+    """
+
+    def setUp(self, *args, **kwargs):
+        super().setUp(*args, **kwargs)
+        self.payment_url = "/payment"
+        self.invoice_url = "/invoice"
+        self.customer_url = "/customer"
+        self.vehicle_url = "/vehicle"
+
+        response = self.client.post(
+            self.vehicle_url,
+            data={
+                "vehicle_name": "Tata Ace",
+                "vehicle_type": "Truck",
+                "vehicle_number": "MH12AB1234",
+                "vehicle_model": "2022",
+                "vehicle_color": "White",
+            },
+        )
+        self.assertIn(response.status_code, [200, 201], msg=response.content)
+        self.vehicle_id = response.json()["data"]["vehicle_id"]
+
+    def _create_customer(self, first_name, email):
+        response = self.client.post(
+            self.customer_url,
+            data={
+                "customer_type": "INDIVIDUAL",
+                "first_name": first_name,
+                "last_name": "Customer",
+                "mobile_number": "9876543210",
+                "email": email,
+                "address": "1234 MG Road, Pune, Maharashtra",
+            },
+        )
+        self.assertIn(response.status_code, [200, 201], msg=response.content)
+        return response.json()["data"]["customer_id"]
+
+    def _create_invoice(self, customer_id, total, status):
+        response = self.client.post(
+            self.invoice_url,
+            data={
+                "customer_id": customer_id,
+                "vehicle_id": self.vehicle_id,
+                "date": "2024-05-15",
+                "loading_address": "Warehouse A, Industrial Area",
+                "delivery_address": "Retail Store B, City Center",
+                "weight": 100,
+                "rate": 1,
+                "total": total,
+                "status": status,
+            },
+        )
+        self.assertIn(response.status_code, [200, 201], msg=response.content)
+        return response.json()["data"]["invoice_id"]
+
+    def _get_payments(self, **params):
+        response = self.client.get(self.payment_url, data=params)
+        self.assertEqual(response.status_code, 200, msg=response.content)
+        return response.json()["data"]
+
+    def test_list_payment_summary(self):
+        customer_id = self._create_customer("First", "first@example.com")
+        self._create_invoice(customer_id, 100, "PAID")
+        self._create_invoice(customer_id, 50, "PENDING")
+        deleted_invoice_id = self._create_invoice(customer_id, 1000, "PENDING")
+
+        response = self.client.delete(f"{self.invoice_url}/{deleted_invoice_id}")
+        self.assertEqual(response.status_code, 204)
+
+        data = self._get_payments()
+        payment = data["list"][0]
+
+        self.assertEqual(payment["customer_id"], customer_id)
+        self.assertEqual(payment["full_name"], "First Customer")
+        self.assertEqual(payment["invoice_count"], 2)
+        self.assertEqual(payment["total_amount"], 150)
+        self.assertEqual(payment["paid_amount"], 100)
+        self.assertEqual(payment["pending_amount"], 50)
+        self.assertEqual(data["pagination"]["count"], 1)
+
+    def _create_customers_with_invoices(self, count):
+        for _ in range(count):
+            index = self.customer_count = getattr(self, "customer_count", 0) + 1
+            customer_id = self._create_customer(f"Customer{index}", f"test{index}@example.com")
+            self._create_invoice(customer_id, 100, "PAID")
+            self._create_invoice(customer_id, 50, "PENDING")
+
+    def test_list_payment_summary_query_budget(self):
+        def list_payments(**params):
+            response = self.client.get(self.payment_url, data=params, max_queries=2)
+            self.assertEqual(response.status_code, 200, msg=response.content)
+
+        count = assert_constant_queries(self._create_customers_with_invoices, list_payments)
+        self.assertEqual(count, 2)
+
+        count = assert_constant_queries(
+            self._create_customers_with_invoices,
+            lambda: list_payments(ordering="-pending_amount"),
+            sizes=(21, 25),
+        )
+        self.assertEqual(count, 2)
+
+    def test_list_payment_summary_ordering_and_filter(self):
+        paid_customer_id = self._create_customer("Paid", "paid@example.com")
+        small_customer_id = self._create_customer("Small", "small@example.com")
+        large_customer_id = self._create_customer("Large", "large@example.com")
+
+        self._create_invoice(paid_customer_id, 500, "PAID")
+        self._create_invoice(small_customer_id, 10, "PENDING")
+        self._create_invoice(large_customer_id, 300, "PENDING")
+
+        data = self._get_payments(ordering="-pending_amount")
+        self.assertEqual(
+            [payment["customer_id"] for payment in data["list"]],
+            [large_customer_id, small_customer_id, paid_customer_id],
+        )
+
+        data = self._get_payments(has_pending="true", ordering="pending_amount")
+        self.assertEqual(
+            [payment["customer_id"] for payment in data["list"]],
+            [small_customer_id, large_customer_id],
+        )
+        self.assertEqual(data["pagination"]["count"], 2)
+
+    def test_list_payment_summary_with_cursor(self):
+        from customer.db_models import Customer
+
+        customer_ids = []
+        for index in range(3):
+            customer_id = self._create_customer(f"Customer{index}", f"test{index}@example.com")
+            self._create_invoice(customer_id, 100, "PENDING")
+            customer_ids.append(customer_id)
+
+        first, unnamed, last = customer_ids
+        Customer.objects.filter(customer_id=unnamed).update(first_name=None)
+
+        def list_pages(**params):
+            listed, cursor = [], ""
+            while cursor is not None:
+                data = self._get_payments(cursor=cursor, page_size=1, **params)
+                listed += [payment["customer_id"] for payment in data["list"]]
+                cursor = data["pagination"]["next_cursor"]
+            return listed
+
+        # The default ordering follows the customer relation.
+        self.assertEqual(list_pages(), [first, unnamed, last])
+
+        # The NULL names sort first in ascending order and last in descending order.
+        self.assertEqual(list_pages(ordering="first_name"), [unnamed, first, last])
+        self.assertEqual(list_pages(ordering="-first_name"), [last, first, unnamed])
+
+    def test_list_payment_summary_with_invalid_ordering(self):
+        self._create_customer("First", "first@example.com")
+
+        response = self.client.get(self.payment_url, data={"ordering": "email"})
+        self.assertEqual(response.status_code, 400, msg=response.content)
+        self.assertEqual(response.json()["errors"]["message"], "Invalid Ordering.")
+
+    def test_payment_summary_follows_invoice_updates(self):
+        first_customer_id = self._create_customer("First", "first@example.com")
+        second_customer_id = self._create_customer("Second", "second@example.com")
+        invoice_id = self._create_invoice(first_customer_id, 200, "PENDING")
+
+        response = self.client.patch(
+            f"{self.invoice_url}/{invoice_id}", data={"status": "PAID"}
+        )
+        self.assertEqual(response.status_code, 200, msg=response.content)
+
+        payment = self._get_payments(first_name="First")["list"][0]
+        self.assertEqual(payment["paid_amount"], 200)
+        self.assertEqual(payment["pending_amount"], 0)
+
+        response = self.client.patch(
+            f"{self.invoice_url}/{invoice_id}",
+            data={"customer_id": second_customer_id, "total": 120},
+        )
+        self.assertEqual(response.status_code, 200, msg=response.content)
+
+        payments = {
+            payment["customer_id"]: payment for payment in self._get_payments()["list"]
+        }
+        self.assertEqual(payments[first_customer_id]["invoice_count"], 0)
+        self.assertEqual(payments[first_customer_id]["total_amount"], 0)
+        self.assertEqual(payments[second_customer_id]["invoice_count"], 1)
+        self.assertEqual(payments[second_customer_id]["paid_amount"], 120)
+
+    def test_rebuild_customer_balance(self):
+        customer_id = self._create_customer("First", "first@example.com")
+        self._create_invoice(customer_id, 100, "PAID")
+        self._create_invoice(customer_id, 40, "PENDING")
+
+        call_command("rebuild_customer_balance", verify=True, workers=1)
+
+        CustomerBalance.objects.filter(customer_id=customer_id).update(paid_amount=0)
+        with self.assertRaises(CommandError):
+            call_command("rebuild_customer_balance", verify=True, workers=1)
+
+        call_command("rebuild_customer_balance", workers=1, chunk_size=1)
+        call_command("rebuild_customer_balance", verify=True, workers=1)
+
+        # A missing ledger row is rebuilt in place of the stale sums, in the current thread by
+        # default on SQLite.
+        CustomerBalance.objects.filter(customer_id=customer_id).delete()
+        call_command("rebuild_customer_balance")
+        call_command("rebuild_customer_balance", verify=True)
+
+        payment = self._get_payments()["list"][0]
+        self.assertEqual(payment["invoice_count"], 2)
+        self.assertEqual(payment["paid_amount"], 100)
+        self.assertEqual(payment["pending_amount"], 40)
+
+    def test_payment_summary_follows_invoice_bulk_upsert(self):
+        from invoice.db_access import invoice_manager
+
+        customer_id = self._create_customer("First", "first@example.com")
+        invoice_id = self._create_invoice(customer_id, 100, "PENDING")
+
+        row = {
+            "customer_id": customer_id,
+            "vehicle_id": self.vehicle_id,
+            "date": "2024-05-15",
+            "loading_address": "Warehouse A, Industrial Area",
+            "delivery_address": "Retail Store B, City Center",
+            "weight": 100,
+            "rate": 1,
+            "created_by": "erp",
+            "updated_by": "erp",
+        }
+        invoice_manager.bulk_upsert(
+            [
+                {**row, "invoice_id": invoice_id, "total": 100, "status": "PAID"},
+                {**row, "total": 30, "status": "PENDING"},
+            ],
+            unique_fields=["invoice_id"],
+        )
+
+        payment = self._get_payments()["list"][0]
+        self.assertEqual(payment["invoice_count"], 2)
+        self.assertEqual(payment["total_amount"], 130)
+        self.assertEqual(payment["paid_amount"], 100)
+        self.assertEqual(payment["pending_amount"], 30)
@@ -0,0 +1,310 @@
+"""
+Test cases for the declarative serialization of the models.
+
+This module includes tests for base.serialization.Serialization, covering:
+- Serializing an instance and a values_list row to the same dictionary
+- Nesting the serialization of a relation
+- Listing the rows from their serialized columns only, without model instances
+- Selecting the keys of the `fields` query param, nested keys included, on the list and
+  retrieve endpoints with only their columns fetched
+- Listing the invoices with their relations included once each by id
+- Rendering the lists in the columnar format, with `?format=columnar` or the `Accept` header
+- Rejecting the invalid serializations and the keys which are not allowed
+"""
+
+from unittest import mock
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase
+
+from tests_utils.base_test import BaseTest
+
+
+class SerializationTestCase(BaseTest):
+    """
+    TestCase for the serialization of the models and the list endpoints.
+    """
+
+    def setUp(self, *args, **kwargs):
+        super().setUp(*args, **kwargs)
+        self.test_customer = {
+            "customer_type": "BUSINESS",
+            "company_name": "test",
+            "first_name": "test",
+            "last_name": "name",
+            "mobile_number": "9876543210",
+            "email": "test@example.com",
+            "address": "1234 MG Road, Pune, Maharashtra",
+        }
+        self.test_vehicle = {
+            "vehicle_name": "Toyota Corolla",
+            "vehicle_type": "Sedan",
+            "vehicle_number": "KA01AB1234",
+            "vehicle_model": "2021",
+            "vehicle_color": "White",
+        }
+
+    def _create_invoice(self):
+        response = self.client.post("/customer", data=self.test_customer)
+        self.assertEqual(response.status_code, 201, msg=response.content)
+        customer_id = response.json()["data"]["customer_id"]
+
+        response = self.client.post("/vehicle", data=self.test_vehicle)
+        self.assertEqual(response.status_code, 201, msg=response.content)
+        vehicle_id = response.json()["data"]["vehicle_id"]
+
+        response = self.client.post(
+            "/invoice",
+            data={
+                "customer_id": customer_id,
+                "vehicle_id": vehicle_id,
+                "date": "2024-05-15",
+                "loading_address": "Warehouse A, Industrial Area",
+                "delivery_address": "Retail Store B, City Center",
+                "weight": 12250.50,
+                "rate": 8.75,
+                "total": 10941.88,
+                "status": "PAID",
+            },
+        )
+        self.assertEqual(response.status_code, 201, msg=response.content)
+        return response.json()["data"]["invoice_id"]
+
+    def test_instance_and_row(self):
+        from customer.db_models import Customer
+        from invoice.db_models import Invoice
+
+        invoice_id = self._create_invoice()
+
+        for model, pk in (
+            (Invoice, invoice_id),
+            (Customer, Invoice.objects.get(pk=invoice_id).customer_id),
+        ):
+            serialization = model.serialization
+            obj = model.objects.get(pk=pk)
+            row = model.objects.filter(pk=pk).values_list(*serialization.columns).get()
+
+            self.assertEqual(obj.to_dict(), serialization.from_row(row))
+
+        customer = Customer.objects.get()
+        self.assertEqual(customer.to_dict()["full_name"], "Test Name")
+        self.assertEqual(Invoice.objects.get().to_dict()["total"], 10941.88)
+
+    def test_nested_relation(self):
+        from base.serialization import Nested
+        from customer.db_models import Customer
+        from invoice.db_models import Invoice
+
+        invoice_id = self._create_invoice()
+        serialization = Invoice.serialization.replace(
+            Nested("customer", Customer.serialization)
+        )
+
+        self.assertIn("customer__first_name", serialization.columns)
+
+        invoice = Invoice.objects.select_related("customer").get(pk=invoice_id)
+        row = Invoice.objects.values_list(*serialization.columns).get(pk=invoice_id)
+
+        data = serialization.from_row(row)
+        self.assertEqual(data, serialization.to_dict(invoice))
+        self.assertEqual(data["customer"], invoice.customer.to_dict())
+        self.assertEqual(list(data)[:3], ["invoice_id", "customer", "vehicle"])
+
+    def test_list_without_instances(self):
+        from invoice.db_models import Invoice
+
+        invoice_id = self._create_invoice()
+
+        response = self.client.get(f"/invoice/{invoice_id}")
+        retrieved = response.json()["data"]
+
+        with mock.patch.object(Invoice, "from_db", side_effect=AssertionError):
+            response = self.client.get("/invoice", max_queries=2)
+        self.assertEqual(response.status_code, 200, msg=response.content)
+
+        listed = response.json()["data"]["list"][0]
+        self.assertEqual(listed["customer"]["customer_id"], retrieved["customer"])
+        self.assertEqual(listed["customer"]["full_name"], "Test Name")
+        self.assertEqual(listed["vehicle"]["vehicle_number"], "KA01AB1234")
+        self.assertEqual(
+            {key: value for key, value in listed.items() if key not in ("customer", "vehicle")},
+            {key: value for key, value in retrieved.items() if key not in ("customer", "vehicle")},
+        )
+
+        # Only the serialized columns are selected.
+        sql = response.queries[-1]
+        self.assertIn('"customer"."first_name"', sql)
+        self.assertNotIn('"invoice"."created_by"', sql)
+
+    def test_list_fields(self):
+        self._create_invoice()
+
+        response = self.client.get(
+            "/invoice?fields=invoice_id,date,status,total,customer.full_name", max_queries=2
+        )
+        self.assertEqual(response.status_code, 200, msg=response.content)
+
+        listed = response.json()["data"]["list"][0]
+        self.assertEqual(list(listed), ["invoice_id", "customer", "date", "total", "status"])
+        self.assertEqual(listed["customer"], {"full_name": "Test Name"})
+        self.assertEqual(listed["total"], 10941.88)
+
+        sql = response.queries[-1]
+        self.assertIn('"customer"."first_name"', sql)
+        self.assertNotIn('"invoice"."loading_address"', sql)
+        self.assertNotIn('"vehicle"', sql)
+
+        response = self.client.get("/invoice?fields=invoice_id&cursor=")
+        self.assertEqual(response.status_code, 200, msg=response.content)
+        self.assertEqual(list(response.json()["data"]["list"][0]), ["invoice_id"])
+
+        for fields in ("created_by", "customer.created_by", "invoice_id.date", ","):
+            response = self.client.get(f"/invoice?fields={fields}")
+            self.assertEqual(response.status_code, 400, msg=fields)
+
+    def test_list_include(self):
+        from invoice.db_models import Invoice
+
+        invoice_id = self._create_invoice()
+        invoice = Invoice.objects.get(pk=invoice_id)
+        for _ in range(2):
+            Invoice.objects.create(
+                customer_id=invoice.customer_id,
+                vehicle_id=invoice.vehicle_id,
+                date=invoice.date,
+                loading_address=invoice.loading_address,
+                delivery_address=invoice.delivery_address,
+                weight=invoice.weight,
+                rate=invoice.rate,
+                total=invoice.total,
+                status=invoice.status,
+            )
+
+        embedded = self.client.get("/invoice").json()["data"]["list"]
+
+        for query in ("include=customer,vehicle", "include=customer,vehicle&cursor="):
+            response = self.client.get(f"/invoice?{query}", max_queries=2)
+            self.assertEqual(response.status_code, 200, msg=response.content)
+
+            data = response.json()["data"]
+            self.assertEqual(len(data["list"]), 3)
+            self.assertEqual({row["customer"] for row in data["list"]}, {invoice.customer_id})
+            self.assertEqual(
+                data["included"],
+                {
+                    "customer": {invoice.customer_id: embedded[0]["customer"]},
+                    "vehicle": {invoice.vehicle_id: embedded[0]["vehicle"]},
+                },
+            )
+            self.assertIn("pagination", data)
+
+        response = self.client.get("/invoice?include=customer&fields=invoice_id,customer")
+        data = response.json()["data"]
+        self.assertEqual(list(data["list"][0]), ["invoice_id", "customer"])
+        self.assertEqual(list(data["included"]), ["customer"])
+
+        response = self.client.get("/invoice?include=created_by")
+        self.assertEqual(response.status_code, 400, msg=response.content)
+
+    def test_list_columnar(self):
+        self._create_invoice()
+
+        rows = self.client.get("/invoice").json()["data"]["list"]
+
+        response = self.client.get("/invoice?format=columnar")
+        self.assertEqual(response.status_code, 200, msg=response.content)
+        self.assertEqual(response["Content-Type"], "application/vnd.tms.columnar+json")
+
+        data = response.json()["data"]
+        self.assertIn("pagination", data)
+        self.assertEqual(data["list"]["columns"][:2], ["invoice_id", "customer.customer_id"])
+        self.assertEqual(data["list"]["data"]["customer.full_name"], ["Test Name"])
+        self.assertEqual(data["list"]["data"]["total"], [rows[0]["total"]])
+        self.assertEqual(
+            len(data["list"]["columns"]),
+            len(rows[0]) - 2 + len(rows[0]["customer"]) + len(rows[0]["vehicle"]),
+        )
+
+        response = self.client.get(
+            "/customer?fields=customer_id,full_name",
+            HTTP_ACCEPT="application/vnd.tms.columnar+json",
+        )
+        self.assertEqual(response.status_code, 200, msg=response.content)
+        self.assertEqual(
+            response.json()["data"]["list"],
+            {
+                "columns": ["customer_id", "full_name"],
+                "data": {
+                    "customer_id": [rows[0]["customer"]["customer_id"]],
+                    "full_name": ["Test Name"],
+                },
+            },
+        )
+
+        # The rows of the lists built without a serialization are transposed by the renderer.
+        from utils.response.renderers import to_columnar
+
+        self.assertEqual(
+            to_columnar([{"id": 1, "owner": {"email": "a"}}, {"id": 2, "owner": {"email": "b"}}]),
+            {"columns": ["id", "owner.email"], "data": {"id": [1, 2], "owner.email": ["a", "b"]}},
+        )
+
+        response = self.client.get("/invoice?format=unknown")
+        self.assertEqual(response.status_code, 404, msg=response.content)
+
+    def test_retrieve_fields(self):
+        invoice_id = self._create_invoice()
+
+        response = self.client.get(f"/invoice/{invoice_id}")
+        etag = response["ETag"]
+
+        response = self.client.get(f"/invoice/{invoice_id}?fields=status,total", max_queries=1)
+        self.assertEqual(response.status_code, 200, msg=response.content)
+        self.assertEqual(response.json()["data"], {"status": "PAID", "total": 10941.88})
+        self.assertEqual(response["ETag"], etag)
+        self.assertNotIn('"invoice"."date"', response.queries[-1])
+
+        response = self.client.get(f"/invoice/{invoice_id}?fields=customer.full_name")
+        self.assertEqual(response.status_code, 400, msg=response.content)
+
+
+class SerializationSpecTestCase(SimpleTestCase):
+    """
+    TestCase for the validation of the serializations.
+    """
+
+    def test_invalid_serialization(self):
+        from base.serialization import Field, Serialization
+
+        with self.assertRaises(ImproperlyConfigured):
+            Serialization("name", Field("name", "other_name"))
+
+        with self.assertRaises(ImproperlyConfigured):
+            Field("full_name", "first_name", "last_name")
+
+        with self.assertRaises(ImproperlyConfigured):
+            Field("name", "name); import os")
+
+        with self.assertRaises(ImproperlyConfigured):
+            Serialization("name").replace(Field("other"))
+
+        with self.assertRaises(ImproperlyConfigured):
+            Serialization("name").select(["other"])
+
+    def test_select(self):
+        from base.serialization import Field, Nested, Serialization
+
+        serialization = Serialization(
+            "id",
+            Field("name", "first_name", "last_name", transform=lambda *names: " ".join(names)),
+            Nested("owner", Serialization("id", "email")),
+        )
+
+        selection = serialization.select(["owner.email", "name"])
+        self.assertIs(selection, serialization.select(["name", "owner.email"]))
+        self.assertEqual(selection.columns, ("first_name", "last_name", "owner__email"))
+        self.assertEqual(
+            selection.from_row(("a", "b", "a@example.com")),
+            {"name": "a b", "owner": {"email": "a@example.com"}},
+        )
+        self.assertEqual(serialization.select(["owner"]).columns, ("owner__id", "owner__email"))
@@ -4,12 +4,13 @@ Test cases for the Vehicle API endpoints.
 This module includes integration tests for the VehicleViewSet, covering CRUD operations:
 - Creating a new vehicle
 - Retrieving a vehicle by ID
-- Listing all vehicles
+- Listing all vehicles, within a query budget independent of the number of vehicles
 - Updating a vehicle
 - Deleting a vehicle
 """
 
 from tests_utils.base_test import BaseTest
+from tests_utils.query_budget import assert_constant_queries
 
 
 class VehicleTestCase(BaseTest):
@@ -108,6 +109,19 @@ class VehicleTestCase(BaseTest):
         self.assertEqual(pagination["current_page"], 1)
         self.assertEqual(pagination["total_pages"], 1)
 
+    def _create_vehicles(self, count):
+        for _ in range(count):
+            index = self.vehicle_count = getattr(self, "vehicle_count", 0) + 1
+            self._create_vehicle({**self.test_vehicle, "vehicle_number": f"KA01AB{index:04d}"})
+
+    def test_list_vehicles_query_budget(self):
+        def list_vehicles():
+            response = self.client.get(self.vehicle_url, max_queries=2)
+            self.assertEqual(response.status_code, 200, msg=response.content)
+
+        count = assert_constant_queries(self._create_vehicles, list_vehicles)
+        self.assertEqual(count, 2)
+
     def test_update_vehicle(self):
         vehicle_id = self._create_vehicle()
         update_data = {
@@ -1,9 +1,11 @@
 from tests_utils.load_data import load_test_data
 from tests_utils.test_client import TestClient
+from django.core.cache import cache
 from django.test import TestCase
 
 
 class BaseTest(TestCase):
     def setUp(self):
+        cache.clear()
         load_test_data()
         self.client: TestClient = TestClient()
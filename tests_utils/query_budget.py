@@ -0,0 +1,158 @@
+"""
+Query budgets for the test suite.
+`QueryBudget` records the SQL statements run in a block, as a context manager or a decorator,
+and fails the test when their number exceeds the budget or when the same statement is run
+repeatedly with different params, the signature of an N+1 query.
+`assert_constant_queries` runs a block over datasets of growing sizes and fails when
+the number of queries grows with the number of rows.
+"""
+
+import re
+from collections import Counter
+from contextvars import ContextVar
+from contextlib import ContextDecorator, ExitStack, contextmanager
+
+from django.db import connections
+
+# Savepoints are opened by the atomic blocks nested in the test transaction, not by the code under test.
+IGNORED_STATEMENTS = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
+IN_PLACEHOLDERS = re.compile(r"IN \((?:%s(?:, )?)+\)")
+
+is_ignored: ContextVar = ContextVar("query_budget_ignored", default=False)
+
+
+@contextmanager
+def ignore_queries():
+    """
+    Leave the queries run in the block out of every budget, e.g. the setup of a request.
+    """
+    token = is_ignored.set(True)
+    try:
+        yield
+    finally:
+        is_ignored.reset(token)
+
+
+def get_shape(sql: str) -> str:
+    """
+    Return the shape of a statement, the statements of a same shape differ only in their params.
+    The `IN (%s, %s, ...)` lists are collapsed as their length depends on the params.
+    """
+    return IN_PLACEHOLDERS.sub("IN (...)", sql)
+
+
+class QueryBudget(ContextDecorator):
+    __doc__ = """
+    This class records the queries run on every database connection in a block.
+    Args:
+        max_queries (int, optional): The maximum number of queries, None for no budget.
+        max_repeats (int, optional): The maximum number of queries of a same shape,
+            None to allow any. Defaults to 1, every statement shape is run once.
+    Example:
+        with QueryBudget(3) as budget:
+            client.get("/invoice")
+
+        @QueryBudget(max_queries=2)
+        def test_list_customers(self): ...
+    """
+
+    def __init__(self, max_queries: int = None, max_repeats: int = 1):
+        self.max_queries = max_queries
+        self.max_repeats = max_repeats
+        self.queries = []
+        self._stack = None
+
+    def __call__(self, execute, sql, params, many, context):
+        if not is_ignored.get() and not sql.startswith(IGNORED_STATEMENTS):
+            self.queries.append(sql)
+        return execute(sql, params, many, context)
+
+    def __enter__(self):
+        self.queries = []
+        self._stack = ExitStack()
+
+        for connection in connections.all():
+            self._stack.enter_context(connection.execute_wrapper(self))
+
+        return self
+
+    def __exit__(self, exc_type, *_):
+        self._stack.close()
+
+        if exc_type is None:
+            self.check()
+
+        return False
+
+    @property
+    def count(self) -> int:
+        return len(self.queries)
+
+    def get_repeated(self) -> dict:
+        """
+        Return the shapes run more than `max_repeats` times with their count.
+        """
+        if self.max_repeats is None:
+            return {}
+
+        return {
+            shape: count
+            for shape, count in Counter(get_shape(sql) for sql in self.queries).items()
+            if count > self.max_repeats
+        }
+
+    def check(self):
+        """
+        Raises:
+            AssertionError: If the budget is exceeded or a query shape is repeated.
+        """
+        if self.max_queries is not None and self.count > self.max_queries:
+            raise AssertionError(
+                f"{self.count} queries run, the budget is {self.max_queries}:\n"
+                + "\n".join(f"{index}. {sql}" for index, sql in enumerate(self.queries, 1))
+            )
+
+        repeated = self.get_repeated()
+        if repeated:
+            raise AssertionError(
+                "Queries repeated with different params (N+1):\n"
+                + "\n".join(f"{count}x {shape}" for shape, count in repeated.items())
+            )
+
+
+def assert_constant_queries(seed, run, sizes=(1, 5, 20), max_repeats: int = 1) -> int:
+    """
+    Seed datasets of growing sizes and check that `run` makes the same number of queries on each.
+    Args:
+        seed (callable): Called with the number of rows to add to the dataset.
+        run (callable): The block whose queries are counted, e.g. a request of a test client
+            recording the queries, which leaves the authentication out of the count.
+        sizes (tuple): The sizes of the dataset, in increasing order.
+        max_repeats (int, optional): The maximum number of queries of a same shape in a run.
+    Returns:
+        int: The number of queries of a run.
+    Raises:
+        AssertionError: If the number of queries changes with the size of the dataset.
+    Example:
+        assert_constant_queries(self._create_invoices, lambda: self.client.get("/invoice"))
+    """
+    counts = {}
+    seeded = 0
+
+    for size in sizes:
+        seed(size - seeded)
+        seeded = size
+
+        with QueryBudget(max_repeats=max_repeats) as budget:
+            run()
+
+        counts[size] = budget.count
+
+    if len(set(counts.values())) > 1:
+        raise AssertionError(
+            "The number of queries grows with the dataset: "
+            + ", ".join(f"{count} queries for {size} rows" for size, count in counts.items())
+        )
+
+    return counts[sizes[0]]
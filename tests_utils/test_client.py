@@ -1,14 +1,28 @@
 from django.test import Client
 from tests_utils.auth import get_auth_token
+from tests_utils.query_budget import QueryBudget, ignore_queries
 from utils import functions
 
 
 class TestClient:
-    def __init__(self, set_default_token: bool = True, token_type: str = "Bearer"):
+    """
+    Test client of the API, authenticated with the token of the test user.
+    With `record_queries`, the SQL statements of every request are set on `response.queries`.
+    A request given a `max_queries` budget fails when it runs more queries, or when it runs
+    a same statement repeatedly with different params (N+1).
+    """
+
+    def __init__(
+        self,
+        set_default_token: bool = True,
+        token_type: str = "Bearer",
+        record_queries: bool = False,
+    ):
         self.client = Client()
         self.http_host = "localhost"
         self.token_type = token_type
         self.token = None
+        self.record_queries = record_queries
 
         self.headers = {
             "Content-Type": "application/json",
@@ -26,9 +40,41 @@ class TestClient:
     def _prepare_url(self, endpoint: str) -> str:
         return functions.create_end_point(endpoint)
 
+    def _prepare_recording(self):
+        """
+        Keep the background work of the authentication out of the recorded queries:
+        the token is cached and the buffered last logins are written beforehand.
+        """
+        from auth_user.db_access import token_manager
+        from authentication.cache import token_cache
+        from authentication.last_login import last_login_tracker
+
+        with ignore_queries():
+            if self.token and token_cache.get(self.token) is None:
+                generation = token_cache.get_generation(self.token)
+                token = token_manager.get({"token": self.token}, select_related=["user"])
+                if token:
+                    token_cache.set(token, generation)
+
+            last_login_tracker.flush()
+
+    def _send(self, method, url: str, max_queries: int = None, **kwargs):
+        if max_queries is None and not self.record_queries:
+            return method(url, **kwargs)
+
+        self._prepare_recording()
+
+        budget = QueryBudget(max_queries, max_repeats=None if max_queries is None else 1)
+        with budget:
+            response = method(url, **kwargs)
+
+        response.queries = budget.queries
+        return response
+
     def post(self, endpoint: str, data=None, **kwargs):
         url = self._prepare_url(endpoint)
-        return self.client.post(
+        return self._send(
+            self.client.post,
             url,
             data=data,
             **kwargs,
@@ -36,14 +82,16 @@ class TestClient:
 
     def get(self, endpoint: str, **kwargs):
         url = self._prepare_url(endpoint)
-        return self.client.get(
+        return self._send(
+            self.client.get,
             url,
             **kwargs,
         )
 
     def put(self, endpoint: str, data=None, **kwargs):
         url = self._prepare_url(endpoint)
-        return self.client.put(
+        return self._send(
+            self.client.put,
             url,
             content_type=self.headers["Content-Type"],
             data=data,
@@ -52,7 +100,8 @@ class TestClient:
 
     def patch(self, endpoint: str, data=None, **kwargs):
         url = self._prepare_url(endpoint)
-        return self.client.patch(
+        return self._send(
+            self.client.patch,
             url,
             content_type=self.headers["Content-Type"],
             data=data,
@@ -61,7 +110,8 @@ class TestClient:
 
     def delete(self, endpoint: str, **kwargs):
         url = self._prepare_url(endpoint)
-        return self.client.delete(
+        return self._send(
+            self.client.delete,
             url,
             **kwargs,
         )
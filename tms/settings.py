@@ -14,6 +14,8 @@ import os
 import json
 from pathlib import Path
 
+from corsheaders.defaults import default_headers
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -81,6 +83,7 @@ AUTHENTICATION_CLASSES = [TOKEN_AUTHENTICATION_CLASS]
 MIDDLEWARE = [
     "middleware.exc.DRFExceptionMiddleware",
     "middleware.res.AddResponseHeadersMiddleware",
+    "middleware.identity.IdentityMapMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -95,6 +98,13 @@ REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "TRAILING_SLASH": False,
     "DEFAULT_AUTHENTICATION_CLASSES": [],
+    # The list responses are rendered in the columnar format with `?format=columnar`
+    # or `Accept: application/vnd.tms.columnar+json`.
+    "DEFAULT_RENDERER_CLASSES": [
+        "rest_framework.renderers.JSONRenderer",
+        "utils.response.ColumnarJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
 }
 
 ROOT_URLCONF = "tms.urls"
@@ -119,6 +129,51 @@ CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
 ]
 
+CORS_ALLOW_HEADERS = (*default_headers, "if-match")
+
+CORS_EXPOSE_HEADERS = ["ETag", "Server-Timing"]
+
+
+# The last login of a user is written at most once per LAST_LOGIN_UPDATE_INTERVAL seconds,
+# buffered and flushed in batches every LAST_LOGIN_FLUSH_INTERVAL seconds.
+LAST_LOGIN_UPDATE_INTERVAL = 60
+LAST_LOGIN_FLUSH_INTERVAL = 10
+
+
+# Authentication tokens are cached in the shared cache for AUTH_TOKEN_CACHE_TIMEOUT seconds,
+# and in an in-process LRU cache of AUTH_TOKEN_LOCAL_CACHE_SIZE tokens for
+# AUTH_TOKEN_LOCAL_CACHE_TIMEOUT seconds, which bounds how long a logged out token
+# may still be accepted by another process.
+AUTH_TOKEN_CACHE_TIMEOUT = 300
+AUTH_TOKEN_LOCAL_CACHE_SIZE = 10000
+AUTH_TOKEN_LOCAL_CACHE_TIMEOUT = 10
+
+
+# Signed access tokens issued at login and refresh, accepted when AUTHENTICATION_CLASSES is set to
+# ["authentication.signed_token.SignedTokenAuthentication"], which also accepts the login tokens.
+# Revoked refresh tokens are kept in a bloom filter of TOKEN_REVOCATION_FILTER_BITS bits.
+ACCESS_TOKEN_LIFETIME = 300
+ACCESS_TOKEN_SALT = "authentication.signed_token"
+TOKEN_REVOCATION_FILTER_BITS = 65536
+TOKEN_REVOCATION_FILTER_HASHES = 4
+
+
+# Notifications are written to an outbox and sent in batches of NOTIFICATION_OUTBOX_BATCH_SIZE by
+# the process_notification_outbox worker, which polls every NOTIFICATION_OUTBOX_POLL_INTERVAL seconds.
+# A failed notification is retried after NOTIFICATION_OUTBOX_RETRY_DELAY seconds, doubled on every
+# attempt up to NOTIFICATION_OUTBOX_RETRY_MAX_DELAY, and given up after NOTIFICATION_OUTBOX_MAX_ATTEMPTS.
+NOTIFICATION_OUTBOX_BATCH_SIZE = 100
+NOTIFICATION_OUTBOX_POLL_INTERVAL = 1
+NOTIFICATION_OUTBOX_RETRY_DELAY = 5
+NOTIFICATION_OUTBOX_RETRY_MAX_DELAY = 3600
+NOTIFICATION_OUTBOX_MAX_ATTEMPTS = 5
+
+
+# Requests slower than SLOW_REQUEST_THRESHOLD_MS are logged with their first
+# SLOW_REQUEST_MAX_LOGGED_QUERIES SQL statements.
+SLOW_REQUEST_THRESHOLD_MS = 500
+SLOW_REQUEST_MAX_LOGGED_QUERIES = 100
+
 
 WSGI_APPLICATION = "tms.wsgi.application"
 
@@ -128,6 +183,57 @@ WSGI_APPLICATION = "tms.wsgi.application"
 
 DATABASES = config["DATABASES"]
 
+# The trigram search lookups are registered by django.contrib.postgres.
+if DATABASES["default"]["ENGINE"] == "django.db.backends.postgresql":
+    INSTALLED_APPS += ["django.contrib.postgres"]
+
+
+# Caches
+# https://docs.djangoproject.com/en/5.2/ref/settings/#caches
+# The shared tier of utils.cache.CacheInterface, memcached as set in config/env.json, or a
+# per-process LocMem cache without it. The python-memcached backend removed from Django is
+# provided by utils.cache_backends.MemcachedCache.
+LEGACY_CACHE_BACKENDS = {
+    "django.core.cache.backends.memcached.MemcachedCache": "utils.cache_backends.MemcachedCache",
+}
+CACHES = config.get("CACHES") or {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+}
+for cache_config in CACHES.values():
+    cache_config["BACKEND"] = LEGACY_CACHE_BACKENDS.get(
+        cache_config["BACKEND"], cache_config["BACKEND"]
+    )
+
+# The tests run on the TEST_CACHES, set by tms.test_runner.TestRunner for `manage.py test` and by
+# the run_benchmarks command around their test database, and at startup when the TMS_TEST_CACHES
+# environment variable is set for the other runners.
+TEST_CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+if os.environ.get("TMS_TEST_CACHES"):
+    CACHES = TEST_CACHES
+
+TEST_RUNNER = "tms.test_runner.TestRunner"
+
+# The in-process tier of utils.cache.CacheInterface keeps CACHE_LOCAL_SIZE entries for at most
+# CACHE_LOCAL_TIMEOUT seconds, which bounds how long a value deleted or replaced by another
+# process may be served. CacheInterface.get_or_set recomputes a value before it expires with a
+# probability growing as it gets closer to expiry, CACHE_EARLY_EXPIRATION_BETA > 1 favors earlier.
+CACHE_LOCAL_SIZE = 1024
+CACHE_LOCAL_TIMEOUT = 5
+CACHE_EARLY_EXPIRATION_BETA = 1.0
+
+# The managers with a cache_policy cache their read results in the shared cache for
+# QUERY_CACHE_TIMEOUT seconds, they are invalidated whenever a row of the model is written.
+QUERY_CACHE_TIMEOUT = 300
+
+
+# Backend of the `q` search param of the list endpoints by database vendor, the other
+# vendors use base.search.backends.ContainsSearchBackend. At most SEARCH_MAX_TERMS words are searched.
+SEARCH_BACKENDS = {
+    "postgresql": "base.search.backends.TrigramSearchBackend",
+    "sqlite": "base.search.backends.FTS5SearchBackend",
+}
+SEARCH_MAX_TERMS = 5
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
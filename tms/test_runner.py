@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+def test_caches() -> override_settings:
+    """
+    Replace the configured caches by the TEST_CACHES, the cache handler is reset on enable
+    and disable.
+    """
+    return override_settings(CACHES=settings.TEST_CACHES)
+
+
+class TestRunner(DiscoverRunner):
+    __doc__ = """
+    Test runner running the tests on the TEST_CACHES instead of the configured caches.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.test_caches = test_caches()
+        self.test_caches.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self.test_caches.disable()
+        super().teardown_test_environment(**kwargs)
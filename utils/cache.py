@@ -1,19 +1,283 @@
-from django.core.cache import cache
+"""
+Two tier cache.
+`CacheInterface` keeps the hot keys in a bounded in-process LRU cache (`LocalCache`) in front
+of the shared Django cache, memcached as configured in `config/env.json`.
+- The local tier is not shared between processes, a value deleted or replaced by another
+  process may be served until its local TTL, `CACHE_LOCAL_TIMEOUT`, expires.
+- The keys may be namespaced, a namespace is invalidated at once by bumping its version.
+- `get_or_set` recomputes a value before it expires with a probability growing as it gets
+  closer to expiry (XFetch), so that the clients do not all recompute it at once.
+"""
 
+import math
+import random
+import threading
+from time import monotonic, time
+from collections import OrderedDict
 
-class CacheInterface:
-    def __init__(self, default_timeout=3600):
-        self.cache = cache
+from django.core.cache import caches
+
+from utils import settings
+
+
+class LocalCache:
+    """
+    In-process LRU cache with a TTL, used in front of the shared cache for hot keys.
+    Entries are not shared between processes, so the TTL bounds how long another
+    process may serve a value deleted from the shared cache.
+    """
+
+    def __init__(self, max_size=1024, default_timeout=60):
+        self.max_size = max_size
         self.default_timeout = default_timeout
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
 
     def set(self, key, value, timeout=None):
-        return self.cache.set(key, value, timeout or self.default_timeout)
+        if self.max_size <= 0:
+            return
+
+        expires = monotonic() + (timeout or self.default_timeout)
+
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
 
     def get(self, key, default=None):
-        return self.cache.get(key, default)
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+
+            value, expires = item
+            if expires <= monotonic():
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+            return value
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class CacheInterface:
+    __doc__ = """
+    This class is a two tier cache, a `LocalCache` in front of the shared Django cache.
+    Args:
+        default_timeout (int): The timeout of the shared tier in seconds.
+        namespace (str, optional): The namespace of the keys, invalidated with `invalidate_namespace`.
+        version (int, optional): The version of the keys, bumped when the cached values change shape.
+        local_size (int, optional): The number of keys of the local tier, 0 to disable it.
+            Defaults to `CACHE_LOCAL_SIZE`.
+        local_timeout (int, optional): The timeout of the local tier in seconds.
+            Defaults to `CACHE_LOCAL_TIMEOUT`.
+        alias (str): The alias of the shared cache in `CACHES`.
+    Example:
+        invoice_cache = CacheInterface(namespace="invoice", version=2)
+        invoice_cache.get_or_set(invoice_id, lambda: build(invoice_id), timeout=60)
+        invoice_cache.invalidate_namespace()
+    """
+
+    namespace_prefix = "cache_namespace:"
+
+    def __init__(
+        self,
+        default_timeout=3600,
+        namespace: str = "",
+        version: int = 1,
+        local_size: int = None,
+        local_timeout: int = None,
+        alias: str = "default",
+    ):
+        self.default_timeout = default_timeout
+        self.namespace = namespace
+        self.version = version
+        self.alias = alias
+        self.local = LocalCache(
+            max_size=settings.read("CACHE_LOCAL_SIZE") if local_size is None else local_size,
+            default_timeout=(
+                settings.read("CACHE_LOCAL_TIMEOUT") if local_timeout is None else local_timeout
+            ),
+        )
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def get_namespace_version(self) -> int:
+        """
+        Return the current version of the namespace, cached in the local tier.
+        """
+        key = self.namespace_prefix + self.namespace
+
+        version = self.local.get(key)
+        if version is None:
+            self.cache.add(key, 1, timeout=None)
+            version = self.cache.get(key) or 1
+            self.local.set(key, version)
+
+        return version
+
+    def invalidate_namespace(self):
+        """
+        Bump the version of the namespace, its keys are no longer read from the shared tier.
+        The local tiers of the other processes keep serving them until their TTL expires.
+        """
+        key = self.namespace_prefix + self.namespace
+
+        try:
+            self.cache.incr(key)
+        except ValueError:
+            self.cache.set(key, 2, timeout=None)
+
+        # The keys of the previous version, the namespace version included, are unreachable.
+        self.local.clear()
+
+    def make_key(self, key) -> str:
+        if not self.namespace:
+            return f"v{self.version}:{key}"
+
+        return f"{self.namespace}:{self.get_namespace_version()}:v{self.version}:{key}"
+
+    def get_local_timeout(self, timeout) -> int:
+        timeout = timeout or self.default_timeout
+        return min(timeout, self.local.default_timeout)
+
+    def set(self, key, value, timeout=None, local: bool = True):
+        """
+        Args:
+            local (bool): Whether the value is also kept in the local tier. Keys written by a
+                read-modify-write, such as indexes and locks, must be read from the shared tier.
+        """
+        full_key = self.make_key(key)
+
+        if local:
+            self.local.set(full_key, value, self.get_local_timeout(timeout))
+        else:
+            self.local.delete(full_key)
+
+        return self.cache.set(full_key, value, timeout or self.default_timeout)
+
+    def get(self, key, default=None, local: bool = True):
+        full_key = self.make_key(key)
+
+        if local:
+            value = self.local.get(full_key)
+            if value is not None:
+                return value
+
+        value = self.cache.get(full_key)
+        if value is None:
+            return default
+
+        if local:
+            self.local.set(full_key, value)
+
+        return value
 
     def delete(self, key):
-        return self.cache.delete(key)
+        full_key = self.make_key(key)
+
+        self.local.delete(full_key)
+        return self.cache.delete(full_key)
+
+    def add(self, key, value, timeout=None):
+        """
+        Set the value if the key is missing from the shared tier, e.g. to take a lock.
+        """
+        return self.cache.add(self.make_key(key), value, timeout or self.default_timeout)
+
+    def get_many(self, keys, local: bool = True) -> dict:
+        """
+        Return the cached values of the keys, read from the local tier first then with a
+        single round trip to the shared tier.
+        """
+        full_keys = {self.make_key(key): key for key in keys}
+        values = {}
+
+        if local:
+            for full_key, key in full_keys.items():
+                value = self.local.get(full_key)
+                if value is not None:
+                    values[key] = value
+
+        missing = [full_key for full_key, key in full_keys.items() if key not in values]
+        if missing:
+            for full_key, value in self.cache.get_many(missing).items():
+                values[full_keys[full_key]] = value
+                if local:
+                    self.local.set(full_key, value)
+
+        return values
+
+    def set_many(self, data: dict, timeout=None, local: bool = True) -> list:
+        """
+        Set the values with a single round trip to the shared tier.
+        Returns:
+            list: The keys which failed to be set in the shared tier.
+        """
+        full_keys = {self.make_key(key): key for key in data}
+        local_timeout = self.get_local_timeout(timeout)
+
+        for full_key, key in full_keys.items():
+            if local:
+                self.local.set(full_key, data[key], local_timeout)
+            else:
+                self.local.delete(full_key)
+
+        failed = self.cache.set_many(
+            {full_key: data[key] for full_key, key in full_keys.items()},
+            timeout or self.default_timeout,
+        )
+        return [full_keys[full_key] for full_key in failed or []]
+
+    def delete_many(self, keys):
+        full_keys = [self.make_key(key) for key in keys]
+
+        for full_key in full_keys:
+            self.local.delete(full_key)
+
+        return self.cache.delete_many(full_keys)
+
+    def get_or_set(self, key, default, timeout=None, beta: float = None):
+        """
+        Return the cached value of the key, or compute it with `default` and cache it.
+        A cached value is recomputed early, with a probability growing as it gets closer to
+        expiry and with the time it took to compute, so that a single client recomputes it.
+        The value is cached with its computation time and expiry, the keys set with
+        `get_or_set` must only be read with it.
+        Args:
+            default (callable): Computes the value.
+            beta (float, optional): Favors earlier recomputations above 1.
+                Defaults to `CACHE_EARLY_EXPIRATION_BETA`.
+        """
+        timeout = timeout or self.default_timeout
+        beta = settings.read("CACHE_EARLY_EXPIRATION_BETA") if beta is None else beta
+
+        entry = self.get(key)
+        if entry is not None:
+            value, delta, expires = entry
+            if time() - delta * beta * math.log(1 - random.random()) < expires:
+                return value
+
+        start = monotonic()
+        value = default()
+        delta = monotonic() - start
+
+        self.set(key, (value, delta, time() + timeout), timeout)
+        return value
+
+    def clear_local(self):
+        self.local.clear()
 
 
 cache = CacheInterface()
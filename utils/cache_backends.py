@@ -0,0 +1,27 @@
+"""
+Cache backends.
+`MemcachedCache` binds the shared cache to memcached through `python-memcached`, whose
+backend was removed from Django 4.1.
+"""
+
+import pickle
+
+from django.core.cache.backends.memcached import BaseMemcachedCache
+
+
+class MemcachedCache(BaseMemcachedCache):
+    """
+    Memcached cache backend using the python-memcached library.
+    """
+
+    def __init__(self, server, params):
+        import memcache
+
+        super().__init__(server, params, library=memcache, value_not_found_exception=ValueError)
+        self._options = {"pickleProtocol": pickle.HIGHEST_PROTOCOL, **self._options}
+
+    def get(self, key, default=None, version=None):
+        # python-memcached's get() takes no default.
+        key = self.make_and_validate_key(key, version=version)
+        value = self._cache.get(key)
+        return default if value is None else value
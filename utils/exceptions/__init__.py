@@ -11,6 +11,7 @@ from .exceptions import (
     BadRequestError,
     NoDataFoundError,
     PermissionDenied,
+    PreconditionFailedError,
 )
 
 
@@ -22,4 +23,5 @@ __all__ = [
     "ValidationError",
     "BadRequestError",
     "PermissionDenied",
+    "PreconditionFailedError",
 ]
@@ -15,4 +15,5 @@ ALREADY_IN_USED: str = "ALREADY_IN_USED"
 DUPLICATE_ENTRY: str = "DUPLICATE_ENTRY"
 PERMISSION_DENIED: str = "PERMISSION_DENIED"
 WRONG_CREDENTIALS: str = "WRONG_CREDENTIALS"
+PRECONDITION_FAILED: str = "PRECONDITION_FAILED"
 SETTING_KEY_NOT_FOUND: str = "SETTING_KEY_NOT_FOUND"
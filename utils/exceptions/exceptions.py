@@ -64,6 +64,23 @@ class BadRequestError(BaseExc):
         return self.message
 
 
+class PreconditionFailedError(BaseExc):
+    """
+    Exception raised when the record was modified since the version sent in `If-Match`
+    """
+
+    code = codes.PRECONDITION_FAILED
+
+    def __init__(self, ref_data: dict = None):
+        self.message = error.PRECONDITION_FAILED
+        super().__init__(
+            self.message, status.HTTP_412_PRECONDITION_FAILED, ref_data=ref_data
+        )
+
+    def __str__(self):
+        return self.message
+
+
 class ValidationError(BaseExc):
     """
     Exception raised when validation fails
@@ -84,6 +84,57 @@ def get_current_datetime():
     return timezone.now()
 
 
+def flatten_dict(data: dict, prefix: str = "") -> dict:
+    """
+    Flatten the nested dictionaries, `{"customer": {"email": ...}}` becomes
+    `{"customer.email": ...}`.
+    """
+    flat = {}
+
+    for key, value in data.items():
+        if isinstance(value, dict):
+            flat.update(flatten_dict(value, prefix=f"{prefix}{key}."))
+        else:
+            flat[f"{prefix}{key}"] = value
+
+    return flat
+
+
+def get_etag(dtm) -> str:
+    """
+    Return the ETag of a record version, the microseconds of its `updated_dtm` since the epoch.
+    """
+    epoch = timezone.datetime(1970, 1, 1, tzinfo=timezone.get_fixed_timezone(0))
+    return f'"{(dtm - epoch) // timezone.timedelta(microseconds=1)}"'
+
+
+def parse_etag(etag: str):
+    """
+    Return the `updated_dtm` of an ETag created by `get_etag`, None if it is malformed.
+    Weak ETags (`W/"..."`) are accepted.
+    """
+    value = etag.strip().removeprefix("W/").strip('"')
+    if not value.isdigit():
+        return None
+
+    epoch = timezone.datetime(1970, 1, 1, tzinfo=timezone.get_fixed_timezone(0))
+    return epoch + timezone.timedelta(microseconds=int(value))
+
+
+def get_full_name(first_name, last_name) -> str:
+    """
+    Return the full name of a customer or a user, title cased.
+    """
+    return f"{first_name} {last_name}".title()
+
+
+def to_title(value) -> str:
+    """
+    Return the value title cased, an empty string for None.
+    """
+    return f"{value or ''}".title()
+
+
 def create_end_point(end_point: str):
     """
     Creates a complete endpoint URL by appending the given endpoint path to the base path.
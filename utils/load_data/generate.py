@@ -0,0 +1,405 @@
+"""
+Synthetic dataset generator.
+Generates users, customers, vehicles, invoices and notifications at a configurable scale to
+reproduce production sized performance problems locally.
+- The rows are deterministic: the row `n` of a table only depends on the seed, so that a same
+  seed always produces the same dataset, whatever the number of workers.
+- The rows are generated in chunks by a pool of processes and inserted by the main process,
+  with `COPY` on PostgreSQL and batched `bulk_create` on the other databases. At most two
+  chunks per worker are generated ahead of the inserts, bounding the memory used.
+- The customer balance ledger is rebuilt from the generated invoices.
+"""
+
+import csv
+import io
+import json
+import uuid
+import random
+import hashlib
+import datetime
+import multiprocessing
+from decimal import Decimal
+from collections import deque
+from contextlib import contextmanager
+
+from django.db import connection, transaction
+from django.utils.module_loading import import_string
+
+from base.db_access.cache import invalidate
+from utils.logger import log_msg, logging
+
+FIRST_NAMES = [
+    "Aarav", "Vivaan", "Aditya", "Vihaan", "Arjun", "Sai", "Reyansh", "Krishna", "Ishaan",
+    "Rohan", "Ananya", "Diya", "Aadhya", "Saanvi", "Pari", "Anika", "Navya", "Myra", "Sara",
+    "Kavya", "Ravi", "Anita", "Suresh", "Priya", "Rahul", "Sneha", "Amit", "Pooja",
+]
+LAST_NAMES = [
+    "Sharma", "Verma", "Patil", "Kumar", "Singh", "Iyer", "Reddy", "Nair", "Joshi", "Gupta",
+    "Mehta", "Desai", "Kulkarni", "Rao", "Chopra", "Bose", "Das", "Pillai", "Shah", "Jain",
+]
+COMPANY_SUFFIXES = ["Logistics", "Freight", "Transport", "Carriers", "Movers", "Traders"]
+CITIES = [
+    "Pune", "Mumbai", "Nagpur", "Nashik", "Bengaluru", "Chennai", "Hyderabad", "Delhi",
+    "Ahmedabad", "Kolkata", "Jaipur", "Indore", "Surat", "Kochi", "Lucknow",
+]
+STREETS = ["MG Road", "Station Road", "Industrial Area", "Ring Road", "Market Yard", "MIDC"]
+VEHICLE_MAKES = {
+    "Truck": ["Tata Prima", "Ashok Leyland 2820", "BharatBenz 3528", "Eicher Pro 6028"],
+    "Mini Truck": ["Tata Ace", "Mahindra Jeeto", "Ashok Leyland Dost"],
+    "Trailer": ["Tata Signa 5530", "BharatBenz 5528", "Volvo FM 420"],
+    "Tanker": ["Tata LPT 2518", "Eicher Pro 3015"],
+}
+VEHICLE_COLORS = ["White", "Red", "Blue", "Yellow", "Orange", "Green", "Silver"]
+STATE_CODES = ["MH", "KA", "GJ", "TN", "DL", "RJ", "UP", "TS", "WB", "MP"]
+
+START_DATE = datetime.date(2023, 1, 1)
+DAYS = 730
+START_DTM = datetime.datetime(2023, 1, 1, tzinfo=datetime.timezone.utc)
+
+# Every generated user `n` logs in as `user<n>@example.com` with this password, stored as
+# the login compares it, like the users of `load_predata`.
+PASSWORD = "Dataset@123"
+
+
+def get_id(seed: int, table: str, n: int) -> str:
+    """
+    Return the deterministic uuid of the row `n` of a table.
+    """
+    return str(uuid.UUID(bytes=hashlib.md5(f"{seed}:{table}:{n}".encode()).digest(), version=4))
+
+
+def get_audit_columns(rng: random.Random, context: dict, n: int, count: int) -> dict:
+    """
+    Return the columns of `BaseModel`, the rows are created in order over the last two years
+    and 1% of them are soft deleted.
+    """
+    created_dtm = START_DTM + datetime.timedelta(
+        seconds=int(n * DAYS * 86400 / max(count, 1)) + rng.randrange(60)
+    )
+    user_id = get_id(context["seed"], "user", rng.randrange(context["users"]))
+    is_deleted = rng.random() < 0.01
+
+    return {
+        "is_active": True,
+        "is_deleted": is_deleted,
+        "created_by": user_id,
+        "updated_by": user_id,
+        "created_dtm": created_dtm,
+        "updated_dtm": created_dtm,
+        "deleted_dtm": created_dtm + datetime.timedelta(days=1) if is_deleted else None,
+    }
+
+
+def get_user(rng, context, n):
+    first_name = rng.choice(FIRST_NAMES)
+    last_name = rng.choice(LAST_NAMES)
+
+    return {
+        **get_audit_columns(rng, context, n, context["users"]),
+        "is_deleted": False,
+        "deleted_dtm": None,
+        "user_id": get_id(context["seed"], "user", n),
+        "email": f"user{n}@example.com",
+        "first_name": first_name,
+        "last_name": last_name,
+        "phone_number": f"9{rng.randrange(10**9):09d}",
+        "profile_photo": None,
+        "password": PASSWORD,
+        "date_joined": START_DTM + datetime.timedelta(days=rng.randrange(DAYS)),
+        "last_login": None,
+    }
+
+
+def get_customer(rng, context, n):
+    first_name = rng.choice(FIRST_NAMES)
+    last_name = rng.choice(LAST_NAMES)
+    is_business = rng.random() < 0.6
+
+    return {
+        **get_audit_columns(rng, context, n, context["customers"]),
+        "customer_id": get_id(context["seed"], "customer", n),
+        "customer_type": "BUSINESS" if is_business else "INDIVIDUAL",
+        "company_name": (
+            f"{last_name} {rng.choice(COMPANY_SUFFIXES)}" if is_business else None
+        ),
+        "first_name": first_name,
+        "last_name": last_name,
+        "mobile_number": f"9{rng.randrange(10**9):09d}",
+        "email": f"customer{n}@example.com",
+        "address": f"{rng.randrange(1, 999)} {rng.choice(STREETS)}, {rng.choice(CITIES)}",
+    }
+
+
+def get_vehicle(rng, context, n):
+    vehicle_type = rng.choice(list(VEHICLE_MAKES))
+
+    return {
+        **get_audit_columns(rng, context, n, context["vehicles"]),
+        "vehicle_id": get_id(context["seed"], "vehicle", n),
+        "vehicle_name": rng.choice(VEHICLE_MAKES[vehicle_type]),
+        "vehicle_type": vehicle_type,
+        "vehicle_number": f"{STATE_CODES[n % len(STATE_CODES)]}{n:010d}",
+        "vehicle_model": str(rng.randrange(2012, 2025)),
+        "vehicle_color": rng.choice(VEHICLE_COLORS),
+    }
+
+
+def get_invoice(rng, context, n):
+    """
+    The invoices are skewed towards a minority of customers, as in production.
+    """
+    weight = Decimal(rng.randrange(50000, 3000000)) / 100
+    rate = Decimal(rng.randrange(200, 2000)) / 100
+    loading_city, delivery_city = rng.sample(CITIES, 2)
+
+    return {
+        **get_audit_columns(rng, context, n, context["invoices"]),
+        "invoice_id": get_id(context["seed"], "invoice", n),
+        "customer_id": get_id(
+            context["seed"], "customer", int(context["customers"] * rng.random() ** 2)
+        ),
+        "vehicle_id": get_id(context["seed"], "vehicle", rng.randrange(context["vehicles"])),
+        "date": START_DATE + datetime.timedelta(days=int(n * DAYS / context["invoices"])),
+        "loading_address": f"Warehouse {rng.randrange(1, 99)}, {loading_city}",
+        "delivery_address": f"{rng.choice(STREETS)}, {delivery_city}",
+        "weight": weight,
+        "rate": rate,
+        "total": (weight * rate).quantize(Decimal("0.01")),
+        "status": "PAID" if rng.random() < 0.7 else "PENDING",
+    }
+
+
+def get_notification(rng, context, n):
+    invoice_n = rng.randrange(context["invoices"])
+
+    return {
+        **get_audit_columns(rng, context, n, context["notifications"]),
+        "notification_id": get_id(context["seed"], "notification", n),
+        "title": "Invoice notification",
+        "message": "Invoice created successfully",
+        "notification_data": json.dumps(
+            {"invoice_id": get_id(context["seed"], "invoice", invoice_n)}
+        ),
+        "notification_type_id": "INVOICE",
+    }
+
+
+def get_user_notification(rng, context, n):
+    """
+    Every notification is sent to one user.
+    """
+    return {
+        **get_audit_columns(rng, context, n, context["notifications"]),
+        "user_notification_id": get_id(context["seed"], "user_notification", n),
+        "user_id": get_id(context["seed"], "user", rng.randrange(context["users"])),
+        "notification_id": get_id(context["seed"], "notification", n),
+        "is_read": rng.random() < 0.6,
+    }
+
+
+# The tables in insertion order: (model path, scale key, row generator).
+# The models are imported by path as the apps keep them out of their `models` module.
+TABLES = [
+    ("auth_user.models.User", "users", get_user),
+    ("customer.db_models.Customer", "customers", get_customer),
+    ("vehicle.db_models.Vehicle", "vehicles", get_vehicle),
+    ("invoice.db_models.Invoice", "invoices", get_invoice),
+    ("notification.db_models.Notification", "notifications", get_notification),
+    ("notification.db_models.UserNotification", "notifications", get_user_notification),
+]
+GENERATORS = {label: generator for label, _, generator in TABLES}
+
+
+def generate_chunk(task: tuple) -> list:
+    """
+    Generate the rows `start` to `end` of a table, run by the worker processes.
+    Returns:
+        list: The rows as dicts of column values.
+    """
+    label, start, end, context = task
+    generator = GENERATORS[label]
+    rng = random.Random(f"{context['seed']}:{label}:{start}")
+
+    return [generator(rng, context, n) for n in range(start, end)]
+
+
+def get_scale(invoices: int, **counts) -> dict:
+    """
+    Derive the number of rows of every table from the number of invoices, the given
+    counts override the derived ones.
+    """
+    scale = {
+        "invoices": invoices,
+        "customers": max(invoices // 100, 1),
+        "vehicles": max(invoices // 1000, 1),
+        "users": max(invoices // 10000, 2),
+        "notifications": invoices // 10,
+    }
+    scale.update({key: value for key, value in counts.items() if value is not None})
+    return scale
+
+
+@contextmanager
+def preserve_timestamps(model):
+    """
+    Disable `auto_now` and `auto_now_add` so that `bulk_create` keeps the generated timestamps.
+    """
+    fields = [
+        (field, field.auto_now, field.auto_now_add)
+        for field in model._meta.concrete_fields
+        if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False)
+    ]
+
+    for field, *_ in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in fields:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def copy_rows(model, rows: list):
+    """
+    Insert the rows with PostgreSQL `COPY ... FROM STDIN`.
+    """
+    columns = list(rows[0])
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    for row in rows:
+        writer.writerow(
+            [
+                "t" if value is True else "f" if value is False else value
+                for value in row.values()
+            ]
+        )
+    buffer.seek(0)
+
+    qn = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY {qn(model._meta.db_table)} ({', '.join(qn(column) for column in columns)}) "
+            "FROM STDIN WITH (FORMAT csv)",
+            buffer,
+        )
+
+
+def create_rows(model, rows: list, batch_size: int):
+    """
+    Insert the rows with `bulk_create`, the JSON columns are decoded for their field.
+    """
+    json_fields = [
+        field.attname
+        for field in model._meta.concrete_fields
+        if field.get_internal_type() == "JSONField"
+    ]
+
+    objects = []
+    for row in rows:
+        for attname in json_fields:
+            if row[attname] is not None:
+                row[attname] = json.loads(row[attname])
+        objects.append(model(**row))
+
+    with preserve_timestamps(model):
+        model.objects.bulk_create(objects, batch_size=batch_size)
+
+
+def insert_rows(model, rows: list, batch_size: int):
+    if connection.vendor == "postgresql":
+        copy_rows(model, rows)
+    else:
+        create_rows(model, rows, batch_size)
+
+
+def clear_dataset():
+    """
+    Delete the rows of every generated table, the dependent tables first.
+    """
+    from payment.db_models import CustomerBalance
+
+    CustomerBalance.objects.all().delete()
+    for label, *_ in reversed(TABLES):
+        import_string(label).objects.all().delete()
+        invalidate(import_string(label))
+
+
+def rebuild_balances(chunk_size: int):
+    from payment.db_access import customer_balance_manager
+    from customer.db_models import Customer
+
+    customer_ids = list(Customer.objects.order_by("pk").values_list("pk", flat=True))
+    for index in range(0, len(customer_ids), chunk_size):
+        customer_balance_manager.rebuild(customer_ids[index : index + chunk_size])
+
+
+def imap_bounded(pool, func, tasks, max_pending: int):
+    """
+    Yield `func(task)` for the tasks in order, computed by the pool with at most
+    `max_pending` results generated ahead of the consumer, so the finished chunks waiting
+    to be inserted do not pile up in memory when the generation outruns the inserts.
+    """
+    pending = deque()
+
+    for task in tasks:
+        if len(pending) >= max_pending:
+            yield pending.popleft().get()
+        pending.append(pool.apply_async(func, (task,)))
+
+    while pending:
+        yield pending.popleft().get()
+
+
+def generate_dataset(scale: dict, seed: int = 0, batch_size: int = 5000, workers: int = 1):
+    """
+    Generate and insert the dataset.
+    Args:
+        scale (dict): The number of rows per table, see `get_scale`.
+        seed (int): The seed of the dataset.
+        batch_size (int): The number of rows generated and inserted per chunk.
+        workers (int): The number of generating processes, 1 generates in the current process.
+    Returns:
+        dict: The number of rows inserted per table.
+    """
+    context = {
+        **scale,
+        "seed": seed,
+    }
+    inserted = {}
+
+    pool = multiprocessing.Pool(workers) if workers > 1 else None
+    try:
+        for label, key, _ in TABLES:
+            model = import_string(label)
+            count = scale[key]
+            tasks = (
+                (label, start, min(start + batch_size, count), context)
+                for start in range(0, count, batch_size)
+            )
+            chunks = (
+                imap_bounded(pool, generate_chunk, tasks, max_pending=workers * 2)
+                if pool
+                else map(generate_chunk, tasks)
+            )
+
+            inserted[label] = 0
+            for rows in chunks:
+                with transaction.atomic():
+                    insert_rows(model, rows, batch_size)
+                inserted[label] += len(rows)
+
+            invalidate(model)
+            log_msg(logging.INFO, f"Inserted {inserted[label]} rows in {model._meta.db_table}.")
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+
+    rebuild_balances(batch_size)
+
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    return inserted
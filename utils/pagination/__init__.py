@@ -3,7 +3,9 @@ Pagination module for handling pagination in APIs.
 """
 
 from .pagination import Pagination
+from .cursor import CursorPagination
 
 __all__ = [
-    "Pagination"
+    "Pagination",
+    "CursorPagination",
 ]
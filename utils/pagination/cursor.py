@@ -0,0 +1,191 @@
+"""
+This module provides a CursorPagination class to handle keyset (seek) pagination.
+Instead of skipping rows with OFFSET, the next page is fetched by filtering on the
+ordering values of the last row returned, so every page costs the same as the first
+one and no COUNT query is needed.
+The cursor handed to the client is an opaque url-safe base64 string holding the
+ordering values of the last row of the current page.
+The ordering may span forward relations (`customer__created_dtm`), and the NULL values of
+nullable fields sort first in ascending order and last in descending order on every database.
+"""
+
+import json
+import base64
+import binascii
+
+from django.db.models import Q, F, Model
+from django.core.exceptions import ValidationError as DjangoValidationError
+
+from utils.messages import error
+from utils.exceptions import BadRequestError, codes
+
+
+class CursorPagination:
+    __doc__ = """
+    This class is used to handle keyset pagination of a queryset.
+    It takes the ordering of the queryset, the page size and the cursor of the
+    previous page and returns the objects of the current page with the cursor
+    of the next one. The rows may be `values_list` tuples of the given columns,
+    which include the ordering columns.
+    """
+
+    def __init__(
+        self,
+        model: Model,
+        ordering: list,
+        page_size: int,
+        cursor: str = None,
+        columns: list = None,
+    ):
+        self.model = model
+        self.ordering = ordering
+        self.page_size = page_size
+        self.cursor = cursor
+        self.columns = columns
+        self.next_cursor = None
+
+    def get_path(self, name: str) -> list:
+        """
+        Return the model fields of the given ordering name, a relation path such as
+        `customer__created_dtm` is resolved through the related models. `pk` is resolved to
+        the primary key.
+        """
+        model = self.model
+        fields = []
+
+        for part in name.split("__"):
+            field = model._meta.pk if part == "pk" else model._meta.get_field(part)
+            fields.append(field)
+            model = field.related_model
+
+        return fields
+
+    def get_field(self, name: str):
+        """
+        Return the model field for the given ordering name.
+        """
+        return self.get_path(name)[-1]
+
+    def is_nullable(self, name: str) -> bool:
+        return any(field.null for field in self.get_path(name))
+
+    def get_value(self, obj, name: str):
+        """
+        Return the ordering value of the given object, or row of `columns`.
+        """
+        path = self.get_path(name)
+
+        if self.columns is not None:
+            # A relation path is selected under its name, see `Manager.get_projection`.
+            column = path[0].attname if len(path) == 1 else name
+            return obj[self.columns.index(column)]
+
+        for field in path[:-1]:
+            obj = getattr(obj, field.name)
+            if obj is None:
+                return None
+
+        return getattr(obj, path[-1].attname)
+
+    def encode(self, obj) -> str:
+        """
+        Encode the ordering values of the given object, or row, into an opaque cursor string.
+        """
+        values = []
+        for order in self.ordering:
+            value = self.get_value(obj, order.lstrip("-"))
+
+            if hasattr(value, "isoformat"):
+                value = value.isoformat()
+            elif not isinstance(value, (str, int, float, bool, type(None))):
+                value = str(value)
+
+            values.append(value)
+
+        return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+    def decode(self) -> list:
+        """
+        Decode the cursor string back into the ordering values of the last row of the previous page.
+        Raises:
+            BadRequestError: If the cursor is malformed.
+        """
+        try:
+            values = json.loads(base64.urlsafe_b64decode(self.cursor.encode()))
+            if not isinstance(values, list) or len(values) != len(self.ordering):
+                raise ValueError(self.cursor)
+
+            return [
+                self.get_field(order.lstrip("-")).to_python(value)
+                for order, value in zip(self.ordering, values)
+            ]
+        except (ValueError, TypeError, binascii.Error, DjangoValidationError) as exc:
+            raise BadRequestError(error.INVALID_CURSOR, codes.INVALID) from exc
+
+    def get_order_by(self) -> list:
+        """
+        Return the ordering of the queryset, with the NULL values of the nullable fields first
+        in ascending order and last in descending order, as expected by `get_seek_query`.
+        """
+        order_by = []
+        for order in self.ordering:
+            name = order.lstrip("-")
+
+            if not self.is_nullable(name):
+                order_by.append(order)
+            elif order.startswith("-"):
+                order_by.append(F(name).desc(nulls_last=True))
+            else:
+                order_by.append(F(name).asc(nulls_first=True))
+
+        return order_by
+
+    def get_seek_query(self) -> Q:
+        """
+        Build the seek condition which selects the rows after the cursor.
+        For the ordering (a, b) this is `a > x OR (a = x AND b > y)`, with `<` for descending fields.
+        A NULL value is lower than the others: no row is after it in descending order, and the
+        not NULL rows are after it in ascending order.
+        """
+        values = self.decode()
+
+        seek_query = Q()
+        equal_query = Q()
+        for order, value in zip(self.ordering, values):
+            name = order.lstrip("-")
+            descending = order.startswith("-")
+
+            if value is None:
+                after_part = None if descending else Q(**{f"{name}__isnull": False})
+                equal_part = Q(**{f"{name}__isnull": True})
+            else:
+                after_part = Q(**{f"{name}__{'lt' if descending else 'gt'}": value})
+                if descending and self.is_nullable(name):
+                    after_part |= Q(**{f"{name}__isnull": True})
+                equal_part = Q(**{name: value})
+
+            if after_part is not None:
+                seek_query |= equal_query & after_part
+            equal_query &= equal_part
+
+        return seek_query
+
+    def get_current_page_objs(self, objects) -> list:
+        """
+        This method returns the current page objects and sets the cursor of the next page.
+        One extra row is fetched to know whether a next page exists.
+        :param objects: The queryset to be paginated, ordered on `ordering`.
+        :return: The current page objects.
+        """
+        objects = objects.order_by(*self.get_order_by())
+
+        if self.cursor:
+            objects = objects.filter(self.get_seek_query())
+
+        page_objs = list(objects[: self.page_size + 1])
+
+        if len(page_objs) > self.page_size:
+            page_objs = page_objs[: self.page_size]
+            self.next_cursor = self.encode(page_objs[-1])
+
+        return page_objs
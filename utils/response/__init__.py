@@ -3,7 +3,9 @@ This module provides a function to generate a response based on the input data.
 """
 
 from .response import generate_response
+from .renderers import ColumnarJSONRenderer
 
 __all__ = [
     "generate_response",
+    "ColumnarJSONRenderer",
 ]
@@ -0,0 +1,51 @@
+"""
+Renderers of the API responses.
+`ColumnarJSONRenderer` is selected with `Accept: application/vnd.tms.columnar+json` or the
+`?format=columnar` query param. The rows of a list are rendered as
+`{"columns": [...], "data": {key: [...]}}`, so that the keys are not repeated for every row.
+"""
+
+from rest_framework.renderers import JSONRenderer
+
+from utils import functions
+
+
+def to_columnar(rows: list) -> dict:
+    """
+    Return the dictionaries of the rows in the columnar format, the nested dictionaries
+    flattened with dotted keys.
+    """
+    rows = [functions.flatten_dict(row) for row in rows]
+    columns = list(dict.fromkeys(key for row in rows for key in row))
+
+    return {"columns": columns, "data": {key: [row.get(key) for row in rows] for key in columns}}
+
+
+def is_rows(value) -> bool:
+    return isinstance(value, list) and all(isinstance(row, dict) for row in value)
+
+
+class ColumnarJSONRenderer(JSONRenderer):
+    __doc__ = """
+    This class renders the rows of the list responses in the columnar format.
+    The lists serialized by `ListView` are built in the columnar format from the fetched rows,
+    the rows of the other responses, in `data` or `data.list`, are transposed here. The other
+    responses are rendered as JSON.
+    Example:
+        GET /invoice?format=columnar
+        {"data": {"list": {"columns": ["invoice_id", ...], "data": {"invoice_id": [...]}}}}
+    """
+
+    media_type = "application/vnd.tms.columnar+json"
+    format = "columnar"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, dict) and data.get("is_success"):
+            content = data.get("data")
+
+            if is_rows(content):
+                data = {**data, "data": to_columnar(content)}
+            elif isinstance(content, dict) and is_rows(content.get("list")):
+                data = {**data, "data": {**content, "list": to_columnar(content["list"])}}
+
+        return super().render(data, accepted_media_type, renderer_context)
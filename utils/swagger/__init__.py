@@ -13,6 +13,8 @@ from .response import (
     responses_401_example,
     responses_404_example,
     responses_500_example,
+    responses_export,
+    export_parameters,
     SuccessResponseSerializer,
     PaginationSerializer
 )
@@ -27,6 +29,8 @@ __all__ = [
     "responses_401_example",
     "responses_404_example",
     "responses_500_example",
+    "responses_export",
+    "export_parameters",
     "SuccessResponseSerializer",
     "PaginationSerializer"
 ]
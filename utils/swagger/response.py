@@ -11,7 +11,8 @@ All responses follow the structure:
 """
 
 from rest_framework import serializers
-from drf_spectacular.utils import OpenApiExample
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiExample, OpenApiParameter
 from utils.messages import error
 from utils.exceptions import codes
 
@@ -162,10 +163,15 @@ class PaginationSerializer(serializers.Serializer):
     Pagination for swagger documentation.
     """
 
-    count = serializers.IntegerField()
+    count = serializers.IntegerField(required=False)
     page_size = serializers.IntegerField()
-    current_page = serializers.IntegerField()
-    total_pages = serializers.IntegerField()
+    current_page = serializers.IntegerField(required=False)
+    total_pages = serializers.IntegerField(required=False)
+    next_cursor = serializers.CharField(
+        required=False,
+        allow_null=True,
+        help_text="Cursor of the next page, only returned in cursor mode. Null on the last page.",
+    )
 
 
 responses_200 = {"200": SuccessResponseSerializer()}
@@ -177,3 +183,19 @@ responses_401 = {"401": UnauthorizedResponseSerializer()}
 responses_404 = {"404": NotFoundResponseSerializer()}
 
 responses_500 = {"500": InternalServerErrorResponseSerializer()}
+
+# === Export ===
+responses_export = {
+    (200, "application/x-ndjson"): OpenApiTypes.STR,
+    (200, "text/csv"): OpenApiTypes.STR,
+}
+
+export_parameters = [
+    OpenApiParameter(
+        "export_format",
+        str,
+        enum=["ndjson", "csv"],
+        default="ndjson",
+        description="Format of the export. The body is gzip compressed if the client accepts it.",
+    ),
+]
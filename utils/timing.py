@@ -0,0 +1,113 @@
+"""
+This module measures where the time of a request goes.
+A `RequestTimer` is installed as the execute wrapper of the database connections for the
+duration of a request, it records the SQL statements run, and the phases of the request
+(e.g. `serialize`) are timed with `timed`, excluding the queries they run.
+"""
+
+from contextvars import ContextVar
+from contextlib import contextmanager, ExitStack
+from collections import defaultdict
+from timeit import default_timer as timer
+
+from django.db import connections
+
+request_timer: ContextVar = ContextVar("request_timer", default=None)
+
+
+class RequestTimer:
+    __doc__ = """
+    This class records the SQL statements and the phase durations of a request.
+    The statements are kept in execution order, up to `max_statements`, with their
+    duration but without their params.
+    """
+
+    def __init__(self, max_statements: int = 100):
+        self.max_statements = max_statements
+        self.query_count = 0
+        self.db_time = 0.0
+        self.slowest = None
+        self.statements = []
+        self.phases = defaultdict(float)
+        self._started = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        start = timer()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = timer() - start
+
+            self.query_count += 1
+            self.db_time += duration
+
+            if self.slowest is None or duration > self.slowest[1]:
+                self.slowest = (sql, duration)
+
+            if len(self.statements) < self.max_statements:
+                self.statements.append((sql, duration))
+
+    @contextmanager
+    def record(self):
+        """
+        Record the statements run on every database connection in the block.
+        """
+        token = request_timer.set(self)
+
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(self))
+                yield self
+        finally:
+            request_timer.reset(token)
+
+    def begin(self, phase: str):
+        self._started[phase] = (timer(), self.db_time)
+
+    def end(self, phase: str):
+        """
+        Add the time since `begin` to the phase, without the time spent in the database.
+        """
+        if phase not in self._started:
+            return
+
+        start, db_time = self._started.pop(phase)
+        self.phases[phase] += (timer() - start) - (self.db_time - db_time)
+
+    def get_server_timing(self, total: float) -> str:
+        """
+        Build the `Server-Timing` header value, durations are in milliseconds.
+        `app` is the time of the request spent neither in the database nor in the phases.
+        """
+        app = max(total - self.db_time - sum(self.phases.values()), 0)
+
+        metrics = [f'db;dur={self.db_time * 1000:.2f};desc="{self.query_count} queries"']
+        metrics.extend(
+            f"{phase};dur={duration * 1000:.2f}" for phase, duration in self.phases.items()
+        )
+        metrics.append(f"app;dur={app * 1000:.2f}")
+        metrics.append(f"total;dur={total * 1000:.2f}")
+
+        return ", ".join(metrics)
+
+
+@contextmanager
+def timed(phase: str):
+    """
+    Time the block as the given phase of the current request, no-op outside of a request.
+    Example:
+        with timed("serialize"):
+            data = self.get_list(objects=objects)
+    """
+    timer_ = request_timer.get()
+
+    if timer_ is None:
+        yield
+        return
+
+    timer_.begin(phase)
+    try:
+        yield
+    finally:
+        timer_.end(phase)
@@ -1,4 +1,4 @@
-from base.db_access import manager
+from base.db_access import manager, CachePolicy
 from ..db_models import Vehicle
 
 class VehicleManager(manager.Manager[Vehicle]):
@@ -6,5 +6,6 @@ class VehicleManager(manager.Manager[Vehicle]):
     Manager class for the Vehicle model.
     """
     model = Vehicle
+    cache_policy = CachePolicy()
     
 vehicle_manager = VehicleManager()
\ No newline at end of file
@@ -1,5 +1,6 @@
 from django.db import models
 from base.db_models.model import BaseModel
+from base.serialization import Serialization
 from utils.functions import get_uuid
 
 class Vehicle(BaseModel, models.Model):
@@ -21,22 +22,28 @@ class Vehicle(BaseModel, models.Model):
     class Meta:
         """
         db_table (str): Specifies the database table name for the model.
+        indexes (list): Partial indexes on the rows which are not soft deleted.
         """
 
         db_table = "vehicle"
+        indexes = [
+            models.Index(
+                fields=["created_dtm", "vehicle_id"],
+                name="vehicle_created_idx",
+                condition=models.Q(is_deleted=False),
+            ),
+            models.Index(
+                fields=["vehicle_type", "vehicle_name"],
+                name="vehicle_type_name_idx",
+                condition=models.Q(is_deleted=False),
+            ),
+        ]
         
-    def to_dict(self):
-        """
-        Convert the Vehicle instance to a dictionary representation.
-
-        Returns:
-            dict: Dictionary representation of the Vehicle instance.
-        """
-        return {
-            "vehicle_id": self.vehicle_id,
-            "vehicle_name": self.vehicle_name,
-            "vehicle_type": self.vehicle_type,
-            "vehicle_number": self.vehicle_number,
-            "vehicle_model": self.vehicle_model,
-            "vehicle_color": self.vehicle_color,
-        }
\ No newline at end of file
+    serialization = Serialization(
+        "vehicle_id",
+        "vehicle_name",
+        "vehicle_type",
+        "vehicle_number",
+        "vehicle_model",
+        "vehicle_color",
+    )
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.3 on 2026-10-18 07:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vehicle', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='vehicle',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['created_dtm', 'vehicle_id'], name='vehicle_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vehicle',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['vehicle_type', 'vehicle_name'], name='vehicle_type_name_idx'),
+        ),
+    ]
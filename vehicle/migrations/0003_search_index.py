@@ -0,0 +1,17 @@
+from django.db import migrations
+
+from base.search.operations import create_trigram_extension, create_search_index
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("vehicle", "0002_partial_indexes"),
+    ]
+
+    operations = [
+        create_trigram_extension(),
+        *create_search_index(
+            "vehicle", "vehicle_id", ["vehicle_name", "vehicle_type", "vehicle_number"]
+        ),
+    ]
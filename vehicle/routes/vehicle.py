@@ -1,5 +1,6 @@
 from django.urls import path
 
+from base.views import ExportView
 from ..views.vehicle import VehicleViewSet
 
 urlpatterns = [
@@ -8,6 +9,11 @@ urlpatterns = [
         VehicleViewSet.as_view(VehicleViewSet.get_method_view_mapping()),
         name="vehicle",
     ),
+    path(
+        "vehicle/export",
+        VehicleViewSet.as_view(ExportView.get_method_view_mapping()),
+        name="vehicle-export",
+    ),
     path(
         "vehicle/<str:vehicle_id>",
         VehicleViewSet.as_view(VehicleViewSet.get_method_view_mapping(True)),
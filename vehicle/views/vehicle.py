@@ -9,7 +9,7 @@ from drf_spectacular.utils import extend_schema
 
 from authentication import get_authentication_classes
 
-from base.views import BaseView
+from base.views import BaseView, ExportView
 from utils.swagger import (
     responses_400,
     responses_404,
@@ -17,6 +17,8 @@ from utils.swagger import (
     responses_400_example,
     responses_404_example,
     responses_401_example,
+    responses_export,
+    export_parameters,
 )
 
 from ..db_access.vehicle import vehicle_manager
@@ -35,7 +37,7 @@ from ..serializers.query import VehicleQuerySerializer
 MODULE_NAME = "Vehicle"
 
 
-class VehicleViewSet(BaseView, viewsets.ViewSet):
+class VehicleViewSet(BaseView, ExportView, viewsets.ViewSet):
     """
     ViewSet for handling vehicle endpoints.
     """
@@ -45,6 +47,7 @@ class VehicleViewSet(BaseView, viewsets.ViewSet):
     serializer_class = VehicleSerializer
     list_serializer_class = VehicleQuerySerializer
     lookup_field = "vehicle_id"
+    export_name = "vehicles"
     search_fields = [
         "vehicle_name",
         "vehicle_type",
@@ -52,6 +55,7 @@ class VehicleViewSet(BaseView, viewsets.ViewSet):
         "vehicle_model",
         "vehicle_color",
     ]
+    text_search_fields = ["vehicle_name", "vehicle_type", "vehicle_number"]
 
     @extend_schema(
         responses={201: VehicleResponseSerializer, **responses_400, **responses_401},
@@ -84,6 +88,16 @@ class VehicleViewSet(BaseView, viewsets.ViewSet):
         """List all vehicles."""
         return super().list_all(request, *args, **kwargs)
 
+    @extend_schema(
+        parameters=export_parameters,
+        responses={**responses_export, **responses_400, **responses_401},
+        examples=[responses_400_example, responses_401_example],
+        tags=[MODULE_NAME],
+    )
+    def export(self, request, *args, **kwargs):
+        """Export the vehicles matching the list filters as NDJSON or CSV."""
+        return super().export(request, *args, **kwargs)
+
     @extend_schema(
         responses={200: VehicleResponseSerializer, **responses_404, **responses_401},
         examples=[